@@ -9,14 +9,18 @@ Created on Nov 24, 2011
 Provides the configurations for the processors used in handling the request.
 '''
 
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ..ally_core.encoder_decoder import assemblyParsing
 from ..ally_core.processor import argumentsBuild, argumentsPrepare, \
     renderEncoder, invoking, default_characterset, renderer, conversion, \
     createDecoder, content
 from ..ally_core.resources import resourcesRoot
+from ..ally_http import server_type, SERVER_PREFORK
 from ..ally_http.processor import encoderPath, contentLengthDecode, \
     contentLengthEncode, methodOverride, allowEncode, headerDecodeRequest, \
-    contentTypeRequestDecode, headerEncodeResponse, contentTypeResponseEncode
+    contentTypeRequestDecode, headerEncodeResponse, contentTypeResponseEncode, \
+    contentEncoding
 from ally.container import ioc
 from ally.core.http.impl.processor.encoder import CreateEncoderWithPathHandler
 from ally.core.http.impl.processor.explain_error import ExplainErrorHandler
@@ -33,6 +37,7 @@ from ally.core.http.impl.processor.parameter import ParameterHandler
 from ally.core.http.impl.processor.parsing_multipart import \
     ParsingMultiPartHandler
 from ally.core.http.impl.processor.redirect import RedirectHandler
+from ally.core.http.impl.processor.response_cache import ResponseCacheHandler
 from ally.core.http.impl.processor.uri import URIHandler
 from ally.core.http.spec.codes import CODE_TO_STATUS, CODE_TO_TEXT
 from ally.core.spec.resources import ConverterPath
@@ -60,6 +65,48 @@ def root_uri_resources():
     '''
     return 'resources/%s'
 
+@ioc.config
+def uri_cache_size() -> int:
+    '''
+    The maximum number of request URI shapes for which the resolved resource path is cached, a URI shape is the URI with
+    the resource identifiers replaced by markers, if 0 then the resource paths are not cached
+    '''
+    return 500
+
+@ioc.config
+def response_cache_size() -> int:
+    '''
+    The maximum number of rendered responses that are cached for the calls that have the 'cache' hint, the cached
+    responses are provided with an entity tag, if 0 then the responses are neither cached nor provided with entity tags.
+    The responses are not cached when running the prefork server since each worker process would have a cache that is
+    not invalidated by the changes made in the other workers
+    '''
+    return 1000
+
+@ioc.config
+def response_cache_maximum_age() -> int:
+    '''
+    The maximum number of seconds a rendered response is cached, this limits the time a cached response is stale when the
+    data is changed by other means then the REST calls
+    '''
+    return 300
+
+@ioc.config
+def fetch_counters_interval() -> int:
+    '''
+    The interval in seconds at which the number of calls made for fetching the referenced models and the number of calls
+    saved by fetching them in batches are logged, if 0 then the counters are not logged
+    '''
+    return 300
+
+@ioc.config
+def multipart_spool_size() -> int:
+    '''
+    The maximum size in bytes of a multi part body that is kept in memory, the bigger bodies (like uploaded files) are
+    spooled to temporary files, if 0 then the multi part bodies are read directly from the request content
+    '''
+    return 1024 * 1024
+
 # --------------------------------------------------------------------
 
 @ioc.entity
@@ -96,6 +143,7 @@ def uri() -> Handler:
     b = URIHandler()
     b.resourcesRoot = resourcesRoot()
     b.converterPath = converterPath()
+    b.cacheSize = uri_cache_size()
     return b
 
 @ioc.entity
@@ -109,7 +157,10 @@ def encoderPathResource() -> Handler:
 def parameter() -> Handler: return ParameterHandler()
 
 @ioc.entity
-def fetcher() -> Handler: return FetcherHandler()
+def fetcher() -> Handler:
+    b = FetcherHandler()
+    b.countersInterval = fetch_counters_interval()
+    return b
 
 @ioc.entity
 def createEncoderWithPath() -> Handler: return CreateEncoderWithPathHandler()
@@ -120,6 +171,7 @@ def parserMultiPart() -> Handler:
     b.charSetDefault = default_characterset()
     b.parsingAssembly = assemblyParsing()
     b.populateAssembly = assemblyMultiPartPopulate()
+    b.spoolSize = multipart_spool_size()
     return b
 
 @ioc.entity
@@ -128,6 +180,15 @@ def redirect() -> Handler:
     b.redirectAssembly = assemblyRedirect()
     return b
 
+@ioc.entity
+def responseCache() -> Handler:
+    b = ResponseCacheHandler()
+    b.cacheAssembly = assemblyResponseCache()
+    if server_type() == SERVER_PREFORK: b.cacheSize = 0
+    else: b.cacheSize = response_cache_size()
+    b.maximumAge = response_cache_maximum_age()
+    return b
+
 @ioc.entity
 def statusCodeToStatus(): return dict(CODE_TO_STATUS)
 
@@ -151,21 +212,40 @@ def assemblyResources() -> Assembly:
     '''
     The assembly containing the handlers that will be used in processing a REST request.
     '''
-    return Assembly('REST resources')
+    b = Assembly('REST resources')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 @ioc.entity
 def assemblyMultiPartPopulate() -> Assembly:
     '''
     The assembly containing the handlers that will populate data on the next request content.
     '''
-    return Assembly('Multipart content')
+    b = Assembly('Multipart content')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
+
+@ioc.entity
+def assemblyResponseCache() -> Assembly:
+    '''
+    The assembly containing the handlers that will provide the rendered responses to be cached.
+    '''
+    b = Assembly('Response cache')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 @ioc.entity
 def assemblyRedirect() -> Assembly:
     '''
     The assembly containing the handlers that will be used in processing a redirect.
     '''
-    return Assembly('Redirect')
+    b = Assembly('Redirect')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 # --------------------------------------------------------------------
 
@@ -175,9 +255,9 @@ def updateAssemblyResources():
                             argumentsPrepare(), uri(), encoderPathResource(), methodInvoker(), headerEncodeResponse(), redirect(),
                             contentTypeRequestDecode(), contentLengthDecode(), contentLanguageDecode(), acceptDecode(),
                             renderer(), conversion(), createDecoder(), createEncoderWithPath(), parserMultiPart(), content(),
-                            parameter(), fetcher(), argumentsBuild(), invoking(), renderEncoder(),
+                            parameter(), fetcher(), argumentsBuild(), responseCache(),
                             status(), explainError(), contentTypeResponseEncode(),
-                            contentLanguageEncode(), contentLengthEncode(), allowEncode())
+                            contentLanguageEncode(), contentEncoding(), contentLengthEncode(), allowEncode())
     
     if allow_method_override(): assemblyResources().add(methodOverride(), before=methodInvoker())
 
@@ -185,6 +265,10 @@ def updateAssemblyResources():
 def updateAssemblyMultiPartPopulate():
     assemblyMultiPartPopulate().add(headerDecodeRequest(), contentTypeRequestDecode(), contentDispositionDecode())
 
+@ioc.before(assemblyResponseCache)
+def updateAssemblyResponseCache():
+    assemblyResponseCache().add(invoking(), renderEncoder())
+
 @ioc.before(assemblyRedirect)
 def updateAssemblyRedirect():
     assemblyRedirect().add(argumentsBuild(), invoking())
@@ -9,6 +9,8 @@ Created on Feb 7, 2013
 Provides the processors used in presenting REST errors.
 '''
 
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ..ally_core.processor import renderer
 from ..ally_http.processor import contentLengthEncode, allowEncode, \
     methodOverride, headerDecodeRequest, headerEncodeResponse, \
@@ -42,7 +44,10 @@ def assemblyErrorDelivery() -> Assembly:
     '''
     The assembly containing the handlers that will be used in delivery for the error responses.
     '''
-    return Assembly('Error delivery')
+    b = Assembly('Error delivery')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 # --------------------------------------------------------------------
     
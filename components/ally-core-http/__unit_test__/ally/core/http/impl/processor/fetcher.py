@@ -0,0 +1,87 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the batched models fetching.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import GET, model
+from ally.api.type import Iter, typeFor
+from ally.core.http.impl.processor.fetcher import FetcherInvoker, Fetcher
+from ally.core.impl.invoker import InvokerFunction
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class User:
+    Id = int
+    Name = str
+
+@model(id='Id')
+class Article:
+    Id = int
+    Author = int
+
+def create(clazz, **values):
+    obj = clazz()
+    for name, value in values.items(): setattr(obj, name, value)
+    return obj
+
+# --------------------------------------------------------------------
+
+class TestFetcher(unittest.TestCase):
+
+    def testBatch(self):
+        calls, batches = [], []
+        def getUser(userId):
+            calls.append(userId)
+            return create(User, Id=userId, Name='User %s' % userId)
+        def getUsers(userIds):
+            batches.append(userIds)
+            return [create(User, Id=userId, Name='User %s' % userId) for userId in userIds if userId < 10]
+        def getArticles(): pass
+
+        fetcher = FetcherInvoker(InvokerFunction(GET, getArticles, typeFor(Iter(Article)), [], {}), 2)
+        fetcher.addFetch('author', InvokerFunction(GET, getUser, typeFor(User), [], {}), [None], getUsers, typeFor(User))
+        fetch = Fetcher(fetcher, ())
+
+        articles = [create(Article, Id=k, Author=author) for k, author in enumerate((1, 2, 1, 3, 11))]
+        for article in fetch.prefetching(articles, {'Author': 'author'}, 3):
+            self.assertEqual(article.Author, fetch.fetch('author', article.Author).Id)
+
+        self.assertEqual([[1, 2], [3, 11]], batches)
+        self.assertEqual([11], calls)
+        # Without batches the four authors require four calls, the batches fetched three of them in two calls.
+        self.assertEqual(3, fetcher.calls)
+        self.assertEqual(1, fetcher.saved)
+
+    def testBatchNothingFetched(self):
+        def getUser(userId): return create(User, Id=userId, Name='User %s' % userId)
+        def getUsers(userIds): return [create(User, Id=20)]
+        def getArticles(): pass
+
+        fetcher = FetcherInvoker(InvokerFunction(GET, getArticles, typeFor(Iter(Article)), [], {}), 2)
+        fetcher.addFetch('author', InvokerFunction(GET, getUser, typeFor(User), [], {}), [None], getUsers, typeFor(User))
+        fetch = Fetcher(fetcher, ())
+
+        articles = [create(Article, Id=k, Author=author) for k, author in enumerate((1, 2))]
+        for article in fetch.prefetching(articles, {'Author': 'author'}, 2):
+            self.assertEqual(article.Author, fetch.fetch('author', article.Author).Id)
+
+        self.assertEqual((3, -1), (fetcher.calls, fetcher.saved))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
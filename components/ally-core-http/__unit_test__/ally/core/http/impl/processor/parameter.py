@@ -24,6 +24,7 @@ from ally.core.http.impl.processor.parameter import ParameterHandler
 from ally.core.impl.invoker import InvokerCall
 from ally.core.spec.transform.support import SAMPLE
 from ally.core.spec.resources import ConverterPath
+from collections import deque
 import unittest
 
 # --------------------------------------------------------------------
@@ -82,8 +83,11 @@ class TestParameter(unittest.TestCase):
         service = typeFor(IService).service
         invoker = InvokerCall(Service(), service.calls['get'])
 
-        resolve = decoder.decodeInvoker(invoker)
         context = dict(converter=ConverterPath(), normalizer=ConverterPath())
+        plan = decoder.planInvoker(invoker, context['normalizer'])
+        def resolve(path, **data):
+            decode = plan.get(path)
+            return decode is not None and decode(path=deque(), **data)
 
         args = {}
         self.assertTrue(resolve(path='offset', value='20', target=args, **context))
@@ -132,10 +136,11 @@ class TestParameter(unittest.TestCase):
         self.assertFalse(resolve(path='another', value='not', target=args, **context))
         self.assertFalse(resolve(path='name.ascending', value='False', target=args, **context))
         self.assertFalse(resolve(path='qa.name.priority', value='1', target=args, **context))
+        self.assertFalse(resolve(path='asc', value='unknown', target=args, **context))
 
         invoker = InvokerCall(Service(), service.calls['insert'])
 
-        resolve = decoder.decodeInvoker(invoker)
+        plan = decoder.planInvoker(invoker, context['normalizer'])
 
         self.assertFalse(resolve(path='offset', value='20', target=args, **context))
         self.assertFalse(resolve(path='limit', value='0', target=args, **context))
@@ -0,0 +1,88 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the multi part stream.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.core.http.impl.processor.parsing_multipart import DataMultiPart, StreamMultiPart, FLAG_MARK_START, \
+    FLAG_MARK_END, FLAG_CONTENT_END
+from io import BytesIO
+import unittest
+
+# --------------------------------------------------------------------
+
+CONTENT = b'''The preamble\r
+--AaB03x\r
+Content-Disposition: form-data; name="field"\r
+\r
+The value\r
+--AaB03x\r
+Content-Disposition: form-data; name="file"; filename="file.txt"\r
+Content-Type: text/plain\r
+\r
+Line --AaB03 and --AaB03xy\r\n--AaB03\r
+last line\r
+--AaB03x--\r
+The epilogue'''
+
+# --------------------------------------------------------------------
+
+class TestMultiPart(unittest.TestCase):
+
+    def parse(self, content, packageSize, spoolSize=0, nbytes=3):
+        data = DataMultiPart()
+        data.packageSize, data.spoolSize = packageSize, spoolSize
+        ioc.initialize(data)
+
+        stream, parts = StreamMultiPart(data, BytesIO(content), 'AaB03x'), []
+        while not stream._flag & (FLAG_CONTENT_END | FLAG_MARK_END):
+            if not stream._flag & FLAG_MARK_START:
+                stream._readToMark(packageSize)
+                continue
+            headers = stream._pullHeaders()
+            source = stream.spool(spoolSize) if spoolSize else stream
+            body = []
+            while True:
+                block = source.read(nbytes)
+                if not block: break
+                body.append(block)
+            parts.append((headers, b''.join(body), source))
+        return parts
+
+    def testParse(self):
+        for packageSize in range(1, 40):
+            for nbytes in (1, 3, 100, None):
+                parts = self.parse(CONTENT, packageSize, nbytes=nbytes)
+                self.assertEqual([({'Content-Disposition': 'form-data; name="field"'}, b'The value'),
+                                  ({'Content-Disposition': 'form-data; name="file"; filename="file.txt"',
+                                    'Content-Type': 'text/plain'},
+                                   b'Line --AaB03 and --AaB03xy\r\n--AaB03\r\nlast line')],
+                                 [(headers, body) for headers, body, _source in parts], 'For package size %s' % packageSize)
+
+    def testNoEnd(self):
+        parts = self.parse(b'--AaB03x\r\nName: value\r\n\r\nThe content without end', 4)
+        self.assertEqual([({'Name': 'value'}, b'The content without end')], [part[:2] for part in parts])
+
+    def testSpool(self):
+        content = b'--AaB03x\r\nName: value\r\n\r\n' + b'x' * 1000 + b'\r\n--AaB03x\r\nName: other\r\n\r\ny\r\n--AaB03x--'
+        parts = self.parse(content, 64, spoolSize=100)
+        self.assertEqual([b'x' * 1000, b'y'], [body for _headers, body, _source in parts])
+        self.assertTrue(parts[0][2]._rolled)
+        self.assertFalse(parts[1][2]._rolled)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,202 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the rendered responses cache.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import GET, INSERT, model
+from ally.api.type import typeFor
+from ally.container import ioc
+from ally.core.http.impl.processor.response_cache import ResponseCache, \
+    ResponseCacheHandler
+from ally.core.impl.invoker import InvokerFunction
+from ally.core.spec.resources import Invoker
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import defines
+from ally.design.processor.context import Context
+from ally.design.processor.execution import Chain
+from ally.design.processor.handler import HandlerProcessor, \
+    HandlerProcessorProceed
+from ally.http.spec.server import IDecoderHeader, IEncoderHeader
+from collections import Iterable
+import time
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Article:
+    Id = int
+
+class Request(Context):
+    invoker = defines(Invoker)
+    uri = defines(str)
+    headers = defines(dict)
+    decoderHeader = defines(IDecoderHeader)
+
+class Response(Context):
+    encoderHeader = defines(IEncoderHeader)
+    isSuccess = defines(bool)
+
+class ResponseContent(Context):
+    source = defines(Iterable)
+
+class DecoderHeader(IDecoderHeader):
+
+    def __init__(self, headers): self.headers = {name.lower(): value for name, value in headers.items()}
+    def retrieve(self, name): return self.headers.get(name.lower())
+    def decode(self, name): raise NotImplementedError()
+
+class EncoderHeader(IEncoderHeader):
+
+    def __init__(self): self.headers = {}
+    def encode(self, name, *value): self.headers[name] = ','.join(value)
+
+class Commit(HandlerProcessor):
+    '''
+    Records the commit in a call back, like the transaction wrapping does.
+    '''
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+
+    def process(self, chain, response:Response, **keyargs):
+        chain.proceed()
+        chain.callBack(lambda: self.events.append('commit'))
+
+class Render(HandlerProcessorProceed):
+    '''
+    Renders the response content.
+    '''
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+
+    def process(self, response:Response, responseCnt:ResponseContent, **keyargs):
+        self.events.append('render')
+        response.isSuccess = True
+        responseCnt.source = (b'content',)
+
+# --------------------------------------------------------------------
+
+class TestResponseCache(unittest.TestCase):
+
+    def testLeastRecentlyUsed(self):
+        cache = ResponseCache(2, 60)
+        cache.put('a', 'A', {'Model'})
+        cache.put('b', 'B', {'Model'})
+        self.assertEqual('A', cache.get('a'))
+
+        cache.put('c', 'C', {'Other'})
+        self.assertEqual(None, cache.get('b'))
+        self.assertEqual('A', cache.get('a'))
+        self.assertEqual('C', cache.get('c'))
+        self.assertEqual(0.75, cache.responses.hitRate())
+
+    def testInvalidate(self):
+        cache = ResponseCache(10, 60)
+        cache.put('a', 'A', {'Model'})
+        cache.put('b', 'B', {'Model', 'Other'})
+        cache.put('c', 'C', {'Other'})
+        cache.put('d', 'D', set())
+
+        cache.invalidate({'Model'})
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual(None, cache.get('b'))
+        self.assertEqual('C', cache.get('c'))
+        self.assertEqual('D', cache.get('d'))
+
+        cache.invalidate()
+        self.assertEqual(None, cache.get('c'))
+        self.assertEqual(None, cache.get('d'))
+
+    def testMaximumAge(self):
+        cache = ResponseCache(10, 0.01)
+        cache.put('a', 'A', {'Model'})
+        self.assertEqual('A', cache.get('a'))
+        time.sleep(0.02)
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual(0, len(cache.responses))
+
+class TestResponseCacheHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        cacheAssembly = Assembly('Cache')
+        cacheAssembly.add(Commit(self.events), Render(self.events))
+        self.handler = ResponseCacheHandler()
+        self.handler.cacheAssembly = cacheAssembly
+        ioc.initialize(self.handler)
+        assembly = Assembly('Test')
+        assembly.add(self.handler)
+        self.processing = assembly.create(request=Request, response=Response, responseCnt=ResponseContent)
+
+    def call(self, invoker, **headers):
+        arg = self.processing.fillIn()
+        arg['request'].invoker, arg['request'].uri, arg['request'].headers = invoker, 'Article', headers
+        arg['request'].decoderHeader = DecoderHeader(headers)
+        arg['response'].encoderHeader = EncoderHeader()
+        Chain(self.processing).process(**arg).doAll()
+        return arg['response'], arg['responseCnt']
+
+    def testKey(self):
+        invoker = InvokerFunction(GET, lambda: None, typeFor(Article), [], {'cache': True}, name='getArticle')
+        for headers, rendered in (({}, True), ({}, False), ({'X-Filter': 'Id'}, True), ({'X-Filter': 'Id'}, False),
+                                  ({'X-Format-Date': 'long'}, True), ({'X-Format-Date': 'short'}, True),
+                                  ({'Authorization': 'a'}, True), ({'Authorization': 'a'}, True)):
+            del self.events[:]
+            _response, responseCnt = self.call(invoker, **headers)
+            self.assertEqual(rendered, 'render' in self.events, headers)
+            self.assertEqual((b'content',), tuple(responseCnt.source))
+
+        response, responseCnt = self.call(invoker, **{'If-None-Match': 'W/"%s"' % '9a0364b9e99bb480dd25e1f0284c8555'})
+        self.assertEqual((304, None), (response.status, responseCnt.source))
+
+    def testDisabled(self):
+        handler = ResponseCacheHandler()
+        handler.cacheAssembly, handler.cacheSize = self.handler.cacheAssembly, 0
+        ioc.initialize(handler)
+        assembly = Assembly('Test')
+        assembly.add(handler)
+        self.processing = assembly.create(request=Request, response=Response, responseCnt=ResponseContent)
+
+        invoker = InvokerFunction(GET, lambda: None, typeFor(Article), [], {'cache': True}, name='getArticle')
+        for _k in range(2):
+            del self.events[:]
+            response, responseCnt = self.call(invoker)
+            self.assertIn('render', self.events)
+            # The rendered content is delivered as provided by the rendering, without being buffered for an entity tag.
+            self.assertEqual(((b'content',), {}), (responseCnt.source, response.encoderHeader.headers))
+
+    def testInvalidateAfterCommit(self):
+        getArticle = InvokerFunction(GET, lambda: None, typeFor(Article), [], {'cache': True}, name='getArticle')
+        insertArticle = InvokerFunction(INSERT, lambda: None, typeFor(Article.Id), [], {}, name='insertArticle')
+        self.call(getArticle)
+        invalidate = self.handler.responseCache.invalidate
+        def record(models):
+            self.events.append('invalidate')
+            invalidate(models)
+        self.handler.responseCache.invalidate = record
+
+        del self.events[:]
+        self.call(insertArticle)
+        self.assertEqual(['render', 'commit', 'invalidate'], self.events)
+        del self.events[:]
+        self.call(getArticle)
+        self.assertEqual(['render', 'commit'], self.events)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,93 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the Babel converters with compiled format patterns.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.type import Number, Percentage, Date, Time, DateTime, typeFor
+from ally.container import ioc
+from ally.core.spec.resources import ConverterPath
+from datetime import datetime
+import unittest
+
+try:
+    from ally.core.http.impl.processor.text_conversion import BabelConversionDecodeHandler, ConverterBabel
+    from babel.core import Locale
+except ImportError: Locale = None
+
+# --------------------------------------------------------------------
+
+VALUES = ((Number, 1234567.891), (Number, -0.5), (Percentage, 0.256), (Date, datetime(2012, 3, 4, 5, 6, 7).date()),
+          (Time, datetime(2012, 3, 4, 15, 6, 7).time()), (DateTime, datetime(2012, 12, 24, 23, 59, 1)))
+# The values to be formatted by the converters.
+FORMATS = ({}, {Date: 'full', Time: 'medium', DateTime: 'long'}, {Date: 'long', Time: 'full', DateTime: 'full'},
+           {Date: 'yyyy.MM.dd', Time: 'HH:mm', DateTime: 'yyyy-MM-dd HH:mm:ss', Number: '#,##0.00',
+            Percentage: '#0.0%'})
+# The keyed and custom formats required for the converters.
+
+# --------------------------------------------------------------------
+
+@unittest.skipIf(Locale is None, 'Babel is not installed')
+class TestBabelConversion(unittest.TestCase):
+
+    def testPatterns(self):
+        handler = BabelConversionDecodeHandler()
+        handler.normalizer = ConverterPath()
+        handler.languageDefault = 'en'
+        ioc.initialize(handler)
+
+        for language in ('en', 'fr_FR', 'de', 'ro_RO'):
+            locale = Locale.parse(language)
+            for formats in FORMATS:
+                converter = handler.converterFor(locale, dict(formats))
+                assert isinstance(converter, ConverterBabel)
+                converterRaw = ConverterBabel(locale, handler.processFormats(locale, dict(formats)))
+
+                self.assertEqual(converterRaw.formats, converter.formats)
+                for clsTyp, value in VALUES:
+                    objType = typeFor(clsTyp)
+                    self.assertEqual(converterRaw.asString(value, objType), converter.asString(value, objType),
+                                     'Invalid %s format for %s with %s' % (clsTyp.__name__, language, formats))
+
+    def testLocale(self):
+        handler = BabelConversionDecodeHandler()
+        handler.normalizer = ConverterPath()
+        handler.languageDefault = 'en'
+        ioc.initialize(handler)
+
+        converter = handler.converterFor(Locale.parse('de'), {Date: 'long', Time: 'medium', DateTime: 'long'})
+        self.assertEqual('4. März 2012', converter.asString(VALUES[3][1], typeFor(Date)))
+        self.assertEqual('15:06:07', converter.asString(VALUES[4][1], typeFor(Time)))
+        self.assertTrue(converter.asString(VALUES[5][1], typeFor(DateTime)).startswith('24. Dezember 2012 23:59:01'))
+
+    def testCache(self):
+        handler = BabelConversionDecodeHandler()
+        handler.normalizer = ConverterPath()
+        handler.languageDefault = 'en'
+        ioc.initialize(handler)
+
+        locale = handler.localeFor('en-US')
+        self.assertIsInstance(locale, Locale)
+        self.assertIs(locale, handler.localeFor('en-US'))
+        self.assertIsNone(handler.localeFor('unknown-language'))
+        self.assertIsNone(handler.localeFor('unknown-language'))
+
+        converter = handler.converterFor(locale, {Date: 'full'})
+        self.assertIs(converter, handler.converterFor(locale, {Date: 'full'}))
+        self.assertIsNot(converter, handler.converterFor(locale, {Date: 'short'}))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
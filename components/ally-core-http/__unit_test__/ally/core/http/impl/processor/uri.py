@@ -0,0 +1,63 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the URI paths cache.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.api.type import Input, typeFor
+from ally.core.http.impl.processor.uri import PathCache
+from ally.core.impl.node import NodeRoot, NodePath, NodeProperty
+from ally.core.spec.resources import ConverterPath
+from ally.support.core.util_resources import PathFinder
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class ModelId:
+    Id = int
+
+@model(id='Key')
+class ModelKey:
+    Key = str
+
+# --------------------------------------------------------------------
+
+class TestPathCache(unittest.TestCase):
+
+    def testCache(self):
+        root = NodeRoot()
+        models = NodePath(root, True, 'Model')
+        byId = NodeProperty(models, Input('id', typeFor(ModelId.Id)))
+        byKey = NodeProperty(models, Input('key', typeFor(ModelKey.Key)))
+        cache = PathCache(PathFinder(root, ConverterPath()), 10)
+        
+        for paths, node, value in ((['Model', '1'], byId, 1), (['Model', '2'], byId, 2), (['Model', 'a'], byKey, 'a'),
+                                   (['Model', 'b'], byKey, 'b'), (['Model', 'Model'], byKey, 'Model')):
+            path = cache.find(paths)
+            self.assertIs(path.node, node)
+            self.assertEqual(path.matches[-1].value, value)
+        self.assertEqual((cache.shapes.hits, cache.shapes.misses), (2, 3))
+        
+        self.assertIsNone(cache.find(['Other']).node)
+        other = NodePath(root, True, 'Other')
+        self.assertIs(cache.find(['Other']).node, other)
+        self.assertIs(cache.find(['Model', '3']).node, byId)
+        self.assertEqual((cache.shapes.hits, cache.shapes.misses), (2, 6))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -9,16 +9,20 @@ Created on Jul 31, 2012
 Provides the standard headers handling.
 '''
 
+from ally.api.extension import IterPart
 from ally.api.operator.type import TypeModelProperty, TypeModel
-from ally.api.type import Input, typeFor, TypeClass, Type
+from ally.api.type import Input, typeFor, TypeClass, Type, Iter
 from ally.container.ioc import injected
 from ally.core.http.spec.transform.support_model import DataModel, IFetcher
 from ally.core.spec.resources import Path, Node, Invoker, INodeInvokerListener
 from ally.design.processor.attribute import requires
 from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
+from collections import Iterable, OrderedDict
+from threading import Lock
 from weakref import WeakKeyDictionary
 import logging
+import time
 
 # --------------------------------------------------------------------
 
@@ -49,18 +53,30 @@ class Response(Context):
 @injected
 class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
     '''
-    Implementation for a handler that provides the fetcher used in getting the filtered models.
+    Implementation for a handler that provides the fetcher used in getting the filtered models. If the invoker that
+    delivers the model for a reference has the fetch batch hint then the models referenced by a collection are fetched
+    in batches instead of one by one.
     '''
     typeResponse = TypeClass(Response)
+    hintBatch = 'fetchBatch'
+    # The call hint name that provides the implementation method name used for fetching the models in batches.
+    batchSize = 100
+    # The number of collection items for which the referenced models are fetched at once.
+    countersInterval = 0
+    # The interval in seconds at which the fetch counters are logged, if 0 the counters are not logged.
 
     def __init__(self):
         '''
         Construct the encoder.
         '''
         assert isinstance(self.typeResponse, Type), 'Invalid type response %s' % self.typeResponse
+        assert isinstance(self.hintBatch, str), 'Invalid batch hint name %s' % self.hintBatch
+        assert isinstance(self.batchSize, int) and self.batchSize > 0, 'Invalid batch size %s' % self.batchSize
+        assert isinstance(self.countersInterval, (int, float)), 'Invalid counters interval %s' % self.countersInterval
         super().__init__()
 
         self._cache = WeakKeyDictionary()
+        self._logAt = time.time() + self.countersInterval
 
     def process(self, request:Request, response:Response, **keyargs):
         '''
@@ -71,6 +87,10 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
         assert isinstance(request, Request), 'Invalid request %s' % request
         assert isinstance(response, Response), 'Invalid response %s' % response
 
+        if self.countersInterval > 0 and time.time() >= self._logAt:
+            self._logAt = time.time() + self.countersInterval
+            log.info('Fetched models with %s calls, %s calls saved by fetching in batches', *self.counters())
+
         if response.isSuccess is False: return  # Skip in case the response is in error
         if response.encoderDataModel is None: return
         invokerMain = request.invoker
@@ -94,7 +114,7 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
                 node = node.root
                 node.addStructureListener(self)
 
-                fetcher = FetcherInvoker(invokerMain)
+                fetcher = FetcherInvoker(invokerMain, self.batchSize)
                 self._cache[invokerMain] = (fetcher, references)
                 for reference, invoker in fetch.items():
                     assert isinstance(invoker, Invoker)
@@ -123,7 +143,7 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
                                 log.warning('Cannot locate any input main invoker %s input for invoker %s and input %s',
                                             invokerMain, invoker, inp)
                                 break
-                    else: fetcher.addFetch(reference, invoker, indexes)
+                    else: fetcher.addFetch(reference, invoker, indexes, self.batchFor(invoker), modelType)
 
                 fetcher.inputs.append(Input('$response', self.typeResponse, True, None))
 
@@ -156,6 +176,40 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
 
         return fetch
 
+    def batchFor(self, invoker):
+        '''
+        Provides the batch fetch for the invoker.
+        
+        @param invoker: Invoker
+            The invoker that delivers the model for an id.
+        @return: callable|None
+            The callable that takes the same arguments as the invoker but with a list of ids instead of the id and
+            returns the models, None if the invoker has no batch fetch.
+        '''
+        assert isinstance(invoker, Invoker), 'Invalid invoker %s' % invoker
+
+        name = invoker.hints.get(self.hintBatch)
+        if not name: return
+        assert isinstance(name, str), 'Invalid batch hint %s for invoker %s' % (name, invoker)
+        batch = getattr(getattr(invoker, 'implementation', None), name, None)
+        if batch is None: log.warning('No batch fetch method \'%s\' available for invoker %s', name, invoker)
+        return batch
+
+    def counters(self):
+        '''
+        Provides the fetch counters.
+        
+        @return: tuple(integer, integer)
+            The number of invoker calls made for fetching and the number of invoker calls saved by fetching in batches.
+        '''
+        calls = saved = 0
+        for fetcher, _references in list(self._cache.values()):
+            assert isinstance(fetcher, FetcherInvoker)
+            with fetcher.lock:
+                calls += fetcher.calls
+                saved += fetcher.saved
+        return calls, saved
+
     # ----------------------------------------------------------------
 
     def onInvokerChange(self, node, old, new):
@@ -170,19 +224,43 @@ class FetcherInvoker(Invoker):
     '''
     Invoker that provides the model fetching.
     '''
-    __slots__ = ('invoker', 'references', 'invokers')
+    __slots__ = ('invoker', 'batchSize', 'references', 'invokers', 'calls', 'saved', 'lock')
 
-    def __init__(self, invoker):
+    def __init__(self, invoker, batchSize):
         '''
         Construct the fetcher.
+        
+        @ivar calls: integer
+            The number of invoker calls made for fetching.
+        @ivar saved: integer
+            The number of invoker calls saved by fetching in batches.
+        @ivar lock: Lock
+            The lock used for updating the counters, the fetcher invoker is used by all the requests threads.
         '''
         assert isinstance(invoker, Invoker), 'Invalid invoker %s' % invoker
+        assert isinstance(batchSize, int), 'Invalid batch size %s' % batchSize
         Invoker.__init__(self, invoker.name, invoker.method, invoker.output, list(invoker.inputs), invoker.hints,
                          invoker.infoIMPL, invoker.infoAPI)
 
         self.invoker = invoker
+        self.batchSize = batchSize
         self.references = {}
         self.invokers = []
+        self.calls = self.saved = 0
+        self.lock = Lock()
+
+    def count(self, calls, saved=0):
+        '''
+        Adds to the fetch counters.
+        
+        @param calls: integer
+            The number of invoker calls made for fetching.
+        @param saved: integer
+            The number of invoker calls saved by fetching in batches.
+        '''
+        with self.lock:
+            self.calls += calls
+            self.saved += saved
 
     def addInput(self, inp):
         '''
@@ -200,7 +278,7 @@ class FetcherInvoker(Invoker):
 
         return len(self.inputs) - 1
 
-    def addFetch(self, reference, invoker, indexes):
+    def addFetch(self, reference, invoker, indexes, batch=None, modelType=None):
         '''
         Add a new reference entry in the fetcher.
         
@@ -211,12 +289,19 @@ class FetcherInvoker(Invoker):
         @param indexes: list[integer]
             The indexes in the invoker arguments to be used for the invoker at fetching, basically all the indexes of
             the arguments (beside of the model id one which is None in the indexes) to be used for call the invoker.
+        @param batch: callable|None
+            The batch fetch that takes the same arguments as the invoker but with a list of ids instead of the id.
+        @param modelType: TypeModel|None
+            The type of the fetched model, required if a batch fetch is provided.
         '''
         assert isinstance(invoker, Invoker), 'Invalid invoker %s' % invoker
         assert isinstance(indexes, list), 'Invalid indexes list %s' % indexes
+        assert batch is None or callable(batch), 'Invalid batch %s' % batch
+        assert batch is None or isinstance(modelType, TypeModel), 'Invalid model type %s' % modelType
 
         self.references[reference] = len(self.invokers)
-        self.invokers.append((invoker, indexes))
+        if batch is None: self.invokers.append((invoker, indexes, None, None))
+        else: self.invokers.append((invoker, indexes, batch, modelType.container.propertyId))
 
     def invoke(self, *args):
         '''
@@ -224,8 +309,27 @@ class FetcherInvoker(Invoker):
         '''
         response = args[-1]
         assert isinstance(response, Response), 'Invalid response %s' % response
-        response.encoderData.update(fetcher=Fetcher(self, args))
-        return self.invoker.invoke(*args[:len(self.invoker.inputs)])
+        fetcher = Fetcher(self, args)
+        response.encoderData.update(fetcher=fetcher)
+        value = self.invoker.invoke(*args[:len(self.invoker.inputs)])
+
+        if value is None or not isinstance(self.invoker.output, Iter): return value
+        data = response.encoderDataModel
+        if not isinstance(data, DataModel) or DataModel.datas not in data: return value
+
+        names = {}
+        for name, cdata in data.datas.items():
+            assert isinstance(cdata, DataModel), 'Invalid data model %s' % cdata
+            if not cdata.fetchReference: continue
+            index = self.references.get(cdata.fetchReference)
+            if index is not None and self.invokers[index][2] is not None: names[name] = cdata.fetchReference
+        if not names: return value
+
+        if isinstance(value, IterPart):
+            assert isinstance(value, IterPart)
+            value.wrapped = fetcher.prefetching(value.wrapped, names, self.batchSize)
+            return value
+        return fetcher.prefetching(value, names, self.batchSize)
 
 class Fetcher(IFetcher):
     '''
@@ -259,11 +363,75 @@ class Fetcher(IFetcher):
             index = fetcher.references.get(reference)
             if index is None: value = None
             else:
-                invoker, indexes = fetcher.invokers[index]
+                invoker, indexes, _batch, _propertyId = fetcher.invokers[index]
                 assert isinstance(invoker, Invoker)
 
                 value = invoker.invoke(*(valueId if k is None else self.args[k] for k in indexes))
+                fetcher.count(1)
             values[valueId] = value
 
         return value
 
+    def prefetching(self, items, names, batchSize):
+        '''
+        Provides the items while fetching in batches the models referenced by the items.
+        
+        @param items: Iterable
+            The items that reference the models.
+        @param names: dictionary{string: Reference}
+            The items properties names that contain the models ids, as a key, and as a value the reference of the
+            models, only references that have a batch fetch are allowed.
+        @param batchSize: integer
+            The number of items for which to fetch the models at once.
+        @return: Iterable
+            The items.
+        '''
+        assert isinstance(items, Iterable), 'Invalid items %s' % items
+        assert isinstance(names, dict), 'Invalid names %s' % names
+
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batchSize:
+                self.prefetch(batch, names)
+                for item in batch: yield item
+                batch = []
+        if batch:
+            self.prefetch(batch, names)
+            for item in batch: yield item
+
+    def prefetch(self, items, names):
+        '''
+        Fetches in batches the models referenced by the items, the models that are not provided by the batch fetch are
+        later fetched one by one.
+        
+        @param items: list[object]
+            The items that reference the models.
+        @param names: dictionary{string: Reference}
+            The items properties names that contain the models ids, as a key, and as a value the reference of the models.
+        '''
+        fetcher = self.fetcher
+        assert isinstance(fetcher, FetcherInvoker)
+
+        for name, reference in names.items():
+            values = self._cache.get(reference)
+            if values is None: values = self._cache[reference] = {}
+
+            valueIds = OrderedDict.fromkeys(getattr(item, name, None) for item in items)
+            valueIds = [valueId for valueId in valueIds if valueId is not None and valueId not in values]
+            if not valueIds: continue
+
+            _invoker, indexes, batch, propertyId = fetcher.invokers[fetcher.references[reference]]
+            models = batch(*(valueIds if k is None else self.args[k] for k in indexes))
+            fetched = 0
+            if models is not None:
+                requested = set(valueIds)
+                for model in models:
+                    valueId = getattr(model, propertyId)
+                    if valueId in requested:
+                        requested.discard(valueId)
+                        fetched += 1
+                    values[valueId] = model
+            # The batch call replaces the calls for the fetched models, the models not fetched are later called one by one.
+            fetcher.count(1, fetched - 1)
+
@@ -96,7 +96,7 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
 
         self._reSplitValues = re.compile(self.regexSplitValues)
         self._reNormalizeValue = re.compile(self.regexNormalizeValue)
-        self._cacheDecode = WeakKeyDictionary()
+        self._cachePlans = WeakKeyDictionary()
         self._cacheEncode = WeakKeyDictionary()
 
     def process(self, request:Request, response:Response, **keyargs):
@@ -115,17 +115,20 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
         assert isinstance(invoker, Invoker), 'No invoker available for %s' % request
 
         if request.parameters:
-            decode = self._cacheDecode.get(invoker)
-            if decode is None:
-                decode = self.decodeInvoker(invoker)
+            plans = self._cachePlans.get(invoker)
+            if plans is None:
+                plans = self._cachePlans[invoker] = {}
                 request.path.node.addNodeListener(self)
-                self._cacheDecode[invoker] = decode
+            plan = plans.get(request.normalizerParameters)
+            if plan is None:
+                plan = plans[request.normalizerParameters] = self.planInvoker(invoker, request.normalizerParameters)
 
             illegal = []
             context = dict(target=request.arguments,
                            normalizer=request.normalizerParameters, converter=request.converterParameters)
             for name, value in request.parameters:
-                if not decode(path=name, value=value, **context): illegal.append((name, value))
+                decode = plan.get(name)
+                if decode is None or not decode(path=deque(), value=value, **context): illegal.append((name, value))
 
             # if illegal:
             #     encode = self._cacheEncode.get(invoker)
@@ -156,7 +159,7 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
         '''
         @see: INodeInvokerListener.onInvokerChange
         '''
-        self._cacheDecode.pop(old, None)
+        self._cachePlans.pop(old, None)
         self._cacheEncode.pop(old, None)
 
     # ----------------------------------------------------------------
@@ -226,83 +229,6 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
 
         return exploit
 
-    def decodePath(self, children):
-        '''
-        Exploit to locate a decoder in the provided children based on the exploit path.
-        
-        @param children: dictionary{string, callable(**data)}
-            The children exploits to be identified based on the key.
-        @return: callable(**data) -> boolean
-            The exploit that provides the path decoding.
-        '''
-        assert isinstance(children, dict), 'Invalid children %s' % children
-        if __debug__:
-            for keyChild, exploitChild in children.items():
-                assert isinstance(keyChild, str), 'Invalid child key %s' % keyChild
-                assert callable(exploitChild), 'Invalid child exploit %s' % exploitChild
-
-        def exploit(path, normalizer, **data):
-            assert isinstance(path, deque), 'Invalid path %s' % path
-            assert path, 'Invalid path, needs to have at least one entry'
-            assert isinstance(normalizer, Normalizer), 'Invalid normalizer %s' % normalizer
-
-            key = path.popleft()
-            if not isinstance(key, str): return False
-            assert isinstance(key, str), 'Invalid path element %s' % key
-
-            for keyChild, exploitChild in children.items():
-                assert isinstance(keyChild, str), 'Invalid child key %s' % keyChild
-                if normalizer.normalize(keyChild) == key: break
-            else: return False
-            return exploitChild(path=path, normalizer=normalizer, **data)
-
-        return exploit
-
-    def decodeCriteria(self, typeCriteria, getterCriteria):
-        '''
-        Exploit that provides the decoder for the criteria.
-        
-        @param typeCriteria: TypeCriteria
-            The criteria type to decode.
-        @param getterCriteria: callable(object) -> object
-            The getter used to get the criteria from the target object.
-        @return: callable(**data) -> boolean
-            The exploit that provides the criteria decoding.
-        '''
-        assert isinstance(typeCriteria, TypeCriteria), 'Invalid criteria type %s' % typeCriteria
-        assert callable(getterCriteria), 'Invalid getter %s' % getterCriteria
-        criteria = typeCriteria.container
-        assert isinstance(criteria, Criteria)
-
-        if issubclass(typeCriteria.clazz, AsOrdered): exclude = ('ascending', 'priority')
-        else: exclude = ()
-
-        children = {}
-        for prop, typeProp in criteria.properties.items():
-            if prop in exclude: continue
-
-            if isinstance(typeProp, Iter):
-                assert isinstance(typeProp, Iter)
-
-                setter = setterWithGetter(obtainOnObj(prop, list), list.append)
-                propDecode = self.decodePrimitiveList(setter, typeProp.itemType)
-            else: propDecode = self.decodePrimitive(setterOnObj(prop), typeProp)
-            children[prop] = propDecode
-
-        exploitPath = self.decodePath(children)
-        def exploit(path, target, **data):
-            assert isinstance(path, deque), 'Invalid path %s' % path
-
-            if path: return exploitPath(path=path, target=getterCriteria(target), **data)
-            if not criteria.main: return False
-
-            data.update(path=path, target=getterCriteria(target))
-            for prop in criteria.main:
-                if not children[prop](**data): return False
-            return True
-
-        return exploit
-
     def decodeSetOrder(self, typeEntry, getterQuery):
         '''
         Create a decode exploit that sets the orderer.
@@ -316,21 +242,20 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
         '''
         assert isinstance(typeEntry, TypeCriteriaEntry), 'Invalid entry type %s' % typeEntry
         assert callable(getterQuery), 'Invalid getter %s' % getterQuery
+        assert isinstance(typeEntry.parent, TypeQuery)
 
+        ordered = [etype for etype in typeEntry.parent.criteriaEntryTypes()
+                   if etype != typeEntry and etype.isOf(AsOrdered)]
         def exploit(path, target, value, **data):
             assert isinstance(path, deque), 'Invalid path %s' % path
-            assert isinstance(typeEntry.parent, TypeQuery)
             if path: return False
             # Only if there are no other elements in path we process the exploit
             query = getterQuery(target)
             assert typeEntry.parent.isValid(query), 'Invalid query object %s' % query
             # We first find the biggest priority in the query
             priority = 0
-            for etype in typeEntry.parent.criteriaEntryTypes():
+            for etype in ordered:
                 assert isinstance(etype, TypeCriteriaEntry)
-                if etype == typeEntry: continue
-                if not etype.isOf(AsOrdered): continue
-
                 if etype in query:
                     criteria = getattr(query, etype.name)
                     assert isinstance(criteria, AsOrdered), 'Invalid criteria %s' % criteria
@@ -344,53 +269,98 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
 
         return exploit
 
-    def decodeOrder(self, ascending, exploitOrder):
+    def planCriteria(self, plan, prefix, typeCriteria, getterCriteria, normalizer):
+        '''
+        Adds to the plan the decode exploits for the criteria.
+        
+        @param plan: dictionary{string, callable(**data)}
+            The plan to add the criteria exploits to.
+        @param prefix: string
+            The normalized parameter name of the criteria.
+        @param typeCriteria: TypeCriteria
+            The criteria type to decode.
+        @param getterCriteria: callable(object) -> object
+            The getter used to get the criteria from the target object.
+        @param normalizer: Normalizer
+            The normalizer used for the parameters names.
+        '''
+        assert isinstance(plan, dict), 'Invalid plan %s' % plan
+        assert isinstance(prefix, str), 'Invalid prefix %s' % prefix
+        assert isinstance(typeCriteria, TypeCriteria), 'Invalid criteria type %s' % typeCriteria
+        assert callable(getterCriteria), 'Invalid getter %s' % getterCriteria
+        assert isinstance(normalizer, Normalizer), 'Invalid normalizer %s' % normalizer
+        criteria = typeCriteria.container
+        assert isinstance(criteria, Criteria)
+
+        if issubclass(typeCriteria.clazz, AsOrdered): exclude = ('ascending', 'priority')
+        else: exclude = ()
+
+        children = {}
+        for prop, typeProp in criteria.properties.items():
+            if prop in exclude: continue
+
+            if isinstance(typeProp, Iter):
+                assert isinstance(typeProp, Iter)
+
+                setter = setterWithGetter(getterCriteria, setterWithGetter(obtainOnObj(prop, list), list.append))
+                children[prop] = self.decodePrimitiveList(setter, typeProp.itemType)
+            else: children[prop] = self.decodePrimitive(setterWithGetter(getterCriteria, setterOnObj(prop)), typeProp)
+
+        if criteria.main:
+            main = [children[prop] for prop in criteria.main]
+            def exploit(**data):
+                for exploitMain in main:
+                    if not exploitMain(**data): return False
+                return True
+            plan[prefix] = exploit
+
+        for prop, exploitProp in children.items():
+            plan[self.separatorName.join((prefix, normalizer.normalize(prop)))] = exploitProp
+
+    def planOrder(self, ascending, orders):
         '''
-        Exploit to decode the order. Basically this exploit converts the ascending and descending parameter values to
-        paths that are processed by the provided children.
+        Exploit to decode the order based on the order exploits plan.
         
         @param ascending: boolean
             The value used for this order.
-        @param exploitOrder: callable(**data) -> boolean
-            The exploit to be used in the order decoding.
+        @param orders: dictionary{string, callable(**data)}
+            The set order exploits indexed by the normalized criteria parameter name.
         @return: callable(**data) -> boolean
             The exploit that provides the ordering decoding.
         '''
         assert isinstance(ascending, bool), 'Invalid ascending flag %s' % ascending
-        assert callable(exploitOrder), 'Invalid order exploit %s' % exploitOrder
+        assert isinstance(orders, dict), 'Invalid orders %s' % orders
 
-        def exploit(path, value, **data):
-            assert isinstance(path, deque), 'Invalid path %s' % path
-            if path: return False
-            # Only if there are no other elements in path we process the exploit
+        def exploit(value, **data):
             if isinstance(value, (list, tuple)): values = value
             else: values = (value,)
 
             data.update(value=ascending)
             for value in values:
                 if not isinstance(value, str): return False
-                else:
-                    paths = self._reSplitValues.split(value)
-                    for k in range(0, len(paths)): paths[k] = self._reNormalizeValue.sub('', paths[k])
-                    for path in paths:
-                        data.update(path=deque(path.split(self.separatorName)))
-                        if not exploitOrder(**data): return False
+                for name in self._reSplitValues.split(value):
+                    exploitOrder = orders.get(self._reNormalizeValue.sub('', name))
+                    if exploitOrder is None or not exploitOrder(**data): return False
             return True
 
         return exploit
 
-    def decodeInvoker(self, invoker):
+    def planInvoker(self, invoker, normalizer):
         '''
-        Create a decode exploit for the invoker.
+        Create the decode plan for the invoker, the plan contains for each accepted normalized parameter name the
+        exploit that decodes the parameter value, the exploits need to be called with an empty path.
         
         @param invoker: Invoker
-            The invoker to create a parameters decoder for.
-        @return: callable(**data) -> boolean
-            The exploit that provides the invoker decoding.
+            The invoker to create a parameters decode plan for.
+        @param normalizer: Normalizer
+            The normalizer used for the parameters names.
+        @return: dictionary{string, callable(**data)}
+            The exploits indexed by the normalized parameter name.
         '''
         assert isinstance(invoker, Invoker), 'Invalid invoker %s' % invoker
+        assert isinstance(normalizer, Normalizer), 'Invalid normalizer %s' % normalizer
 
-        children, ordered = {}, {}
+        plan, orders, names, namesOrdered = {}, {}, set(), set()
         for inp in invoker.inputs:
             assert isinstance(inp, Input)
             typeInp = inp.type
@@ -403,49 +373,50 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
                     setter = setterWithGetter(obtainOnDict(inp.name, list), list.append)
                     inpDecode = self.decodePrimitiveList(setter, typeInp.itemType)
                 else: inpDecode = self.decodePrimitive(setterOnDict(inp.name), typeInp)
-                children[inp.name] = inpDecode
+
+                name = normalizer.normalize(inp.name)
+                # The primitive input replaces any other parameters with the same name.
+                for key in [key for key in plan if key.startswith(name + self.separatorName)]: del plan[key]
+                plan[name] = inpDecode
+                names.add(inp.name)
 
             elif isinstance(typeInp, TypeQuery):
                 assert isinstance(typeInp, TypeQuery)
                 assert isinstance(typeInp.query, Query)
 
-                childrenQuery, orderedQuery, getterQuery = {}, {}, obtainOnDict(inp.name, inp.type.clazz)
-                for nameEntry, classCriteria in typeInp.query.criterias.items():
+                criterias = typeInp.query.criterias
+                criteriasOrdered = [nameEntry for nameEntry, classCriteria in criterias.items()
+                                    if issubclass(classCriteria, AsOrdered)]
+                # If the query is a main query and also there is no name conflict then the query criteria are added
+                # to the main parameters.
+                if invoker.output.isOf(typeInp.owner) and names.isdisjoint(criterias) \
+                and namesOrdered.isdisjoint(criteriasOrdered):
+                    prefix = None
+                    names.update(criterias)
+                    namesOrdered.update(criteriasOrdered)
+                else:
+                    prefix = normalizer.normalize(inp.name)
+                    names.add(inp.name)
+                    namesOrdered.add(inp.name)
+
+                getterQuery = obtainOnDict(inp.name, inp.type.clazz)
+                for nameEntry, classCriteria in criterias.items():
+                    name = normalizer.normalize(nameEntry)
+                    if prefix is not None: name = self.separatorName.join((prefix, name))
 
                     getter = getterChain(getterQuery, getterOnObj(nameEntry))
-                    childrenQuery[nameEntry] = self.decodeCriteria(typeFor(classCriteria), getter)
+                    self.planCriteria(plan, name, typeFor(classCriteria), getter, normalizer)
 
                     if issubclass(classCriteria, AsOrdered):
-                        orderedQuery[nameEntry] = self.decodeSetOrder(typeInp.criteriaEntryTypeFor(nameEntry), getterQuery)
-
-                isUpdated = False
-                if invoker.output.isOf(typeInp.owner):
-                    # If the query is a main query and also there is no name conflict then add the query children to
-                    # the main children
-                    if set(childrenQuery.keys()).isdisjoint(children.keys()) and set(orderedQuery).isdisjoint(ordered):
-                        isUpdated = True
-                        children.update(childrenQuery)
-                        ordered.update(orderedQuery)
+                        orders[name] = self.decodeSetOrder(typeInp.criteriaEntryTypeFor(nameEntry), getterQuery)
 
-                if not isUpdated:
-                    children[inp.name] = self.decodePath(childrenQuery)
-                    ordered[inp.name] = self.decodePath(orderedQuery)
-
-        if self.nameOrderAsc in children: log.error('Name conflict for \'%s\' in %s', self.nameOrderAsc, invoker)
-        elif self.nameOrderDesc in children: log.error('Name conflict for \'%s\' in %s', self.nameOrderDesc, invoker)
+        if self.nameOrderAsc in names: log.error('Name conflict for \'%s\' in %s', self.nameOrderAsc, invoker)
+        elif self.nameOrderDesc in names: log.error('Name conflict for \'%s\' in %s', self.nameOrderDesc, invoker)
         else:
-            exploitOrder = self.decodePath(ordered)
-            children[self.nameOrderAsc] = self.decodeOrder(True, exploitOrder)
-            children[self.nameOrderDesc] = self.decodeOrder(False, exploitOrder)
-
-        exploitPath = self.decodePath(children)
-        def exploit(path, **data):
-            assert isinstance(path, str), 'Invalid path %s' % path
-
-            path = deque(path.split(self.separatorName))
-            return exploitPath(path=path, **data)
+            plan[normalizer.normalize(self.nameOrderAsc)] = self.planOrder(True, orders)
+            plan[normalizer.normalize(self.nameOrderDesc)] = self.planOrder(False, orders)
 
-        return exploit
+        return plan
 
     # ----------------------------------------------------------------
 
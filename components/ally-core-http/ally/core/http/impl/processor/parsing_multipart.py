@@ -23,6 +23,7 @@ from ally.exception import DevelError
 from ally.support.util_io import IInputStream, IClosable
 from collections import Callable
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 import codecs
 import logging
 import re
@@ -39,6 +40,7 @@ FLAG_MARK_START = 1 << 2
 FLAG_MARK_END = 1 << 3
 FLAG_HEADER_END = 1 << 4
 FLAG_CLOSED = 1 << 5
+FLAG_STREAM_END = 1 << 6
 FLAG_MARK = FLAG_MARK_START | FLAG_MARK_END
 FLAG_END = FLAG_CONTENT_END | FLAG_MARK
 
@@ -88,28 +90,37 @@ class DataMultiPart:
     '''
     charSet = 'UTF8'
     # The character set used in decoding the multi part header areas.
-    formatMarkStart = '--%s\r\n'
-    # The format used in constructing the separator marker between the multi part content.
-    formatMarkEnd = '--%s--\r\n'
-    # The format used in constructing the end marker for the content.
+    formatMark = '--%s'
+    # The format used in constructing the boundary mark between the multi part content.
+    markStart = '\r\n'
+    # The characters that follow the boundary mark for a separator between the multi part bodies.
+    markEnd = '--'
+    # The characters that follow the boundary mark for the end of the multi part content.
     markHeaderEnd = '\r\n\r\n'
     # Provides the marker for the end of the headers in a multi part body.
     trimBodyAtEnd = '\r\n'
     # Characters to be removed from the multi part body end, if found.
     separatorHeader = ':'
     # Mark used to separate the header from the value, only the first occurrence is considered.
-    packageSize = 1024
+    packageSize = 64 * 1024
     # The maximum package size to be read in one go.
+    spoolSize = 1024 * 1024
+    # The maximum size in bytes of a multi part body that is kept in memory, the bigger bodies are spooled to a temporary
+    # file. If 0 then the bodies are not spooled but read directly from the request content.
 
     def __init__(self):
         assert isinstance(self.charSet, str), 'Invalid character set %s' % self.charSet
-        assert isinstance(self.formatMarkStart, str), 'Invalid format mark start %s' % self.formatMarkStart
-        assert isinstance(self.formatMarkEnd, str), 'Invalid format mark end %s' % self.formatMarkEnd
+        assert isinstance(self.formatMark, str), 'Invalid format mark %s' % self.formatMark
+        assert isinstance(self.markStart, str), 'Invalid mark start %s' % self.markStart
+        assert isinstance(self.markEnd, str), 'Invalid mark end %s' % self.markEnd
         assert isinstance(self.markHeaderEnd, str), 'Invalid header end %s' % self.markHeaderEnd
         assert isinstance(self.trimBodyAtEnd, str), 'Invalid trim body at end %s' % self.trimBodyAtEnd
         assert isinstance(self.separatorHeader, str), 'Invalid separator header %s' % self.separatorHeader
-        assert isinstance(self.packageSize, int), 'Invalid package size %s' % self.packageSize
+        assert isinstance(self.packageSize, int) and self.packageSize > 0, 'Invalid package size %s' % self.packageSize
+        assert isinstance(self.spoolSize, int), 'Invalid spool size %s' % self.spoolSize
 
+        self.markStart = bytes(self.markStart, self.charSet)
+        self.markEnd = bytes(self.markEnd, self.charSet)
         self.markHeaderEnd = bytes(self.markHeaderEnd, self.charSet)
         self.trimBodyAtEnd = bytes(self.trimBodyAtEnd, self.charSet)
 
@@ -186,9 +197,10 @@ class ParsingMultiPartHandler(ParsingHandler, DataMultiPart):
 
 class StreamMultiPart(IInputStream, IClosable):
     '''
-    Provides the muti part stream content.
+    Provides the muti part stream content, the content is read in packages in a buffer that is consumed by moving the
+    buffer start, the boundary mark is searched only in the newly read data.
     '''
-    __slots__ = ('_data', '_stream', '_markStart', '_markEnd', '_extraSize', '_flag', '_buffer')
+    __slots__ = ('_data', '_stream', '_mark', '_extraSize', '_flag', '_buffer', '_start', '_scan')
 
     def __init__(self, data, stream, boundary):
         '''
@@ -208,12 +220,13 @@ class StreamMultiPart(IInputStream, IClosable):
         self._data = data
         self._stream = stream
 
-        self._markStart = bytes(data.formatMarkStart % boundary, data.charSet)
-        self._markEnd = bytes(data.formatMarkEnd % boundary, data.charSet)
-        self._extraSize = max(len(self._markStart), len(self._markEnd), len(data.markHeaderEnd))
+        self._mark = bytes(data.formatMark % boundary, data.charSet)
+        self._extraSize = max(len(data.markStart), len(data.markEnd))
 
         self._flag = 0
         self._buffer = bytearray()
+        self._start = 0
+        self._scan = 0
 
     def read(self, nbytes=None):
         '''
@@ -222,21 +235,11 @@ class StreamMultiPart(IInputStream, IClosable):
         if self._flag & FLAG_CLOSED: raise ValueError('I/O operation on a closed content file')
         if self._flag & FLAG_END: return b''
 
-        if nbytes:
-            if nbytes <= self._data.packageSize:
-                return self._readToMark(nbytes)
-            else:
-                data = bytearray()
-                while True:
-                    data.extend(self._readToMark(min(nbytes - len(data), self._data.packageSize)))
-                    if len(data) >= nbytes or self._flag & FLAG_END: break
-        else:
-            data = bytearray()
-            while True:
-                data.extend(self._readToMark(self._data.packageSize))
-                if self._flag & FLAG_END: break
+        if nbytes: return self._readToMark(nbytes)
 
-        return bytes(data)
+        data = []
+        while not self._flag & FLAG_END: data.append(self._readToMark(self._data.packageSize))
+        return b''.join(data)
 
     def close(self):
         '''
@@ -244,77 +247,102 @@ class StreamMultiPart(IInputStream, IClosable):
         '''
         self._flag |= FLAG_CLOSED
 
+    def spool(self, size):
+        '''
+        Spools the content until the next mark in a temporary file.
+        
+        @param size: integer
+            The maximum size in bytes of the content kept in memory, the bigger content is written on disk.
+        @return: SpooledTemporaryFile
+            The file containing the content, positioned at start.
+        '''
+        assert isinstance(size, int), 'Invalid size %s' % size
+
+        spool = SpooledTemporaryFile(size)
+        while not self._flag & FLAG_END: spool.write(self._readToMark(self._data.packageSize))
+        spool.seek(0)
+        return spool
+
     # ----------------------------------------------------------------
 
-    def _readInBuffer(self, nbytes):
+    def _readInBuffer(self):
         '''
-        Reads in the instance buffer the specified number of bytes, always when reading it will read in the buffer
-        additional bytes for the mark processing. It will adjust the flags if END is encountered.
+        Reads a package in the instance buffer, before reading the consumed part of the buffer is removed if is the bigger
+        part of the buffer. It will adjust the flags if the stream END is encountered.
+        
+        @return: boolean
+            True if data has been read, False if the stream has no more data.
         '''
-        assert not self._flag & FLAG_CONTENT_END, 'End reached, cannot read anymore'
-        data = self._stream.read(nbytes + self._extraSize - len(self._buffer))
-        if data: self._buffer.extend(data)
-        if not self._buffer: self._flag |= FLAG_CONTENT_END
+        if self._flag & FLAG_STREAM_END: return False
 
-    def _readToMark(self, nbytes):
+        if self._start and self._start >= len(self._buffer) >> 1:
+            del self._buffer[:self._start]
+            self._scan -= self._start
+            self._start = 0
+
+        data = self._stream.read(self._data.packageSize)
+        if data:
+            self._buffer.extend(data)
+            return True
+        self._flag |= FLAG_STREAM_END
+        return False
+
+    def _consume(self, end, after=None):
         '''
-        Read the provided number of bytes or read until a mark separator is encountered (including the end separator).
-        It will adjust the flags according to the findings.
+        Consumes the buffer until the end index.
         
+        @param end: integer
+            The buffer index where the consumed bytes stop.
+        @param after: integer|None
+            The buffer index where the next read starts, if None then the end index is used.
         @return: bytes
-            The bytes read.
+            The consumed bytes.
         '''
-        assert not self._flag & FLAG_MARK, 'Already at a mark, cannot read until flag is reset'
-
-        self._readInBuffer(nbytes)
-
-        if not self._buffer: return b''
-        indexSep = self._buffer.find(self._markStart)
-        if indexSep >= 0:
-            self._flag |= FLAG_MARK_START
-            indexBody = indexSep - len(self._data.trimBodyAtEnd)
-            if not self._buffer.endswith(self._data.trimBodyAtEnd, indexBody, indexSep): indexBody = indexSep
-            data = self._buffer[:indexBody]
-            del self._buffer[:indexSep + len(self._markStart)]
-        else:
-            nbytes = max(len(self._buffer), nbytes)
-            data = self._buffer[:nbytes]
-            del self._buffer[:nbytes]
-
-        indexEnd = data.find(self._markEnd)
-        if indexEnd >= 0:
-            self._flag |= FLAG_MARK_END
-            indexBody = indexEnd - len(self._data.trimBodyAtEnd)
-            if not data.endswith(self._data.trimBodyAtEnd, indexBody, indexEnd): indexBody = indexEnd
-            data = data[:indexBody]
-            self._buffer = data[indexEnd + len(self._markEnd):]
-
+        data = bytes(self._buffer[self._start:end])
+        self._start = end if after is None else after
+        if self._scan < self._start: self._scan = self._start
         return data
 
-    def _readToHeader(self, nbytes):
+    def _readToMark(self, nbytes):
         '''
-        Read the provided number of bytes or read until the mark header is encountered.
+        Read the provided number of bytes or read until a mark separator is encountered (including the end separator).
         It will adjust the flags according to the findings.
         
         @return: bytes
             The bytes read.
         '''
-        assert not self._flag & FLAG_HEADER_END, 'Already at header end, cannot read until flag is reset'
-
-        self._readInBuffer(nbytes)
-
-        if not self._buffer: return b''
-        indexHeader = self._buffer.find(self._data.markHeaderEnd)
-        if indexHeader >= 0:
-            self._flag |= FLAG_HEADER_END
-            data = self._buffer[:indexHeader]
-            del self._buffer[:indexHeader + len(self._data.markHeaderEnd)]
-        else:
-            nbytes = max(len(self._buffer), nbytes)
-            data = self._buffer[:nbytes]
-            del self._buffer[:nbytes]
+        assert not self._flag & FLAG_MARK, 'Already at a mark, cannot read until flag is reset'
+        mark, trim, data = self._mark, self._data.trimBodyAtEnd, self._data
 
-        return data
+        while True:
+            index = self._buffer.find(mark, self._scan)
+            if index >= 0:
+                indexAfter = index + len(mark)
+                if indexAfter + self._extraSize > len(self._buffer) and self._readInBuffer(): continue
+
+                if self._buffer.startswith(data.markStart, indexAfter):
+                    flag, indexAfter = FLAG_MARK_START, indexAfter + len(data.markStart)
+                elif self._buffer.startswith(data.markEnd, indexAfter): flag = FLAG_MARK_END
+                else:
+                    # Not a separator mark, the search continues after the mark beginning.
+                    self._scan = index + 1
+                    continue
+
+                indexBody = index - len(trim)
+                if indexBody < self._start or not self._buffer.startswith(trim, indexBody): indexBody = index
+                if indexBody - self._start > nbytes: return self._consume(self._start + nbytes)
+
+                self._flag |= flag
+                if flag == FLAG_MARK_END: return self._consume(indexBody, len(self._buffer))
+                return self._consume(indexBody, indexAfter)
+
+            # No mark found, the bytes that can be part of a mark that is not completely read are kept.
+            self._scan = max(self._start, len(self._buffer) - len(mark) + 1)
+            indexSafe = len(self._buffer) - len(mark) - len(trim) + 1
+            if indexSafe - self._start >= nbytes: return self._consume(self._start + nbytes)
+            if not self._readInBuffer():
+                self._flag |= FLAG_CONTENT_END
+                return self._consume(len(self._buffer))
 
     def _pullHeaders(self):
         '''
@@ -325,13 +353,11 @@ class StreamMultiPart(IInputStream, IClosable):
         '''
         assert self._flag & FLAG_MARK_START, 'Not at a separator mark position, cannot process headers'
 
-        data = bytearray()
         while True:
-            data.extend(self._readToHeader(self._data.packageSize))
-            if self._flag & FLAG_HEADER_END:
-                self._flag ^= FLAG_HEADER_END  # Clearing the header flag
-                break
-            if self._flag & FLAG_CONTENT_END: raise DevelError('No empty line after multi part header')
+            index = self._buffer.find(self._data.markHeaderEnd, self._start)
+            if index >= 0: break
+            if not self._readInBuffer(): raise DevelError('No empty line after multi part header')
+        data = self._consume(index, index + len(self._data.markHeaderEnd))
 
         reader = codecs.getreader(self._data.charSet)(BytesIO(data))
         headers = {}
@@ -407,7 +433,8 @@ class NextContent:
             req.headers = stream._pullHeaders()
             if stream._flag & FLAG_CLOSED: stream._flag ^= FLAG_CLOSED
 
-            reqCnt.source = stream
+            if self._data.spoolSize: reqCnt.source = stream.spool(self._data.spoolSize)
+            else: reqCnt.source = stream
             reqCnt.fetchNextContent = NextContent(reqCnt, self._response, self._processing, self._data, stream)
             reqCnt.previousContent = self._requestCnt
             
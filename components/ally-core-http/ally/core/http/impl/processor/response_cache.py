@@ -0,0 +1,350 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the rendered responses cache with entity tags for the resources invokers.
+'''
+
+from ally.api.config import GET
+from ally.api.operator.type import TypeModel, TypeModelProperty
+from ally.api.type import Input, Iter
+from ally.container.ioc import injected
+from ally.core.spec.resources import Invoker
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import requires, defines, optional
+from ally.design.processor.context import Context
+from ally.design.processor.execution import Processing, Chain
+from ally.design.processor.handler import HandlerBranching
+from ally.design.processor.processor import Included
+from ally.http.spec.codes import NOT_MODIFIED
+from ally.http.spec.server import IDecoderHeader, IEncoderHeader
+from ally.support.util import CacheLRU
+from collections import Iterable
+from hashlib import md5
+from threading import Lock
+import logging
+import time
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    '''
+    The request context.
+    '''
+    # ---------------------------------------------------------------- Required
+    invoker = requires(Invoker)
+    uri = requires(str)
+    decoderHeader = requires(IDecoderHeader)
+    # ---------------------------------------------------------------- Optional
+    headers = optional(dict)
+    parameters = optional(list)
+
+class Response(Context):
+    '''
+    The response context.
+    '''
+    # ---------------------------------------------------------------- Required
+    encoderHeader = requires(IEncoderHeader)
+    # ---------------------------------------------------------------- Optional
+    language = optional(str)
+    # ---------------------------------------------------------------- Defined
+    code = defines(str)
+    status = defines(int)
+    isSuccess = defines(bool)
+
+class ResponseContent(Context):
+    '''
+    The response content context.
+    '''
+    # ---------------------------------------------------------------- Optional
+    type = optional(str)
+    charSet = optional(str)
+    # ---------------------------------------------------------------- Defined
+    source = defines(Iterable)
+    length = defines(int)
+
+# --------------------------------------------------------------------
+
+@injected
+class ResponseCacheHandler(HandlerBranching):
+    '''
+    Implementation for a processor that caches the rendered responses of the GET invokers that have the cache hint, the
+    cached responses are identified by the invoker, the request URI and parameters, the content type, the response
+    language and the request headers used by the rendering. The responses of the cached invokers are provided with an
+    entity tag and the requests that have a matching if none match header are answered with not modified. The cached
+    responses are invalidated once the cache assembly is finalized (after the transaction commit) for a successful insert,
+    update or delete invoker on the models used by the cached invokers.
+    '''
+
+    cacheAssembly = Assembly
+    # The assembly that provides the rendered response, usually the invoking and the rendering processors.
+    cacheSize = 1000
+    # The maximum number of rendered responses to cache, if 0 then the responses are neither cached nor provided with
+    # entity tags.
+    maximumLength = 1024 * 1024
+    # The maximum length in bytes of a rendered response that is cached.
+    maximumAge = 300
+    # The maximum number of seconds a rendered response is cached, this limits the time a cached response is stale when
+    # the models are changed by other means then the invokers of this processor.
+    hintCache = 'cache'
+    # The call hint name that marks the invokers that have the responses cached.
+    namesKey = ['Host', 'X-TimeZone', 'X-Filter']
+    # The request headers names that are also used for identifying the cached responses.
+    prefixesKey = ['X-Format-']
+    # The request headers names prefixes for the headers that are also used for identifying the cached responses.
+    namesUncached = ['Authorization', 'Cookie']
+    # The request headers names that if present the response is not cached since it might be specific to the client.
+    nameETag = 'ETag'
+    # The header name for the entity tag.
+    nameIfNoneMatch = 'If-None-Match'
+    # The header name for the entity tags to match.
+
+    def __init__(self):
+        assert isinstance(self.cacheAssembly, Assembly), 'Invalid cache assembly %s' % self.cacheAssembly
+        assert isinstance(self.cacheSize, int), 'Invalid cache size %s' % self.cacheSize
+        assert isinstance(self.maximumLength, int), 'Invalid maximum length %s' % self.maximumLength
+        assert isinstance(self.maximumAge, int) and self.maximumAge > 0, 'Invalid maximum age %s' % self.maximumAge
+        assert isinstance(self.hintCache, str), 'Invalid cache hint name %s' % self.hintCache
+        assert isinstance(self.namesKey, list), 'Invalid key headers names %s' % self.namesKey
+        assert isinstance(self.prefixesKey, list), 'Invalid key headers prefixes %s' % self.prefixesKey
+        assert isinstance(self.namesUncached, list), 'Invalid uncached headers names %s' % self.namesUncached
+        assert isinstance(self.nameETag, str), 'Invalid entity tag name %s' % self.nameETag
+        assert isinstance(self.nameIfNoneMatch, str), 'Invalid if none match name %s' % self.nameIfNoneMatch
+        super().__init__(Included(self.cacheAssembly))
+
+        self.responseCache = ResponseCache(self.cacheSize, self.maximumAge) if self.cacheSize else None
+        self._prefixesKey = tuple(prefix.lower() for prefix in self.prefixesKey)
+
+    def process(self, chain, processing, request:Request, response:Response, responseCnt:ResponseContent, **keyargs):
+        '''
+        @see: HandlerBranching.process
+
+        Provides the cached response or renders and caches the response.
+        '''
+        assert isinstance(chain, Chain), 'Invalid processors chain %s' % chain
+        assert isinstance(processing, Processing), 'Invalid processing %s' % processing
+        assert isinstance(request, Request), 'Invalid request %s' % request
+        assert isinstance(response, Response), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContent), 'Invalid response content %s' % responseCnt
+
+        chain.proceed()
+        if response.isSuccess is False: return  # Skip in case the response is in error
+        assert isinstance(request.invoker, Invoker), 'Invalid invoker %s' % request.invoker
+
+        if request.invoker.method != GET:
+            chainCache = Chain(processing)
+            if self.responseCache is not None:
+                def onFinalize():
+                    '''
+                    Invalidates the cached responses, the call back is added first in order to be called after the call
+                    backs of the cache assembly processors (like the transaction commit).
+                    '''
+                    if response.isSuccess is not False: self.responseCache.invalidate(modelsFor(request.invoker))
+                chainCache.callBack(onFinalize)
+            chainCache.process(request=request, response=response, responseCnt=responseCnt, **keyargs).doAll()
+            return
+
+        if self.responseCache is None or not request.invoker.hints.get(self.hintCache):
+            # The entity tag requires the whole rendered content so without a cache the content is not buffered.
+            Chain(processing).process(request=request, response=response, responseCnt=responseCnt, **keyargs).doAll()
+            return
+
+        assert isinstance(request.decoderHeader, IDecoderHeader), 'Invalid header decoder %s' % request.decoderHeader
+        assert isinstance(response.encoderHeader, IEncoderHeader), 'Invalid header encoder %s' % response.encoderHeader
+
+        key = self.keyFor(request, response, responseCnt)
+        if key is not None: cached = self.responseCache.get(key)
+        else: cached = None
+
+        if cached is None:
+            Chain(processing).process(request=request, response=response, responseCnt=responseCnt, **keyargs).doAll()
+            if response.isSuccess is False or responseCnt.source is None: return
+
+            content = b''.join(responseCnt.source)
+            eTag = '"%s"' % md5(content).hexdigest()
+            if key is not None and len(content) <= self.maximumLength:
+                self.responseCache.put(key, (eTag, content), modelsFor(request.invoker))
+        else: eTag, content = cached
+
+        response.encoderHeader.encode(self.nameETag, eTag)
+        if self.isMatched(request, eTag):
+            response.code, response.status, response.isSuccess = NOT_MODIFIED
+            responseCnt.source, responseCnt.length = None, None
+        else: responseCnt.source, responseCnt.length = (content,), len(content)
+
+    # ----------------------------------------------------------------
+
+    def keyFor(self, request, response, responseCnt):
+        '''
+        Provides the cache key for the response.
+
+        @return: tuple|None
+            The key identifying the rendered response, None if the response should not be cached.
+        '''
+        assert isinstance(request, Request), 'Invalid request %s' % request
+        assert isinstance(response, Response), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContent), 'Invalid response content %s' % responseCnt
+
+        for name in self.namesUncached:
+            if request.decoderHeader.retrieve(name) is not None: return
+
+        if Request.parameters in request and request.parameters: parameters = tuple(request.parameters)
+        else: parameters = None
+        language = response.language if Response.language in response else None
+        typ = responseCnt.type if ResponseContent.type in responseCnt else None
+        charSet = responseCnt.charSet if ResponseContent.charSet in responseCnt else None
+        headers = [request.decoderHeader.retrieve(name) for name in self.namesKey]
+        if Request.headers in request and request.headers:
+            headers.extend(sorted((name.lower(), value) for name, value in request.headers.items()
+                                  if name.lower().startswith(self._prefixesKey)))
+        headers = tuple(headers)
+
+        return (request.invoker, request.uri, parameters, typ, charSet, language, headers)
+
+    def isMatched(self, request, eTag):
+        '''
+        Checks if the entity tag is matched by the if none match request header.
+
+        @param request: Request
+            The request to check.
+        @param eTag: string
+            The entity tag to check.
+        @return: boolean
+            True if the entity tag is matched, False otherwise.
+        '''
+        assert isinstance(request, Request), 'Invalid request %s' % request
+
+        value = request.decoderHeader.retrieve(self.nameIfNoneMatch)
+        if not value: return False
+        for tag in value.split(','):
+            tag = tag.strip()
+            if tag == '*': return True
+            if tag.startswith('W/'): tag = tag[2:]
+            if tag == eTag: return True
+        return False
+
+# --------------------------------------------------------------------
+
+class ResponseCache:
+    '''
+    Provides a least recently used cache for the rendered responses, the cached responses are indexed also by the models
+    names in order to be invalidated and they expire after the maximum age.
+    '''
+
+    def __init__(self, size, maximumAge):
+        '''
+        Construct the responses cache.
+
+        @param size: integer
+            The maximum number of cached responses.
+        @param maximumAge: integer|float
+            The maximum number of seconds a response is cached.
+        @ivar responses: CacheLRU
+            The cached responses together with the models names used by them and the expiration time.
+        '''
+        assert isinstance(maximumAge, (int, float)) and maximumAge > 0, 'Invalid maximum age %s' % maximumAge
+        self.responses = CacheLRU(size)
+        self.maximumAge = maximumAge
+
+        self._keysByModel = {}
+        self._lock = Lock()
+
+    def get(self, key):
+        '''
+        Provides the cached response for the key.
+
+        @param key: tuple
+            The key of the response.
+        @return: object|None
+            The cached response or None if there is no response cached for the key.
+        '''
+        cached = self.responses.get(key)
+        if cached is None: return
+        response, models, expires = cached
+        if expires > time.time(): return response
+
+        with self._lock:
+            if self.responses.pop(key) is not None: self._discard(key, models)
+
+    def put(self, key, response, models):
+        '''
+        Caches the response.
+
+        @param key: tuple
+            The key of the response.
+        @param response: object
+            The response to cache.
+        @param models: set(string)
+            The models names used by the response.
+        '''
+        assert isinstance(models, set), 'Invalid models %s' % models
+        with self._lock:
+            for name in models:
+                keys = self._keysByModel.get(name)
+                if keys is None: keys = self._keysByModel[name] = set()
+                keys.add(key)
+            discarded = self.responses.put(key, (response, models, time.time() + self.maximumAge))
+            if discarded is not None:
+                key, (_response, models, _expires) = discarded
+                self._discard(key, models)
+
+    def invalidate(self, models=None):
+        '''
+        Invalidates the cached responses.
+
+        @param models: set(string)|None
+            The models names for which to invalidate the responses, if None all the responses are invalidated.
+        '''
+        with self._lock:
+            if models is None:
+                self.responses.clear()
+                self._keysByModel.clear()
+                return
+            assert isinstance(models, set), 'Invalid models %s' % models
+            for name in models:
+                for key in self._keysByModel.pop(name, ()):
+                    cached = self.responses.pop(key)
+                    if cached is not None: self._discard(key, cached[1])
+
+    # ----------------------------------------------------------------
+
+    def _discard(self, key, models):
+        '''
+        Removes the key from the models index.
+        '''
+        for name in models:
+            keys = self._keysByModel.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys: del self._keysByModel[name]
+
+# --------------------------------------------------------------------
+
+def modelsFor(invoker):
+    '''
+    Provides the names of the models used by the invoker, as output or as inputs.
+
+    @param invoker: Invoker
+        The invoker to provide the models for.
+    @return: set(string)
+        The models names.
+    '''
+    assert isinstance(invoker, Invoker), 'Invalid invoker %s' % invoker
+
+    models = set()
+    types = [invoker.output]
+    for inp in invoker.inputs:
+        assert isinstance(inp, Input), 'Invalid input %s' % inp
+        types.append(inp.type)
+    for typ in types:
+        if isinstance(typ, Iter): typ = typ.itemType
+        if isinstance(typ, (TypeModel, TypeModelProperty)): models.add(typ.container.name)
+    return models
@@ -21,6 +21,7 @@ from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
 from ally.http.spec.server import IDecoderHeader, IEncoderHeader
 from ally.internationalization import _
+from ally.support.util import CacheLRU
 from babel import numbers as bn, dates as bd
 from babel.core import Locale
 from datetime import datetime
@@ -121,6 +122,9 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
                DateTime:'short'
                }
     # The default formats.
+    cacheSize = 200
+    # The maximum number of locales and of converters (by locale and formats) that are cached, if 0 then the locales and
+    # converters are created for every request.
 
     def __init__(self):
         assert isinstance(self.normalizer, Normalizer), 'Invalid normalizer %s' % self.normalizer
@@ -129,8 +133,14 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
         assert isinstance(self.formatContentNameX, str), 'Invalid name content format %s' % self.formatContentNameX
         assert isinstance(self.formats, dict), 'Invalid formats %s' % self.formats
         assert isinstance(self.defaults, dict), 'Invalid defaults %s' % self.defaults
+        assert isinstance(self.cacheSize, int), 'Invalid cache size %s' % self.cacheSize
         super().__init__()
 
+        if self.cacheSize:
+            self._locales = CacheLRU(self.cacheSize)
+            self._converters = CacheLRU(self.cacheSize)
+        else: self._locales = self._converters = None
+
     def process(self, request:RequestDecode, response:ResponseDecode, **keyargs):
         '''
         @see: HandlerProcessorProceed.process
@@ -149,14 +159,14 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
 
         locale = None
         if RequestDecode.language in request and request.language is not None:
-            try: locale = Locale.parse(request.language, sep='-')
-            except: assert log.debug('Invalid request content language %s', request.language) or True
+            locale = self.localeFor(request.language)
+            if locale is None: assert log.debug('Invalid request content language %s', request.language) or True
 
         if locale is None:
             if RequestDecode.language in request: request.language = self.languageDefault
-            locale = Locale.parse(self.languageDefault)
+            locale = self.localeFor(self.languageDefault, '_')
 
-        try: formats = self.processFormats(locale, formats)
+        try: converter = self.converterFor(locale, formats)
         except FormatError as e:
             assert isinstance(e, FormatError)
             if response.isSuccess is False: return  # Skip in case the response is in error
@@ -165,7 +175,7 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             response.errorMessage = 'Bad request content formatting, %s' % e.message
             return
 
-        request.converter = ConverterBabel(locale, formats)
+        request.converter = converter
         request.normalizer = self.normalizer
 
         formats = {}
@@ -175,21 +185,21 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
 
         locale = None
         if response.language:
-            try: locale = Locale.parse(response.language, sep='-')
-            except: assert log.debug('Invalid response content language %s', response.language) or True
+            locale = self.localeFor(response.language)
+            if locale is None: assert log.debug('Invalid response content language %s', response.language) or True
 
         if locale is None:
             if RequestDecode.accLanguages in request and request.accLanguages is not None:
                 for lang in request.accLanguages:
-                    try: locale = Locale.parse(lang, sep='-')
-                    except:
+                    locale = self.localeFor(lang)
+                    if locale is None:
                         assert log.debug('Invalid accepted content language %s', lang) or True
                         continue
                     assert log.debug('Accepted language %s for response', locale) or True
                     break
 
             if locale is None:
-                locale = Locale.parse(self.languageDefault)
+                locale = self.localeFor(self.languageDefault, '_')
                 if RequestDecode.accLanguages in request:
                     if request.accLanguages is not None:
                         request.accLanguages.insert(0, self.languageDefault)
@@ -205,7 +215,7 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             if RequestDecode.argumentsOfType in request and request.argumentsOfType is not None:
                 request.argumentsOfType[TypeLocale] = response.language
 
-        try: formats = self.processFormats(locale, formats)
+        try: converter = self.converterFor(locale, formats)
         except FormatError as e:
             assert isinstance(e, FormatError)
             if response.isSuccess is False: return  # Skip in case the response is in error
@@ -214,11 +224,61 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             response.errorMessage = 'Bad content formatting for response, %s' % e.message
             return
 
-        response.converter = ConverterBabel(locale, formats)
+        response.converter = converter
         response.normalizer = self.normalizer
 
     # ----------------------------------------------------------------
 
+    def localeFor(self, language, sep='-'):
+        '''
+        Provides the locale for the language.
+        
+        @param language: string
+            The language to provide the locale for.
+        @param sep: string
+            The separator used in the language between the language and territory.
+        @return: Locale|None
+            The locale for the language or None if the language is not valid.
+        '''
+        assert isinstance(language, str), 'Invalid language %s' % language
+        assert isinstance(sep, str), 'Invalid separator %s' % sep
+
+        if self._locales is not None:
+            locale = self._locales.get((language, sep))
+            if locale is not None: return locale or None
+
+        try: locale = Locale.parse(language, sep=sep)
+        except: locale = None
+
+        if self._locales is not None: self._locales.put((language, sep), locale or False)
+        return locale
+
+    def converterFor(self, locale, formats):
+        '''
+        Provides the converter for the locale and formats, the converters are shared by the requests.
+        
+        @param locale: Locale
+            The locale of the converter.
+        @param formats: dictionary{class, string}
+            The formats required for the converter.
+        @return: ConverterBabel
+            The converter.
+        @raise FormatError: If a format is not valid.
+        '''
+        assert isinstance(locale, Locale), 'Invalid locale %s' % locale
+        assert isinstance(formats, dict), 'Invalid formats %s' % formats
+
+        if self._converters is not None:
+            key = (str(locale), frozenset(formats.items()))
+            converter = self._converters.get(key)
+            if converter is not None: return converter
+
+        formats = self.processFormats(locale, formats)
+        converter = ConverterBabel(locale, formats, self.processPatterns(locale, formats))
+
+        if self._converters is not None: self._converters.put(key, converter)
+        return converter
+
     def processFormats(self, locale, formats):
         '''
         Process the formats to a complete list of formats that will be used by conversion.
@@ -242,17 +302,46 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
 
         return formats
 
+    def processPatterns(self, locale, formats):
+        '''
+        Process the formats to the compiled patterns used by conversion, the date time keyed formats are left to be
+        composed by Babel.
+        '''
+        assert isinstance(formats, dict), 'Invalid formats %s' % formats
+        assert isinstance(locale, Locale), 'Invalid locale %s' % locale
+
+        patterns = dict(formats)
+        for clsTyp, format in formats.items():
+            if clsTyp in (Number, Percentage): patterns[clsTyp] = bn.parse_pattern(format)
+            elif format not in self.formats[clsTyp]: patterns[clsTyp] = bd.parse_pattern(format)
+            elif clsTyp == Date: patterns[clsTyp] = bd.get_date_format(format, locale)
+            elif clsTyp == Time: patterns[clsTyp] = bd.get_time_format(format, locale)
+
+        return patterns
+
 class ConverterBabel(Converter):
     '''
     Converter implementation based on Babel.
     '''
-    __slots__ = ('locale', 'formats')
+    __slots__ = ('locale', 'formats', 'patterns')
 
-    def __init__(self, locale, formats):
+    def __init__(self, locale, formats, patterns=None):
+        '''
+        Construct the Babel converter.
+        
+        @param locale: Locale
+            The locale used by the converter.
+        @param formats: dictionary{class, string}
+            The formats used by the converter.
+        @param patterns: dictionary{class, object}|None
+            The compiled patterns (or formats) used in formatting, if None the formats are used.
+        '''
         assert isinstance(locale, Locale), 'Invalid locale %s' % locale
         assert isinstance(formats, dict), 'Invalid formats %s' % formats
+        assert patterns is None or isinstance(patterns, dict), 'Invalid patterns %s' % patterns
         self.locale = locale
         self.formats = formats
+        self.patterns = formats if patterns is None else patterns
 
     def asString(self, objValue, objType):
         '''
@@ -269,15 +358,15 @@ class ConverterBabel(Converter):
         if objType.isOf(bool):
             return str(objValue)
         if objType.isOf(Percentage):
-            return bn.format_percent(objValue, self.formats.get(Percentage, None), self.locale)
+            return bn.format_percent(objValue, self.patterns.get(Percentage), locale=self.locale)
         if objType.isOf(Number):
-            return bn.format_decimal(objValue, self.formats.get(Number, None), self.locale)
+            return bn.format_decimal(objValue, self.patterns.get(Number), locale=self.locale)
         if objType.isOf(Date):
-            return bd.format_date(objValue, self.formats.get(Date, None), self.locale)
+            return bd.format_date(objValue, self.patterns.get(Date), locale=self.locale)
         if objType.isOf(Time):
-            return bd.format_time(objValue, self.formats.get(Time, None), self.locale)
+            return bd.format_time(objValue, self.patterns.get(Time), locale=self.locale)
         if objType.isOf(DateTime):
-            return bd.format_datetime(objValue, self.formats.get(DateTime, None), None, self.locale)
+            return bd.format_datetime(objValue, self.patterns.get(DateTime), locale=self.locale)
         raise TypeError('Invalid object type %s for Babel converter' % objType)
 
     # TODO: add proper support for parsing.
@@ -311,43 +400,3 @@ class ConverterBabel(Converter):
         if objType.isOf(DateTime):
             return datetime.strptime(strValue, '%Y-%m-%d %H:%M:%S')
         raise TypeError('Invalid object type %s for Babel converter' % objType)
-
-# --------------------------------------------------------------------
-
-class ResponseEncode(Context):
-    '''
-    The response context.
-    '''
-    # ---------------------------------------------------------------- Required
-    encoderHeader = requires(IEncoderHeader)
-    converter = requires(Converter)
-
-# --------------------------------------------------------------------
-
-@injected
-class BabelConversionEncodeHandler(HandlerProcessorProceed):
-    '''
-    Implementation based on Babel for a processor that encodes the Babel converter format.
-    '''
-
-    formatContentNameX = 'X-FormatContent-%s'
-    # The format name for the headers that specify the format for the request content.
-
-    def __init__(self):
-        assert isinstance(self.formatContentNameX, str), 'Invalid name content format %s' % self.formatContentNameX
-        super().__init__()
-
-    def process(self, response:ResponseEncode, **keyargs):
-        '''
-        @see: HandlerProcessorProceed.process
-        
-        Provide the response formatting header encode.
-        '''
-        assert isinstance(response, ResponseEncode), 'Invalid response %s' % response
-        assert isinstance(response.encoderHeader, IEncoderHeader), \
-        'Invalid response header encoder %s' % response.encoderHeader
-
-        if isinstance(response.converter, ConverterBabel):
-            assert isinstance(response.converter, ConverterBabel)
-            for clsTyp, format in response.converter.formats.items():
-                response.encoderHeader.encode(self.formatContentNameX % clsTyp.__name__, format)
@@ -9,18 +9,20 @@ Created on Jun 28, 2011
 Provides the URI request path handler.
 '''
 
-from ally.api.type import Scheme, Type
+from ally.api.type import Scheme, Type, typeFor
 from ally.container.ioc import injected
+from ally.core.impl.node import NodeProperty, NodePath
 from ally.core.spec.resources import ConverterPath, Path, Converter, Normalizer, \
-    Node
+    Node, INodeChildListener, INodeInvokerListener, Match
 from ally.design.processor.attribute import requires, defines, optional
 from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
 from ally.http.spec.codes import PATH_FOUND, PATH_NOT_FOUND
-from ally.support.core.util_resources import findPath
+from ally.support.core.util_resources import PathFinder, iterateNodes
+from ally.support.util import CacheLRU
+from collections import deque
 from urllib.parse import unquote
 import logging
-from ally.core.impl.node import NodeProperty
 
 # --------------------------------------------------------------------
 
@@ -95,11 +97,18 @@ class URIHandler(HandlerProcessorProceed):
     # The resources node that will be used for finding the resource path.
     converterPath = ConverterPath
     # The converter path used for handling the URL path.
+    cacheSize = 500
+    # The maximum number of URI shapes to keep resolved, if 0 then no cache is used.
 
     def __init__(self):
         assert isinstance(self.resourcesRoot, Node), 'Invalid resources node %s' % self.resourcesRoot
         assert isinstance(self.converterPath, ConverterPath), 'Invalid ConverterPath object %s' % self.converterPath
+        assert isinstance(self.cacheSize, int), 'Invalid cache size %s' % self.cacheSize
         super().__init__()
+        
+        self._pathFinder = PathFinder(self.resourcesRoot, self.converterPath)
+        if self.cacheSize: self.pathCache = PathCache(self._pathFinder, self.cacheSize)
+        else: self.pathCache = None
 
     def process(self, request:Request, response:Response, responseCnt:ResponseContent, **keyargs):
         '''
@@ -126,7 +135,8 @@ class URIHandler(HandlerProcessorProceed):
         paths = [unquote(p) for p in paths if p]
 
         if request.extension: responseCnt.type = request.extension
-        request.path = findPath(self.resourcesRoot, paths, self.converterPath)
+        if self.pathCache is None: request.path = self._pathFinder.find(paths)
+        else: request.path = self.pathCache.find(paths)
         assert isinstance(request.path, Path), 'Invalid path %s' % request.path
         node = request.path.node
         if not node:
@@ -157,3 +167,138 @@ class URIHandler(HandlerProcessorProceed):
 
         response.code, response.status, response.isSuccess = PATH_FOUND
         response.converterId = self.converterPath
+
+# --------------------------------------------------------------------
+
+class PathCache(INodeChildListener, INodeInvokerListener):
+    '''
+    Provides a least recently used cache for the paths found by a path finder. The paths are cached based on the URI shape,
+    the shape contains the path elements that are names of path nodes and markers for the other elements (the integer
+    values have a different marker then the other values). For a cached shape the matches for the path nodes are reused and
+    only the properties values are matched again. The cache is cleared whenever the resources nodes structure changes.
+    '''
+    
+    markerInteger = '#'
+    # The shape marker for the path elements that are integer values.
+    markerValue = '*'
+    # The shape marker for the other path elements.
+
+    def __init__(self, pathFinder, size):
+        '''
+        Construct the path cache.
+        
+        @param pathFinder: PathFinder
+            The path finder used for the paths that are not cached.
+        @param size: integer
+            The maximum number of cached URI shapes.
+        @ivar shapes: CacheLRU
+            The cache of the plans for the URI shapes.
+        '''
+        assert isinstance(pathFinder, PathFinder), 'Invalid path finder %s' % pathFinder
+        self.pathFinder = pathFinder
+        self.shapes = CacheLRU(size)
+        
+        self._typeInteger = typeFor(int)
+        self._names = None
+        pathFinder.root.addStructureListener(self)
+        
+    def onChildAdded(self, node, child):
+        '''
+        @see: INodeChildListener.onChildAdded
+        '''
+        self.clear()
+        
+    def onInvokerChange(self, node, old, new):
+        '''
+        @see: INodeInvokerListener.onInvokerChange
+        '''
+        self.clear()
+        
+    def clear(self):
+        '''
+        Clears the cached shapes.
+        '''
+        self._names = None
+        self.shapes.clear()
+    
+    def find(self, paths):
+        '''
+        Finds the resource node for the provided request path, @see: PathFinder.find.
+        
+        @param paths: list[string]
+            The path elements identifying a resource to be searched for.
+        @return: Path
+            The path leading to the node that provides the resource.
+        '''
+        assert isinstance(paths, list), 'Invalid paths %s' % paths
+        
+        shape = self._shapeFor(paths)
+        plan = self.shapes.get(shape)
+        if plan is not None:
+            path = self._pathFor(plan, paths)
+            if path is not None: return path
+        
+        path = self.pathFinder.find(paths)
+        assert isinstance(path, Path), 'Invalid path %s' % path
+        if path.node is not None:
+            plan = self._planFor(path, len(paths))
+            if plan is not None: self.shapes.put(shape, plan)
+        return path
+    
+    # ----------------------------------------------------------------
+    
+    def _shapeFor(self, paths):
+        '''
+        Provides the URI shape for the provided paths.
+        '''
+        names = self._names
+        if names is None:
+            converterPath = self.pathFinder.converterPath
+            names = {converterPath.normalize(node.name) for node in iterateNodes(self.pathFinder.root)
+                     if isinstance(node, NodePath)}
+            self._names = names
+        
+        shape = []
+        for path in paths:
+            if path in names: shape.append(path)
+            else:
+                try: self.pathFinder.converterPath.asValue(path, self._typeInteger)
+                except ValueError: shape.append(self.markerValue)
+                else: shape.append(self.markerInteger)
+        return tuple(shape)
+    
+    def _planFor(self, path, count):
+        '''
+        Provides the plan for the found path, the plan contains for each path element the match to reuse or the node to
+        match the path element with.
+        
+        @return: tuple(Match|Node)|None
+            The plan, None if the path cannot be reused.
+        '''
+        assert isinstance(path, Path), 'Invalid path %s' % path
+        if len(path.matches) != count + 1: return  # Only if each node has matched a single path element
+        
+        plan = []
+        for match in path.matches:
+            assert isinstance(match, Match), 'Invalid match %s' % match
+            if match.node.newMatch() is match: plan.append(match)
+            else: plan.append(match.node)
+        if not isinstance(plan[0], Match): return
+        return tuple(plan)
+    
+    def _pathFor(self, plan, paths):
+        '''
+        Provides the path for the plan and the provided paths.
+        
+        @return: Path|None
+            The path or None if the paths elements cannot be matched by the plan.
+        '''
+        matches, converterPath = [plan[0]], self.pathFinder.converterPath
+        for k, step in enumerate(plan[1:]):
+            if isinstance(step, Match): matches.append(step)
+            else:
+                assert isinstance(step, Node), 'Invalid node %s' % step
+                match = step.tryMatch(converterPath, deque((paths[k],)))
+                if not isinstance(match, Match): return
+                matches.append(match)
+        return Path(matches, matches[-1].node)
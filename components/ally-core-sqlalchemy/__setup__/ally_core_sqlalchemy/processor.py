@@ -10,8 +10,8 @@ Provides the configurations for the processors used in handling the request.
 '''
 
 from ..ally_core.processor import invoking
-from ..ally_core_http.processor import assemblyResources, \
-    updateAssemblyResources
+from ..ally_core_http.processor import assemblyResponseCache, \
+    updateAssemblyResponseCache
 from ally.container import ioc
 from ally.core.sqlalchemy.processor.transactional_wrapping import \
     TransactionWrappingHandler
@@ -25,6 +25,8 @@ def transactionWrapping() -> Handler: return TransactionWrappingHandler()
 
 # --------------------------------------------------------------------
 
-@ioc.after(updateAssemblyResources)
-def updateAssemblyResourcesForAlchemy():
-    assemblyResources().add(transactionWrapping(), before=invoking())
+@ioc.after(updateAssemblyResponseCache)
+def updateAssemblyResponseCacheForAlchemy():
+    # The transaction wraps the invoking in the response cache assembly, this way the transaction is committed before the
+    # response cache invalidates the responses for the changed models.
+    assemblyResponseCache().add(transactionWrapping(), before=invoking())
@@ -9,6 +9,8 @@ Created on Nov 24, 2011
 Provides the configurations for the processors encoders and decoders.
 '''
 
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ally.container import ioc
 from ally.core.impl.processor.parser.text import ParseTextHandler
 from ally.core.impl.processor.parser.xml import ParseXMLHandler
@@ -73,19 +75,27 @@ def renderingAssembly() -> Assembly:
     '''
     The assembly containing the response renders.
     '''
-    return Assembly('Renderer selection')
+    b = Assembly('Renderer selection')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 @ioc.entity
 def assemblyParsing() -> Assembly:
     '''
     The assembly containing the request parsers.
     '''
-    return Assembly('Parsing request content')
+    b = Assembly('Parsing request content')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 @ioc.entity
 def renderJSON() -> Handler:
+    from .processor import chunck_size
     b = RenderJSONHandler(); yield b
     b.contentTypes = content_types_json()
+    b.bufferSize = chunck_size()
 
 # JSON encode by using the text renderer.
 # @ioc.entity
@@ -99,8 +109,10 @@ def renderJSON() -> Handler:
 
 @ioc.entity
 def renderXML() -> Handler:
+    from .processor import chunck_size
     b = RenderXMLHandler(); yield b
     b.contentTypes = content_types_xml()
+    b.bufferSize = chunck_size()
 
 # --------------------------------------------------------------------
 # Creating the parsers
@@ -117,8 +129,10 @@ def parseJSON() -> Handler:
 
 @ioc.entity
 def parseXML() -> Handler:
+    from .processor import chunck_size
     b = ParseXMLHandler(); yield b
     b.contentTypes = set(content_types_xml())
+    b.bufferSize = chunck_size()
 
 # --------------------------------------------------------------------
 
@@ -135,11 +149,13 @@ else:
     
     @ioc.entity
     def renderYAML() -> Handler:
+        from ally.core.impl.processor.render.yaml import RenderYAMLStream
         def rendererYAML(obj, charSet, out): yaml.dump(obj, out, default_flow_style=False)
     
         b = RenderTextHandler(); yield b
         b.contentTypes = content_types_yaml()
         b.rendererTextObject = rendererYAML
+        b.rendererTextStream = RenderYAMLStream
     
     @ioc.before(renderingAssembly)
     def updateRenderingAssembly():
@@ -9,6 +9,7 @@ Created on Nov 24, 2011
 Provides the configurations for the processors used in handling the request.
 '''
 
+from ..ally.processor import profile_processing, processingProfiler
 from .encoder_decoder import renderingAssembly, assemblyParsing
 from ally.container import ioc
 from ally.core.impl.processor.arguments import ArgumentsPrepareHandler, \
@@ -44,7 +45,12 @@ def explain_detailed_error():
 
 @ioc.config
 def allow_chuncked_response():
-    '''Flag indicating that a chuncked transfer is allowed, more or less if this is false a length is a must'''
+    '''
+    Flag indicating that a chuncked transfer is allowed, more or less if this is false a length is a must, if true the
+    response content is rendered in chuncks as the server delivers it so the memory used for a response is bounded by the
+    chunck size. Attention the chuncked rendering happens after the request processing is finalized (like the database
+    transaction commit) so it should be enabled only if the rendered models do not need to be loaded on rendering
+    '''
     return False
 
 @ioc.config
@@ -52,6 +58,14 @@ def chunck_size():
     '''The buffer size used in the generator returned chuncks'''
     return 4096
 
+@ioc.config
+def compiled_encoders():
+    '''
+    Flag indicating that the model encoders of the core should be compiled into generated functions, the model encoders
+    from the HTTP core that handle paths, fetching or filtering are used as they are
+    '''
+    return True
+
 # --------------------------------------------------------------------
 
 @ioc.entity
@@ -83,7 +97,10 @@ def conversion() -> Handler:
 def createDecoder() -> Handler: return CreateDecoderHandler()
 
 @ioc.entity
-def createEncoder() -> Handler: return CreateEncoderHandler()
+def createEncoder() -> Handler:
+    b = CreateEncoderHandler()
+    b.compiled = compiled_encoders()
+    return b
 
 @ioc.entity
 def parser() -> Handler:
@@ -99,7 +116,10 @@ def content() -> Handler: return ContentHandler()
 def argumentsBuild() -> Handler: return ArgumentsBuildHandler()
 
 @ioc.entity
-def invoking() -> Handler: return InvokingHandler()
+def invoking() -> Handler:
+    b = InvokingHandler()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 @ioc.entity
 def renderEncoder() -> Handler:
@@ -20,7 +20,7 @@ from ally.api.config import model
 from ally.api.operator.type import TypeModel
 from ally.api.type import List, typeFor
 from ally.container import ioc
-from ally.core.impl.processor.decoder import CreateDecoderHandler
+from ally.core.impl.processor.decoder import CreateDecoderHandler, DecodeTabled, DecodeTable
 from ally.core.spec.resources import ConverterPath
 from ally.exception import InputError
 from collections import deque
@@ -90,6 +90,31 @@ class TestModel(unittest.TestCase):
         self.assertRaises(InputError, resolve, path=deque(('ModelKey', 'Name')), value='The name',
                           target=args, **context)
 
+    def testTable(self):
+        transformer = CreateDecoderHandler()
+        ioc.initialize(transformer)
+
+        decoder = transformer.decoderFor('model', typeFor(ModelId))
+        assert isinstance(decoder, DecodeTabled)
+        context = dict(converter=ConverterPath(), converterId=ConverterPath(), normalizer=ConverterPath())
+        table = decoder.tableFor(context['normalizer'])
+        self.assertIsInstance(table, DecodeTable)
+        self.assertIs(table, decoder.tableFor(context['normalizer']))
+
+        args = {}
+        self.assertTrue(table.decode(('ModelId', 'Id'), value='23', target=args, **context))
+        self.assertTrue(table.decode(('ModelKey', 'Key'), value='The key', target=args, **context))
+        self.assertTrue(table.decode(('ModelKey',), value='Other key', target=args, **context))
+        self.assertTrue(table.decode(('Name',), value='Uau Name', target=args, **context))
+        self.assertTrue(table.decode(('Flags',), value=['1', '2'], target=args, **context))
+        m = args['model']
+        self.assertIsInstance(m, ModelId)
+        self.assertEqual((23, 'Other key', 'Uau Name', ['1', '2']), (m.Id, m.ModelKey, m.Name, m.Flags))
+
+        self.assertFalse(table.decode(('Unknown',), value='1', target=args, **context))
+        self.assertRaises(InputError, table.decode, ('Id',), value='x', target=args, **context)
+        self.assertRaises(InputError, table.decode, ('ModelKey', 'Name'), value='The name', target=args, **context)
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__': unittest.main()
@@ -19,8 +19,8 @@ if True:
 from ally.api.config import model
 from ally.api.type import typeFor, List
 from ally.container import ioc
-from ally.core.impl.processor.encoder import CreateEncoderHandler
-from ally.core.spec.transform.exploit import Resolve
+from ally.core.impl.processor.encoder import CreateEncoderHandler, EncodeObject
+from ally.core.spec.transform.exploit import Resolve, ResolveError
 from ally.core.spec.transform.render import RenderToObject
 from ally.core.spec.resources import ConverterPath
 import unittest
@@ -106,6 +106,60 @@ class TestModel(unittest.TestCase):
         resolve.do()
         self.assertFalse(resolve.has())
 
+    def testCompiled(self):
+        transformer = CreateEncoderHandler()
+        ioc.initialize(transformer)
+        interpreter = CreateEncoderHandler()
+        interpreter.compiled = False
+        ioc.initialize(interpreter)
+
+        encoder = transformer.encoderFor(typeFor(ModelId))
+        self.assertNotIsInstance(encoder, EncodeObject)
+        self.assertIsInstance(interpreter.encoderFor(typeFor(ModelId)), EncodeObject)
+
+        render = RenderToObject()
+        context = dict(render=render, converter=ConverterPath(), converterId=ConverterPath(), normalizer=ConverterPath())
+
+        model = ModelId()
+        model.Id = 12
+        for value in (model, None):
+            for handler in (transformer, interpreter):
+                render.obj = None
+                Resolve(handler.encoderFor(typeFor(ModelId))).request(value=value, **context).doAll()
+                if handler is transformer: compiled = render.obj
+                else: self.assertEqual(render.obj, compiled)
+
+        model.Name = 'Uau Name'
+        model.Flags = ['1', '2', '3']
+        model.ModelKey = 'The key'
+        for handler in (transformer, interpreter):
+            render.obj = None
+            Resolve(handler.encoderFor(typeFor(List(ModelId)))).request(value=[model, model], **context).doAll()
+            if handler is transformer: compiled = render.obj
+            else: self.assertEqual(render.obj, compiled)
+        self.assertEqual(2, len(compiled['ModelIdList']))
+
+    def testCompiledError(self):
+        transformer = CreateEncoderHandler()
+        ioc.initialize(transformer)
+        interpreter = CreateEncoderHandler()
+        interpreter.compiled = False
+        ioc.initialize(interpreter)
+
+        class ConverterFail(ConverterPath):
+            def asString(self, value, type): raise ValueError('Cannot convert %s' % value)
+
+        render = RenderToObject()
+        context = dict(render=render, converter=ConverterFail(), converterId=ConverterPath(), normalizer=ConverterPath())
+        model = ModelId()
+        model.Id, model.Name = 12, 'Uau Name'
+        for handler in (transformer, interpreter):
+            resolve = Resolve(handler.encoderFor(typeFor(ModelId))).request(value=model, **context)
+            with self.assertRaises(ResolveError) as error: resolve.doAll()
+            # The property error is reported for the property exploit.
+            self.assertIsInstance(error.exception.__context__, ResolveError)
+            self.assertIsInstance(error.exception.__context__.__context__, ValueError)
+
 
 # --------------------------------------------------------------------
 
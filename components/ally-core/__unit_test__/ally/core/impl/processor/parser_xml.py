@@ -0,0 +1,103 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+XML parser testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.api.type import typeFor
+from ally.container import ioc
+from ally.core.impl.processor.decoder import CreateDecoderHandler
+from ally.core.impl.processor.parser.xml import ParseXMLHandler
+from ally.core.spec.resources import ConverterPath
+from io import BytesIO
+from threading import Thread
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Key')
+class ModelKey:
+    Key = str
+    Name = str
+
+@model(id='Id')
+class ModelId:
+    Id = int
+    Name = str
+    ModelKey = ModelKey
+
+CONTENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<ModelId><Id>%s</Id><ModelKey><Key>The key</Key></ModelKey>
+<Name>Uau Name ă</Name></ModelId>'''
+
+# --------------------------------------------------------------------
+
+class TestParseXML(unittest.TestCase):
+
+    def parser(self):
+        parser = ParseXMLHandler()
+        parser.contentTypes = set()
+        parser.bufferSize = 7
+        ioc.initialize(parser)
+
+        decoder = CreateDecoderHandler()
+        ioc.initialize(decoder)
+        return parser, decoder.decoderFor('model', typeFor(ModelId))
+
+    def parse(self, parser, decoder, content):
+        converter = ConverterPath()
+        args = {}
+        error = parser.parse(decoder, dict(converter=converter, converterId=converter, normalizer=converter, target=args),
+                             BytesIO(content.encode('utf-8')), 'utf-8')
+        return error, args.get('model')
+
+    def testParse(self):
+        parser, decoder = self.parser()
+
+        error, m = self.parse(parser, decoder, CONTENT % 12)
+        self.assertIsNone(error)
+        self.assertEqual((12, 'The key', 'Uau Name ă'), (m.Id, m.ModelKey, m.Name))
+
+        error, m = self.parse(parser, decoder, '<ModelId><Id>1</Id><Id>2</Ids></ModelId>')
+        self.assertTrue(error.startswith('Bad XML content at line 1'))
+        error, m = self.parse(parser, decoder, '<ModelId><Id a="1">1</Id></ModelId>')
+        self.assertTrue(error.startswith('No attributes accepted for \'ModelId\''))
+        error, m = self.parse(parser, decoder, '<ModelId><Unknown>1</Unknown></ModelId>')
+        self.assertTrue(error.startswith('Invalid path \'ModelId/Unknown\''))
+
+        error, m = self.parse(parser, decoder, CONTENT % 13)
+        self.assertIsNone(error)
+        self.assertEqual(13, m.Id)
+
+    def testConcurrent(self):
+        parser, decoder = self.parser()
+        results = {}
+
+        def parseMany(index):
+            for k in range(50): results[index, k] = self.parse(parser, decoder, CONTENT % (index * 100 + k))
+
+        threads = [Thread(target=parseMany, args=(index,)) for index in range(4)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+
+        self.assertEqual(200, len(results))
+        for (index, k), (error, m) in results.items():
+            self.assertIsNone(error)
+            self.assertEqual(index * 100 + k, m.Id)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,66 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+JSON render testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.core.impl.processor.render.json import RenderJSON, RenderJSONBuffered
+from ally.core.spec.transform.render import Object, List, Value, renderObject
+from codecs import getwriter
+from io import BytesIO
+import json
+import unittest
+
+# --------------------------------------------------------------------
+
+MODELS = List('ModelList', *(Object('Model', Value('Id', str(k)), Value('Name', 'Név "%s"' % k),
+                                    List('Flags', Value('Value', 'a'), Value('Value', 'b')),
+                                    Object('Parent', Value('Id', '1'), attributes={'href': 'parent/1'}))
+                             for k in range(100)), attributes={'total': '100'})
+
+# --------------------------------------------------------------------
+
+class TestRender(unittest.TestCase):
+
+    def testBuffered(self):
+        for charSet in ('ascii', 'utf-8'):
+            output = BytesIO()
+            renderObject(MODELS, RenderJSON(getwriter(charSet)(output, 'backslashreplace')))
+            expected = output.getvalue()
+
+            output = BytesIO()
+            renderObject(MODELS, RenderJSONBuffered(output, charSet, 'backslashreplace', 4096, {}))
+            self.assertEqual(expected, output.getvalue())
+
+        self.assertEqual(100, len(json.loads(expected.decode('utf-8'))['ModelList']))
+
+    def testChuncks(self):
+        output = BytesIO()
+        render = RenderJSONBuffered(output, 'utf-8', 'backslashreplace', 100, {})
+        render.collectionStart('ModelList')
+        for k in range(10): render.value('Value', str(k))
+        self.assertEqual(b'', output.getvalue())
+
+        for k in range(100): render.value('Value', str(k))
+        self.assertTrue(output.getvalue())
+        self.assertTrue(render.size < 100)
+
+        render.collectionEnd()
+        self.assertEqual(0, render.size)
+        self.assertEqual(110, len(json.loads(output.getvalue().decode('utf-8'))['ModelList']))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,92 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Text render testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.core.impl.processor.render.text import RenderTextObject, RenderTextStream, IRenderTextStream
+from ally.core.spec.transform.render import Object, List, Value, renderObject
+from io import StringIO
+import unittest
+
+# --------------------------------------------------------------------
+
+MODELS = List('ModelList', *(Object('Model', Value('Id', str(k)), List('Flags', Value('Value', 'a')),
+                                    Object('Parent', Value('Id', '1'), attributes={'href': 'parent/1'}))
+                             for k in range(10)), attributes={'total': '10'})
+
+class TextStream(IRenderTextStream):
+
+    def __init__(self):
+        self.events = []
+
+    def collectionStart(self, name, attributes=None): self.events.append(('start', name, attributes))
+
+    def item(self, obj): self.events.append(('item', obj))
+
+    def collectionEnd(self): self.events.append(('end',))
+
+# --------------------------------------------------------------------
+
+class TestRender(unittest.TestCase):
+
+    def testStream(self):
+        objects = []
+        def renderer(obj, charSet, output): objects.append(obj)
+
+        renderObject(MODELS, RenderTextObject(renderer, 'utf-8', StringIO()))
+        expected, = objects
+
+        stream = TextStream()
+        render = RenderTextStream(renderer, 'utf-8', StringIO(), stream)
+        render.collectionStart('ModelList', {'total': '10'})
+        renderObject(MODELS.items[0], render)
+        self.assertEqual(2, len(stream.events))
+        self.assertEqual(0, len(render.items))
+        for model in MODELS.items[1:]: renderObject(model, render)
+        render.collectionEnd()
+
+        self.assertEqual(1, len(objects))
+        self.assertEqual(('start', 'ModelList', {'total': '10'}), stream.events[0])
+        self.assertEqual(('end',), stream.events[-1])
+        self.assertEqual(expected['ModelList'], [event[1] for event in stream.events[1:-1]])
+
+    def testStreamObject(self):
+        objects = []
+        def renderer(obj, charSet, output): objects.append(obj)
+
+        stream = TextStream()
+        renderObject(MODELS.items[0], RenderTextStream(renderer, 'utf-8', StringIO(), stream))
+        self.assertEqual([], stream.events)
+        self.assertEqual({'Id': '0', 'Flags': {'Flags': ['a']}, 'Parent': {'Id': '1', 'href': 'parent/1'}}, objects[0])
+
+    def testYAML(self):
+        try: import yaml
+        except ImportError: return
+        from ally.core.impl.processor.render.yaml import RenderYAMLStream
+
+        def renderer(obj, charSet, output): yaml.dump(obj, output, default_flow_style=False)
+        for models in (MODELS, List('ModelList', attributes={'total': '0'}), List('ModelList', Value('Id', '1'))):
+            output = StringIO()
+            renderObject(models, RenderTextObject(renderer, 'utf-8', output))
+            expected = yaml.safe_load(output.getvalue())
+
+            output = StringIO()
+            renderObject(models, RenderTextStream(renderer, 'utf-8', output, RenderYAMLStream('utf-8', output)))
+            self.assertEqual(expected, yaml.safe_load(output.getvalue()))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,70 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+XML render testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.core.impl.processor.render.xml import RenderXML, RenderXMLBuffered
+from ally.core.spec.transform.render import Object, List, Value, renderObject
+from codecs import getwriter
+from io import BytesIO
+from xml.etree import ElementTree
+from xml.sax.saxutils import XMLGenerator
+import unittest
+
+# --------------------------------------------------------------------
+
+MODELS = List('ModelList', *(Object('Model', Value('Id', str(k)), Value('Name', 'Név <"%s"> & \'%s\'' % (k, k)),
+                                    Value('Empty', ''), List('Flags', Value('Value', 'a'), Value('Value', 'b')),
+                                    List('Other'), Object('Parent', attributes={'href': 'parent/1?a=1&b="2"'}))
+                             for k in range(100)), attributes={'total': '100'})
+
+# --------------------------------------------------------------------
+
+class TestRender(unittest.TestCase):
+
+    def testBuffered(self):
+        for charSet in ('ascii', 'utf-8'):
+            output = BytesIO()
+            outputb = getwriter(charSet)(output, 'xmlcharrefreplace')
+            renderObject(MODELS, RenderXML(XMLGenerator(outputb, charSet, short_empty_elements=True)))
+            expected = output.getvalue()
+
+            output = BytesIO()
+            renderObject(MODELS, RenderXMLBuffered(output, charSet, 'xmlcharrefreplace', 4096, {}))
+            self.assertEqual(expected, output.getvalue())
+
+        models = ElementTree.fromstring(expected)
+        self.assertEqual(100, len(models))
+        self.assertEqual('Név <"1"> & \'1\'', models[1].find('Name').text)
+
+    def testChuncks(self):
+        output = BytesIO()
+        render = RenderXMLBuffered(output, 'utf-8', 'xmlcharrefreplace', 100, {})
+        render.collectionStart('ModelList')
+        for k in range(3): render.value('Value', str(k))
+        self.assertEqual(b'', output.getvalue())
+
+        for k in range(100): render.value('Value', str(k))
+        self.assertTrue(output.getvalue())
+        self.assertTrue(len(render.buffer) < 100)
+
+        render.collectionEnd()
+        self.assertEqual(0, len(render.buffer))
+        self.assertEqual(103, len(ElementTree.fromstring(output.getvalue())))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
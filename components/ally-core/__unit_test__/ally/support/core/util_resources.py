@@ -0,0 +1,76 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Resources utilities testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.api.type import Input, typeFor
+from ally.core.impl.node import NodeRoot, NodePath, NodeProperty
+from ally.core.spec.resources import ConverterPath
+from ally.support.core.util_resources import findPath, PathFinder
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class ModelId:
+    Id = int
+
+@model(id='Key')
+class ModelKey:
+    Key = str
+
+# --------------------------------------------------------------------
+
+class TestPathFinder(unittest.TestCase):
+
+    def testFind(self):
+        converterPath = ConverterPath()
+        root = NodeRoot()
+        finder = PathFinder(root, converterPath)
+        
+        models = NodePath(root, True, 'Model')
+        byId = NodeProperty(models, Input('id', typeFor(ModelId.Id)))
+        byKey = NodeProperty(models, Input('key', typeFor(ModelKey.Key)))
+        NodePath(root, True, 'Other')
+        
+        for paths, node in ((['Model', '12'], byId), (['Model', 'key'], byKey), (['Model'], models),
+                            (['Unknown'], None), ([], root)):
+            path = finder.find(paths)
+            self.assertIs(path.node, node)
+            self.assertEqual([str(match) for match in path.matches],
+                             [str(match) for match in findPath(root, paths, converterPath).matches])
+        
+        # Adding a child needs to be reflected by the finder.
+        self.assertIsNone(finder.find(['Added']).node)
+        added = NodePath(root, True, 'Added')
+        self.assertIs(finder.find(['Added']).node, added)
+
+    def testFindSameName(self):
+        class ConverterPathLower(ConverterPath):
+            def normalize(self, value): return value.lower()
+        converterPath = ConverterPathLower()
+        root = NodeRoot()
+        first = NodePath(root, True, 'Model')
+        NodePath(root, True, 'model')
+        
+        # The first child that matches is found, like when the children are checked one by one.
+        self.assertIs(findPath(root, ['model'], converterPath).node, first)
+        self.assertIs(PathFinder(root, converterPath).find(['model']).node, first)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -38,6 +38,8 @@ class AssembleBase(IAssembler):
     hintModelDomain = 'domain'
     hintCallWebName = 'webName'
     hintCallReplaceFor = 'replaceFor'
+    hintCallCache = 'cache'
+    hintCallFetchBatch = 'fetchBatch'
 
     def __init__(self):
         '''
@@ -47,6 +49,9 @@ class AssembleBase(IAssembler):
         assert isinstance(self.hintCallWebName, str), 'Invalid hint name for call web name %s' % self.hintCallWebName
         assert isinstance(self.hintCallReplaceFor, str), \
         'Invalid hint name for call replace %s' % self.hintCallReplaceFor
+        assert isinstance(self.hintCallCache, str), 'Invalid hint name for call cache %s' % self.hintCallCache
+        assert isinstance(self.hintCallFetchBatch, str), \
+        'Invalid hint name for call fetch batch %s' % self.hintCallFetchBatch
 
         self.modelHints = {
         self.hintModelDomain: '(string) The domain where the model is registered'
@@ -59,6 +64,14 @@ class AssembleBase(IAssembler):
         self.hintCallReplaceFor: '(service API class) Used whenever a service call has the same signature with '\
         'another service call and thus require to use the same web address, this allows to explicitly dictate what'\
         'call has priority over another call by providing the class to which the call should be replaced.',
+
+        self.hintCallCache: '(boolean) Flag indicating that the rendered responses of the call can be cached, the cached '\
+        'responses are invalidated whenever an insert, update or delete call is made for the models used by the call.',
+
+        self.hintCallFetchBatch: '(string) The name of the service implementation method that fetches the models for a '\
+        'list of ids, used on the call that provides the model for an id in order to fetch in batches the models '\
+        'referenced by a collection. The method takes the same arguments as the call but with the list of ids instead of '\
+        'the id and returns the found models.',
         }
 
     def knownModelHints(self):
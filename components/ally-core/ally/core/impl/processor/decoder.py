@@ -118,7 +118,7 @@ class CreateDecoderHandler(HandlerProcessorProceed):
             assert log.debug('Creating decoder for type \'%s\'', ofType) or True
             if isinstance(ofType, TypeModel):
                 assert isinstance(ofType, TypeModel)
-                decoder = self.decoderModel(ofType, obtainOnDict(argumentKey, ofType.clazz))
+                decoder = DecodeTabled(self.decoderModel(ofType, obtainOnDict(argumentKey, ofType.clazz)))
             else:
                 assert log.debug('Cannot decode object type \'%s\'', ofType) or True
                 return None
@@ -422,3 +422,159 @@ class DecodeDelegate:
         for delegate in self.delegates:
             if delegate(**data): return True
         return False
+
+# --------------------------------------------------------------------
+
+class DecodeTabled:
+    '''
+    Exploit that delegates the path decoding to a decode exploit and also provides for the decode exploit the table of
+    the decoding paths, the table allows for decoding the values of a text object without matching the path elements
+    against the exploits. The tables are compiled for each normalizer.
+    '''
+    __slots__ = ('exploit', 'tables')
+
+    def __init__(self, exploit):
+        '''
+        Create the tabled decoder.
+        
+        @param exploit: callable
+            The decode exploit to delegate to and to compile the tables for.
+        '''
+        assert callable(exploit), 'Invalid decode exploit %s' % exploit
+
+        self.exploit = exploit
+        self.tables = {}
+
+    def __call__(self, **data):
+        return self.exploit(**data)
+
+    def tableFor(self, normalizer):
+        '''
+        Provides the decoding table for the normalizer.
+        
+        @param normalizer: Normalizer
+            The normalizer used for the paths names.
+        @return: DecodeTable|None
+            The decoding table or None if the exploit cannot be compiled into a table.
+        '''
+        assert isinstance(normalizer, Normalizer), 'Invalid normalizer %s' % normalizer
+
+        try: return self.tables[normalizer]
+        except KeyError: pass
+        table = self.tables[normalizer] = DecodeTable.compile(self.exploit, normalizer)
+        return table
+
+class DecodeTable:
+    '''
+    Provides the decoding of values based on tuple paths, each known path has the exploits that decode the value and
+    the getters used for obtaining the target from the root target.
+    '''
+    __slots__ = ('entries', 'interceptors')
+
+    def __init__(self):
+        '''
+        Create the empty decode table.
+        
+        @ivar entries: dictionary{tuple(string): tuple(tuple(callable), list[callable], callable|None)}
+            The getters, the decode exploits and the decode failed interceptor indexed by path.
+        @ivar interceptors: dictionary{tuple(string): tuple(tuple(callable), callable)}
+            The getters and decode failed interceptors indexed by the path of the property that has them.
+        '''
+        self.entries = {}
+        self.interceptors = {}
+
+    def decode(self, path, target, **data):
+        '''
+        Decode the value for the path.
+        
+        @param path: tuple(string)
+            The path of the value.
+        @param target: object
+            The root target object.
+        @param data: key arguments
+            The decoding data, containing also the value.
+        @return: boolean
+            True if the value has been decoded, False otherwise.
+        '''
+        assert isinstance(path, tuple), 'Invalid path %s' % path
+
+        entry = self.entries.get(path)
+        if entry is None:
+            for k in range(len(path) - 1, 0, -1):
+                entry = self.interceptors.get(path[:k])
+                if entry is not None:
+                    getters, interceptor = entry
+                    for getter in getters: target = getter(target)
+                    return interceptor(target=target, **data)
+            return False
+
+        getters, exploits, interceptor = entry
+        for getter in getters: target = getter(target)
+        for exploit in exploits:
+            try:
+                if exploit(path=deque(), target=target, **data): return True
+            except InputError: raise
+            except: handleExploitError(exploit)
+        if interceptor is not None: return interceptor(target=target, **data)
+        return False
+
+    # ----------------------------------------------------------------
+
+    @classmethod
+    def compile(cls, exploit, normalizer):
+        '''
+        Compiles the decode table for the exploit.
+        
+        @param exploit: callable
+            The decode exploit to compile the table for.
+        @param normalizer: Normalizer
+            The normalizer used for the paths names.
+        @return: DecodeTable|None
+            The decoding table or None if the exploit contains unknown exploits.
+        '''
+        assert isinstance(normalizer, Normalizer), 'Invalid normalizer %s' % normalizer
+
+        table = cls()
+        if not table.register(exploit, normalizer, (), (), None): return
+        return table
+
+    def register(self, exploit, normalizer, prefix, getters, interceptor):
+        '''
+        Registers the exploit in the table.
+        
+        @return: boolean
+            True if the exploit has been registered, False if the exploit is unknown.
+        '''
+        if isinstance(exploit, DecodePrimitive):
+            if not prefix: return True
+            entry = self.entries.get(prefix)
+            if entry is None: self.entries[prefix] = (getters, [exploit], interceptor)
+            elif entry[0] == getters: entry[1].append(exploit)
+            return True
+
+        if isinstance(exploit, DecodeFalied):
+            assert isinstance(exploit, DecodeFalied)
+            if prefix: self.interceptors[prefix] = (getters, exploit.interceptor)
+            return self.register(exploit.exploit, normalizer, prefix, getters, exploit.interceptor)
+
+        if isinstance(exploit, DecodeDelegate):
+            assert isinstance(exploit, DecodeDelegate)
+            for delegate in exploit.delegates:
+                if not self.register(delegate, normalizer, prefix, getters, interceptor): return False
+            return True
+
+        if isinstance(exploit, DecodeObject):
+            assert isinstance(exploit, DecodeObject)
+            if exploit.getter is not None: getters += (exploit.getter,)
+            name = normalizer.normalize(exploit.name)
+            # The paths prefixed with the object name have priority, so they are registered last.
+            for named in ((), (name,)):
+                for keyProp, decodeProp in exploit.properties.items():
+                    path = prefix + named + (normalizer.normalize(keyProp),)
+                    if named:
+                        self.entries.pop(path, None)
+                        self.interceptors.pop(path, None)
+                    if not self.register(decodeProp, normalizer, path, getters, interceptor): return False
+            return True
+
+        return False
@@ -73,6 +73,9 @@ class CreateEncoderHandler(HandlerProcessorProceed):
     # The name to use for rendering the values in a list of values.
     typeOrders = [Boolean, Integer, Number, Percentage, String, Time, Date, DateTime, Iter]
     # The order in which 
+    compiled = True
+    # Flag indicating that the model encoders should be compiled into generated functions, the encoders that cannot be
+    # compiled are used as they are.
 
     def __init__(self):
         '''
@@ -81,6 +84,7 @@ class CreateEncoderHandler(HandlerProcessorProceed):
         assert isinstance(self.nameList, str), 'Invalid name list %s' % self.nameList
         assert isinstance(self.nameValue, str), 'Invalid name value %s' % self.nameValue
         assert isinstance(self.typeOrders, list), 'Invalid type orders %s' % self.typeOrders
+        assert isinstance(self.compiled, bool), 'Invalid compiled flag %s' % self.compiled
         super().__init__()
 
         self._typeOrders = [typeFor(typ) for typ in self.typeOrders]
@@ -141,6 +145,8 @@ class CreateEncoderHandler(HandlerProcessorProceed):
                 encoder = lambda **data: None
 
             else: assert log.debug('Cannot encode object type \'%s\'', ofType) or True
+
+            if self.compiled and isinstance(encoder, EncodeObject): encoder = compileEncoder(encoder) or encoder
             self._cache[ofType] = encoder
 
         return encoder
@@ -465,3 +471,102 @@ class EncodeId(EncodePrimitive):
         if self.getter: value = self.getter(value)
         if value is None: return
         render.value(name, converterId.asString(value, self.typeValue))
+
+# --------------------------------------------------------------------
+
+def compileEncoder(exploit):
+    '''
+    Compiles the provided object encode exploit into a generated function that walks the object properties directly and
+    writes them to the render, this way there are no exploit calls and data dictionaries created for every property.
+    Only the exploits defined in this module can be compiled, any other exploit (like the path model exploits from the
+    HTTP core that handle paths, fetching and filtering) needs to be used as it is. As for the exploit calls the errors
+    of a property are reported by @see: handleExploitError for the property exploit.
+    
+    @param exploit: EncodeObject
+        The object encode exploit to compile.
+    @return: callable(**data)|None
+        The compiled exploit, None if the exploit cannot be compiled.
+    '''
+    assert isinstance(exploit, EncodeObject), 'Invalid encode object %s' % exploit
+    if type(exploit) is not EncodeObject: return
+
+    namespace, body = dict(_name=exploit.name, _handleError=handleExploitError), []
+    if exploit.getter:
+        namespace['_getter'] = exploit.getter
+        body.append('    value = _getter(value)')
+    body.append('    if value is None: return')
+    body.append('    render.objectStart(normalizer.normalize(name or _name))')
+    if not compileProperties(exploit, 'value', '    ', namespace, body): return
+    body.append('    render.objectEnd()')
+
+    header = 'def encode(value, render, normalizer, converter=None, converterId=None, name=None, **data):'
+    exec('\n'.join([header] + body), namespace)
+    encode = namespace['encode']
+    encode.__qualname__ = 'encode%s' % exploit.name
+    return encode
+
+def compileProperties(exploit, valueName, indent, namespace, body):
+    '''
+    Generates the code lines for encoding the properties of the provided object encode exploit, @see: compileEncoder.
+    
+    @param exploit: EncodeObject
+        The object encode exploit to generate the properties for.
+    @param valueName: string
+        The name of the variable that contains the object value.
+    @param indent: string
+        The indentation for the generated lines.
+    @param namespace: dictionary{string: object}
+        The namespace of the generated function, the constants used by the generated lines are placed in here.
+    @param body: list[string]
+        The generated lines list to add to.
+    @return: boolean
+        True if the properties have been generated, False if a property exploit cannot be compiled.
+    '''
+    assert isinstance(exploit, EncodeObject), 'Invalid encode object %s' % exploit
+
+    for nameProp, encodeProp in exploit.properties.items():
+        k = len(namespace)
+        name, propName = '_v%s' % k, '_n%s' % k
+        namespace[propName], namespace['_e%s' % k] = nameProp, encodeProp
+        body.append('%stry:' % indent)
+        indentProp = indent + '    '
+
+        if isinstance(encodeProp, EncodePrimitiveCollection): getter = encodeProp.getterCollection
+        else: getter = getattr(encodeProp, 'getter', None)
+        if getter:
+            namespace['_g%s' % k] = getter
+            body.append('%s%s = _g%s(%s)' % (indentProp, name, k, valueName))
+        else: body.append('%s%s = %s' % (indentProp, name, valueName))
+
+        if type(encodeProp) is EncodeObject:
+            body.append('%sif %s is not None:' % (indentProp, name))
+            body.append('%s    render.objectStart(normalizer.normalize(%s))' % (indentProp, propName))
+            if not compileProperties(encodeProp, name, indentProp + '    ', namespace, body): return False
+            body.append('%s    render.objectEnd()' % indentProp)
+        else:
+            namespace['_t%s' % k] = encodeProp.typeValue
+            if type(encodeProp) is EncodeId:
+                body.append('%sif %s is not None: render.value(%s, converterId.asString(%s, _t%s))' % 
+                            (indentProp, name, propName, name, k))
+            elif type(encodeProp) is EncodePrimitiveCollection:
+                namespace['_i%s' % k] = encodeProp.nameValue
+                body.append('%sif %s is not None:' % (indentProp, name))
+                body.append('%s    render.collectionStart(%s)' % (indentProp, propName))
+                body.append('%s    for _item in %s:' % (indentProp, name))
+                body.append('%s        if _item is None: continue' % indentProp)
+                body.append('%s        assert _t%s.isValid(_item), \'Invalid value %%r for type %%s\' %% (_item, _t%s)' % 
+                            (indentProp, k, k))
+                body.append('%s        render.value(normalizer.normalize(_i%s), converter.asString(_item, _t%s))' % 
+                            (indentProp, k, k))
+                body.append('%s    render.collectionEnd()' % indentProp)
+            elif type(encodeProp) is EncodePrimitive:
+                body.append('%sif %s is not None:' % (indentProp, name))
+                body.append('%s    assert _t%s.isValid(%s), \'Invalid value %%r for type %%s\' %% (%s, _t%s)' % 
+                            (indentProp, k, name, name, k))
+                body.append('%s    render.value(normalizer.normalize(%s), converter.asString(%s, _t%s))' % 
+                            (indentProp, propName, name, k))
+            else: return False
+
+        body.append('%sexcept: _handleError(_e%s)' % (indent, k))
+
+    return True
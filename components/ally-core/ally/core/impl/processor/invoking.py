@@ -19,8 +19,10 @@ from ally.core.spec.transform.render import Object, List, Value
 from ally.design.processor.attribute import requires, defines
 from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
+from ally.design.processor.profile import Profiler
 from ally.exception import DevelError, InputError, Ref
 import logging
+import time
 
 # --------------------------------------------------------------------
 
@@ -58,11 +60,17 @@ class InvokingHandler(HandlerProcessorProceed):
     In GET case it will provide to the request the invoke returned object as to be rendered to the response, in DELETE case
     it will stop the execution chain and send as a response a success code.
     '''
+    
+    profiler = None
+    # The profiler used for recording the invokers durations, if None no durations are recorded.
+    nameProfile = 'invokers'
+    # The profile name used for recording the invokers durations.
 
     def __init__(self):
         '''
         Construct the handler.
         '''
+        assert isinstance(self.nameProfile, str), 'Invalid profile name %s' % self.nameProfile
         super().__init__()
 
         self.invokeCallBack = {
@@ -97,7 +105,12 @@ class InvokingHandler(HandlerProcessorProceed):
             else:
                 raise DevelError('No value for mandatory input \'%s\' for invoker \'%s\'' % (inp.name, request.invoker.name))
         try:
-            value = request.invoker.invoke(*arguments)
+            if self.profiler is None: value = request.invoker.invoke(*arguments)
+            else:
+                assert isinstance(self.profiler, Profiler), 'Invalid profiler %s' % self.profiler
+                start = time.time()
+                try: value = request.invoker.invoke(*arguments)
+                finally: self.profiler.record(self.nameProfile, request.invoker.name, time.time() - start)
             assert log.debug('Successful on calling invoker \'%s\' with values %s', request.invoker,
                              tuple(arguments)) or True
 
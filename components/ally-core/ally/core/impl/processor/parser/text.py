@@ -9,6 +9,7 @@ Created on Aug 28, 2012
 Provides the text parser processor handler.
 '''
 
+from ..decoder import DecodeTabled, DecodeTable
 from .base import ParseBaseHandler
 from ally.container.ioc import injected
 from ally.support.util_io import IInputStream
@@ -52,6 +53,10 @@ class ParseTextHandler(ParseBaseHandler):
         try: obj = self.parser(source, charSet)
         except ValueError: return 'Bad %s content' % self.parserName
 
+        if isinstance(decoder, DecodeTabled) and data.get('normalizer') is not None:
+            table = decoder.tableFor(data['normalizer'])
+            if table is not None: return self.parseTable(table, data, obj)
+
         process = deque()
         process.append((deque(), obj))
         while process:
@@ -64,3 +69,27 @@ class ParseTextHandler(ParseBaseHandler):
                     itemPath = deque(path)
                     itemPath.append(name)
                     process.append((itemPath, value))
+
+    def parseTable(self, table, data, obj):
+        '''
+        Decodes the text object using the decode table.
+        
+        @param table: DecodeTable
+            The decode table to use.
+        @param data: dictionary{string, object}
+            The data used for the decoding.
+        @param obj: object
+            The text object to decode.
+        @return: string|None
+            The error message if the decoding failed, None otherwise.
+        '''
+        assert isinstance(table, DecodeTable), 'Invalid decode table %s' % table
+
+        process = deque()
+        process.append(((), obj))
+        while process:
+            path, obj = process.popleft()
+            if isinstance(obj, dict):
+                for name, value in obj.items(): process.append((path + (name,), value))
+            elif obj is None or isinstance(obj, (str, list)):
+                if not table.decode(path, value=obj, **data): return 'Invalid path \'%s\' in object' % '/'.join(path)
@@ -9,28 +9,32 @@ Created on Aug 24, 2012
 Provides the XML parser processor handler.
 '''
 
+from ..decoder import DecodeTabled, DecodeTable
 from .base import ParseBaseHandler
 from ally.container.ioc import injected
 from ally.support.util_io import IInputStream
 from collections import deque
-from xml.sax import make_parser
-from xml.sax._exceptions import SAXParseException
-from xml.sax.handler import ContentHandler
-from xml.sax.xmlreader import InputSource
+from threading import local
+from xml.parsers.expat import ParserCreate, ExpatError
 
 # --------------------------------------------------------------------
 
 @injected
 class ParseXMLHandler(ParseBaseHandler):
     '''
-    Provides the XML parsing.
+    Provides the XML parsing, the content is fed in chunks to an expat parser created for each request, the parse
+    handlers are pooled per thread so the handler can be used for concurrent requests.
     @see: ParseBaseHandler
     '''
 
+    bufferSize = 1024 * 16
+    # The size in bytes of the content chunks fed to the XML parser.
+
     def __init__(self):
+        assert isinstance(self.bufferSize, int) and self.bufferSize > 0, 'Invalid buffer size %s' % self.bufferSize
         super().__init__()
 
-        self.parser = make_parser()
+        self._parses = local()
 
     def parse(self, decoder, data, source, charSet):
         '''
@@ -41,18 +45,32 @@ class ParseXMLHandler(ParseBaseHandler):
         assert isinstance(source, IInputStream), 'Invalid stream %s' % source
         assert isinstance(charSet, str), 'Invalid character set %s' % charSet
 
-        parse = Parse(self.parser, decoder, data)
-        self.parser.setContentHandler(parse)
-        inpsrc = InputSource()
-        inpsrc.setByteStream(source)
-        inpsrc.setEncoding(charSet)
-        try: self.parser.parse(source)
-        except SAXParseException as e:
-            assert isinstance(e, SAXParseException)
-            return 'Bad XML content at line %s and column %s' % (e.getLineNumber(), e.getColumnNumber())
+        # Expat parsers cannot be reset so only the parse handlers are reused.
+        parse = self._parses.__dict__.pop('parse', None)
+        if parse is None: parse = Parse()
+        assert isinstance(parse, Parse), 'Invalid parse %s' % parse
+
+        if isinstance(decoder, DecodeTabled) and data.get('normalizer') is not None:
+            table = decoder.tableFor(data['normalizer'])
+        else: table = None
+
+        parser = ParserCreate(charSet)
+        parse.begin(parser, decoder, table, data)
+        try:
+            while True:
+                chunk = source.read(self.bufferSize)
+                if not chunk: break
+                parser.Parse(chunk, False)
+            parser.Parse(b'', True)
+        except ExpatError as e:
+            assert isinstance(e, ExpatError)
+            return 'Bad XML content at line %s and column %s' % (e.lineno, e.offset)
         except ParseError as e:
             assert isinstance(e, ParseError)
             return str(e)
+        finally:
+            parse.end()
+            self._parses.parse = parse
 
 # --------------------------------------------------------------------
 
@@ -61,71 +79,99 @@ class ParseError(Exception):
     Error raised whenever there is a XML parsing problem.
     '''
 
-class Parse(ContentHandler):
+class Parse:
     '''
-    Content handler used for parsing the xml content.
+    Handlers used for parsing the xml content with an expat parser.
     '''
-    __slots__ = ('parser', 'decoder', 'data', 'path', 'content', 'error')
+    __slots__ = ('parser', 'decoder', 'table', 'data', 'path', 'content', 'contains')
+
+    def __init__(self):
+        '''
+        Construct the parse handlers.
+        '''
+        self.path = []
+        self.content = deque()
+        self.contains = deque()
+        self.parser = self.decoder = self.table = self.data = None
 
-    def __init__(self, parser, decoder, data):
+    def begin(self, parser, decoder, table, data):
         '''
-        Construct the parser.
+        Begin the parsing.
         
-        @param parser: object
-            The XML parser.
+        @param parser: xmlparser
+            The expat XML parser.
         @param decoder: Callable
             The decoder used in the parsing process.
+        @param table: DecodeTable|None
+            The decode table used instead of the decoder, if available.
         @param data: dictionary{string, object}
             The data used for the decoder.
         '''
         assert parser is not None, 'A parser is required'
         assert callable(decoder), 'Invalid decoder %s' % decoder
+        assert table is None or isinstance(table, DecodeTable), 'Invalid decode table %s' % table
         assert isinstance(data, dict), 'Invalid data %s' % data
 
         self.parser = parser
         self.decoder = decoder
+        self.table = table
         self.data = data
-        self.path = deque()
-        self.content = deque()
-        self.contains = deque((False,))
-        self.error = None
+        self.contains.append(False)
+
+        parser.buffer_text = True
+        parser.StartElementHandler = self.startElement
+        parser.EndElementHandler = self.endElement
+        parser.CharacterDataHandler = self.characters
+
+    def end(self):
+        '''
+        End the parsing, releases the references to the parsing data.
+        '''
+        self.parser = self.decoder = self.table = self.data = None
+        del self.path[:]
+        self.content.clear()
+        self.contains.clear()
+
+    def location(self):
+        '''
+        Provides the current parsing location.
+        
+        @return: string
+            The location as line and column.
+        '''
+        return 'line %s and column %s' % (self.parser.CurrentLineNumber, self.parser.CurrentColumnNumber)
 
     def startElement(self, name, attributes):
         '''
-        @see: ContentHandler.startElement
+        Handler for the element start.
         '''
-        if attributes: raise ParseError('No attributes accepted for \'%s\' at line %s and column %s' %
-                                    ('/'.join(self.path), self.parser.getLineNumber(), self.parser.getColumnNumber()))
+        if attributes:
+            raise ParseError('No attributes accepted for \'%s\' at %s' % ('/'.join(self.path), self.location()))
         self.path.append(name)
-        self.content.appendleft(deque())
+        self.content.appendleft([])
         self.contains[0] = True
         self.contains.appendleft(False)
 
     def characters(self, content):
         '''
-        @see: ContentHandler.characters
+        Handler for the character data.
         '''
-        self.content[0].append(content)
+        if self.content: self.content[0].append(content)
 
     def endElement(self, name):
         '''
-        @see: ContentHandler.endElement
+        Handler for the element end.
         '''
-        if not self.path: raise ParseError('Unexpected end element \'%s\' at line %s and column %s' %
-                                           (name, self.parser.getLineNumber(), self.parser.getColumnNumber()))
-        path = deque(self.path)
-        if name != self.path[-1]: raise ParseError('Expected end element \'%s\' at line %s and column %s, got \'%s\'' %
-                                           (self.path[-1], self.parser.getLineNumber(), self.parser.getColumnNumber(), name))
+        assert self.path and name == self.path[-1], 'Invalid end element %s' % name
 
         contains = self.contains.popleft()
         if contains:
             content = ''.join(self.content.popleft()).strip()
             if content:
-                raise ParseError('Invalid value \'%s\' for element \'%s\' at line %s and column %s' %
-                                 (content, name, self.parser.getLineNumber(), self.parser.getColumnNumber()))
+                raise ParseError('Invalid value \'%s\' for element \'%s\' at %s' % (content, name, self.location()))
         else:
-            content = '\n'.join(self.content.popleft())
-            if self.decoder(path=path, value=content, **self.data): self.path.pop()
-            else:
-                raise ParseError('Invalid path \'%s\' at line %s and column %s' %
-                                 ('/'.join(self.path), self.parser.getLineNumber(), self.parser.getColumnNumber()))
+            content = ''.join(self.content.popleft())
+            if self.table is not None: decoded = self.table.decode(tuple(self.path), value=content, **self.data)
+            else: decoded = self.decoder(path=deque(self.path), value=content, **self.data)
+            if not decoded: raise ParseError('Invalid path \'%s\' at %s' % ('/'.join(self.path), self.location()))
+        self.path.pop()
@@ -28,11 +28,20 @@ class RenderJSONHandler(RenderBaseHandler):
 
     encodingError = 'backslashreplace'
     # The encoding error resolving.
+    bufferSize = 4096
+    # The number of characters to buffer before encoding them in the output, usually the same as the rendering chunck
+    # size, if 0 the characters are encoded and written as they are rendered.
+    namesSize = 1000
+    # The maximum number of encoded names to cache.
 
     def __init__(self):
         assert isinstance(self.encodingError, str), 'Invalid string %s' % self.encodingError
+        assert isinstance(self.bufferSize, int), 'Invalid buffer size %s' % self.bufferSize
+        assert isinstance(self.namesSize, int), 'Invalid names size %s' % self.namesSize
         super().__init__()
 
+        self._names = {}
+
     def renderFactory(self, charSet, output):
         '''
         @see: RenderBaseHandler.renderFactory
@@ -40,7 +49,10 @@ class RenderJSONHandler(RenderBaseHandler):
         assert isinstance(charSet, str), 'Invalid char set %s' % charSet
         assert isinstance(output, IOutputStream), 'Invalid content output stream %s' % output
 
-        return RenderJSON(getwriter(charSet)(output, self.encodingError))
+        if self.bufferSize <= 0: return RenderJSON(getwriter(charSet)(output, self.encodingError))
+
+        if len(self._names) > self.namesSize: self._names.clear()
+        return RenderJSONBuffered(output, charSet, self.encodingError, self.bufferSize, self._names)
 
 # --------------------------------------------------------------------
 
@@ -149,3 +161,152 @@ class RenderJSON(IRender):
                 out.write(encode_basestring(attrName))
                 out.write(':')
                 out.write(encode_basestring(attrValue))
+
+class RenderJSONBuffered(IRender):
+    '''
+    Renderer for JSON that collects the JSON text fragments and encodes them in the output only when the buffer size is
+    reached or the JSON is completed, the encoded names are cached since they are the same for all rendered models.
+    The rendered JSON is the same as the one provided by @see: RenderJSON.
+    '''
+    __slots__ = ('output', 'charSet', 'encodingError', 'bufferSize', 'names', 'fragments', 'size', 'isObject', 'isFirst')
+
+    def __init__(self, output, charSet, encodingError, bufferSize, names):
+        '''
+        Construct the buffered JSON renderer.
+        
+        @param output: IOutputStream
+            The output stream to place the encoded JSON.
+        @param charSet: string
+            The character set used for encoding the JSON.
+        @param encodingError: string
+            The encoding error resolving.
+        @param bufferSize: integer
+            The number of characters to collect before encoding them in the output.
+        @param names: dictionary{string: string}
+            The encoded names cache.
+        '''
+        assert isinstance(output, IOutputStream), 'Invalid content output stream %s' % output
+        assert isinstance(charSet, str), 'Invalid char set %s' % charSet
+        assert isinstance(encodingError, str), 'Invalid encoding error %s' % encodingError
+        assert isinstance(bufferSize, int), 'Invalid buffer size %s' % bufferSize
+        assert isinstance(names, dict), 'Invalid names cache %s' % names
+
+        self.output = output
+        self.charSet = charSet
+        self.encodingError = encodingError
+        self.bufferSize = bufferSize
+        self.names = names
+        self.fragments = []
+        self.size = 0
+        self.isObject = deque()
+        self.isFirst = True
+
+    def value(self, name, value):
+        '''
+        @see: IRender.value
+        '''
+        assert self.isObject, 'No container for value'
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert isinstance(value, str), 'Invalid value %s' % value
+
+        value = encode_basestring(value)
+        if self.isObject[0]:
+            encoded = self.names.get(name)
+            if encoded is None: encoded = self.names[name] = encode_basestring(name) + ':'
+            value = encoded + value
+        if self.isFirst: self.isFirst = False
+        else: value = ',' + value
+
+        self.fragments.append(value)
+        self.size += len(value)
+        if self.size >= self.bufferSize: self.flush()
+
+    def objectStart(self, name, attributes=None):
+        '''
+        @see: IRender.objectStart
+        '''
+        self.openObject(name, attributes)
+        self.isObject.appendleft(True)
+
+    def objectEnd(self):
+        '''
+        @see: IRender.objectEnd
+        '''
+        assert self.isObject, 'No object to end'
+        isObject = self.isObject.popleft()
+        assert isObject, 'No object to end'
+
+        self.fragments.append('}')
+        self.size += 1
+        if self.size >= self.bufferSize or not self.isObject: self.flush()
+
+    def collectionStart(self, name, attributes=None):
+        '''
+        @see: IRender.collectionStart
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+
+        self.openObject(name, attributes)
+        encoded = self.names.get(name)
+        if encoded is None: encoded = self.names[name] = encode_basestring(name) + ':'
+        if self.isFirst: fragment = encoded + '['
+        else: fragment = ',' + encoded + '['
+
+        self.fragments.append(fragment)
+        self.size += len(fragment)
+        self.isFirst = True
+        self.isObject.appendleft(False)
+
+    def collectionEnd(self):
+        '''
+        @see: IRender.collectionEnd
+        '''
+        assert self.isObject, 'No collection to end'
+        isObject = self.isObject.popleft()
+        assert not isObject, 'No collection to end'
+
+        self.fragments.append(']}')
+        self.size += 2
+        if self.size >= self.bufferSize or not self.isObject: self.flush()
+
+    # ----------------------------------------------------------------
+
+    def openObject(self, name, attributes=None):
+        '''
+        Used to open a JSON object.
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert attributes is None or isinstance(attributes, dict), 'Invalid attributes %s' % attributes
+
+        if self.isObject and self.isObject[0]:
+            encoded = self.names.get(name)
+            if encoded is None: encoded = self.names[name] = encode_basestring(name) + ':'
+            fragment = encoded + '{'
+        else: fragment = '{'
+        if not self.isFirst: fragment = ',' + fragment
+
+        if attributes:
+            fragments = [fragment]
+            for attrName, attrValue in attributes.items():
+                assert isinstance(attrName, str), 'Invalid attribute name %s' % attrName
+                assert isinstance(attrValue, str), 'Invalid attribute value %s' % attrValue
+
+                if len(fragments) > 1: fragments.append(',')
+                fragments.append(encode_basestring(attrName))
+                fragments.append(':')
+                fragments.append(encode_basestring(attrValue))
+            fragment = ''.join(fragments)
+            self.isFirst = False
+        else: self.isFirst = True
+
+        self.fragments.append(fragment)
+        self.size += len(fragment)
+
+    def flush(self):
+        '''
+        Encodes the collected JSON fragments in the output.
+        '''
+        if self.fragments:
+            self.output.write(''.join(self.fragments).encode(self.charSet, self.encodingError))
+            del self.fragments[:]
+        self.size = 0
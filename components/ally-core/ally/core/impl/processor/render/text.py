@@ -14,6 +14,7 @@ from ally.container.ioc import injected
 from ally.core.spec.transform.render import RenderToObject
 from ally.support.util_io import IOutputStream
 from codecs import getwriter
+import abc
 
 # --------------------------------------------------------------------
 
@@ -28,11 +29,18 @@ class RenderTextHandler(RenderBaseHandler):
     # A callable(object, string, IOutputStream) function used for rendering the text object.
     # Takes as the first argument the text object to be encoded, on the second position the character set encoding to be
     # used and on the third the text output stream where to render the content.
+    rendererTextStream = None
+    # A callable(string, IOutputStream) function that provides the @see: IRenderTextStream used for rendering the root
+    # collections incrementally, the collection items are rendered as soon as they are ended instead of rendering the
+    # whole text object. Takes as the first argument the character set encoding to be used and on the second the text
+    # output stream where to render the content. If None the collections are rendered as a whole text object.
     encodingError = 'backslashreplace'
     # The encoding error resolving.
 
     def __init__(self):
         assert callable(self.rendererTextObject), 'Invalid callable renderer %s' % self.rendererTextObject
+        assert self.rendererTextStream is None or callable(self.rendererTextStream), \
+        'Invalid callable stream renderer %s' % self.rendererTextStream
         assert isinstance(self.encodingError, str), 'Invalid string %s' % self.encodingError
         super().__init__()
 
@@ -43,10 +51,46 @@ class RenderTextHandler(RenderBaseHandler):
         assert isinstance(charSet, str), 'Invalid char set %s' % charSet
 
         outputb = getwriter(charSet)(output, self.encodingError)
+        if self.rendererTextStream is not None:
+            return RenderTextStream(self.rendererTextObject, charSet, outputb, self.rendererTextStream(charSet, outputb))
         return RenderTextObject(self.rendererTextObject, charSet, outputb)
 
 # --------------------------------------------------------------------
 
+class IRenderTextStream(metaclass=abc.ABCMeta):
+    '''
+    The specification for the incremental rendering of a root collection text object.
+    '''
+    __slots__ = ()
+
+    @abc.abstractclassmethod
+    def collectionStart(self, name, attributes=None):
+        '''
+        Called to signal that the root collection rendering has started.
+        
+        @param name: string
+            The name of the collection.
+        @param attributes: dictionary{string, string}|None
+            The attributes for the collection.
+        '''
+
+    @abc.abstractclassmethod
+    def item(self, obj):
+        '''
+        Called to render an ended item of the root collection.
+        
+        @param obj: dictionary|string
+            The text object of the collection item.
+        '''
+
+    @abc.abstractclassmethod
+    def collectionEnd(self):
+        '''
+        Called to signal that the root collection rendering has ended.
+        '''
+
+# --------------------------------------------------------------------
+
 class RenderTextObject(RenderToObject):
     '''
     Renderer for text objects.
@@ -84,3 +128,72 @@ class RenderTextObject(RenderToObject):
         super().collectionEnd()
         # Finalized object rendering
         if not self.processing: self.renderer(self.obj, self.charSet, self.output)
+
+class RenderTextStream(RenderTextObject):
+    '''
+    Renderer for text objects that renders the root collection items as soon as they are ended, only the item that is
+    in rendering is kept as a text object. The root objects are rendered as a whole, like @see: RenderTextObject does.
+    '''
+    __slots__ = ('stream', 'items')
+
+    def __init__(self, renderer, charSet, output, stream):
+        '''
+        Construct the text stream renderer.
+        
+        @param stream: IRenderTextStream
+            The text stream used for rendering the root collection.
+        @see: RenderTextObject.__init__
+        '''
+        assert isinstance(stream, IRenderTextStream), 'Invalid text stream %s' % stream
+        super().__init__(renderer, charSet, output)
+
+        self.stream = stream
+        self.items = None
+
+    def value(self, name, value):
+        '''
+        @see: RenderTextObject.value
+        '''
+        super().value(name, value)
+        if self.items is not None and len(self.processing) == 1: self.renderItems()
+
+    def objectEnd(self):
+        '''
+        @see: RenderTextObject.objectEnd
+        '''
+        super().objectEnd()
+        if self.items is not None and len(self.processing) == 1: self.renderItems()
+
+    def collectionStart(self, name, attributes=None):
+        '''
+        @see: RenderTextObject.collectionStart
+        '''
+        if self.processing: super().collectionStart(name, attributes)
+        else:
+            self.stream.collectionStart(name, attributes)
+            self.items = []
+            self.processing.appendleft(self.items)
+
+    def collectionEnd(self):
+        '''
+        @see: RenderTextObject.collectionEnd
+        '''
+        if self.items is None: return super().collectionEnd()
+
+        if len(self.processing) == 1:
+            self.processing.popleft()
+            self.renderItems()
+            self.items = None
+            self.stream.collectionEnd()
+        else:
+            super().collectionEnd()
+            if len(self.processing) == 1: self.renderItems()
+
+    # ----------------------------------------------------------------
+
+    def renderItems(self):
+        '''
+        Renders the ended root collection items.
+        '''
+        for item in self.items: self.stream.item(item)
+        del self.items[:]
@@ -16,7 +16,7 @@ from ally.support.util import immut
 from ally.support.util_io import IOutputStream
 from codecs import getwriter
 from collections import deque
-from xml.sax.saxutils import XMLGenerator
+from xml.sax.saxutils import XMLGenerator, escape, quoteattr
 
 # --------------------------------------------------------------------
 
@@ -29,11 +29,20 @@ class RenderXMLHandler(RenderBaseHandler):
 
     encodingError = 'xmlcharrefreplace'
     # The encoding error resolving.
+    bufferSize = 4096
+    # The number of bytes to buffer before writing them in the output, usually the same as the rendering chunck size,
+    # if 0 the XML generator is used for rendering.
+    namesSize = 1000
+    # The maximum number of encoded tags to cache for a character set.
 
     def __init__(self):
         assert isinstance(self.encodingError, str), 'Invalid string %s' % self.encodingError
+        assert isinstance(self.bufferSize, int), 'Invalid buffer size %s' % self.bufferSize
+        assert isinstance(self.namesSize, int), 'Invalid names size %s' % self.namesSize
         super().__init__()
 
+        self._tags = {}
+
     def renderFactory(self, charSet, output):
         '''
         @see: RenderBaseHandler.renderFactory
@@ -41,6 +50,11 @@ class RenderXMLHandler(RenderBaseHandler):
         assert isinstance(charSet, str), 'Invalid char set %s' % charSet
         assert isinstance(output, IOutputStream), 'Invalid content output stream %s' % output
 
+        if self.bufferSize > 0:
+            tags = self._tags.get(charSet)
+            if tags is None or len(tags) > self.namesSize: tags = self._tags[charSet] = {}
+            return RenderXMLBuffered(output, charSet, self.encodingError, self.bufferSize, tags)
+
         outputb = getwriter(charSet)(output, self.encodingError)
         xml = XMLGenerator(outputb, charSet, short_empty_elements=True)
         return RenderXML(xml)
@@ -106,3 +120,153 @@ class RenderXML(IRender):
 
         self.xml.endElement(self.processing.pop())
         if not self.processing: self.xml.endDocument() # Close the document if there are no other processes queued
+
+class RenderXMLBuffered(IRender):
+    '''
+    Renderer for XML that writes the encoded XML directly in a bytes buffer that is delivered to the output only when
+    the buffer size is reached or the XML is completed. The encoded open and close tags are cached since they are the
+    same for all rendered models, and the values that contain no special characters are not escaped.
+    The rendered XML is the same as the one provided by @see: RenderXML.
+    '''
+    __slots__ = ('output', 'charSet', 'encodingError', 'bufferSize', 'tags', 'buffer', 'processing', 'isPending')
+
+    def __init__(self, output, charSet, encodingError, bufferSize, tags):
+        '''
+        Construct the buffered XML renderer.
+        
+        @param output: IOutputStream
+            The output stream to place the encoded XML.
+        @param charSet: string
+            The character set used for encoding the XML.
+        @param encodingError: string
+            The encoding error resolving.
+        @param bufferSize: integer
+            The number of bytes to collect before writing them in the output.
+        @param tags: dictionary{string: tuple(bytes, bytes, bytes)}
+            The encoded tags cache for the character set, as a tuple containing the open tag, the open tag prefix used
+            with attributes and the close tag.
+        '''
+        assert isinstance(output, IOutputStream), 'Invalid content output stream %s' % output
+        assert isinstance(charSet, str), 'Invalid char set %s' % charSet
+        assert isinstance(encodingError, str), 'Invalid encoding error %s' % encodingError
+        assert isinstance(bufferSize, int), 'Invalid buffer size %s' % bufferSize
+        assert isinstance(tags, dict), 'Invalid tags cache %s' % tags
+
+        self.output = output
+        self.charSet = charSet
+        self.encodingError = encodingError
+        self.bufferSize = bufferSize
+        self.tags = tags
+        self.buffer = bytearray()
+        self.processing = deque()
+        self.isPending = False
+
+    def value(self, name, value):
+        '''
+        @see: IRender.value
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert isinstance(value, str), 'Invalid value %s' % value
+        buffer = self.buffer
+
+        tags = self.tags.get(name)
+        if tags is None: tags = self.tagsFor(name)
+        if self.isPending:
+            buffer += b'>'
+            self.isPending = False
+
+        if value:
+            if '&' in value or '<' in value or '>' in value: value = escape(value)
+            buffer += tags[0]
+            buffer += value.encode(self.charSet, self.encodingError)
+            buffer += tags[2]
+        else:
+            buffer += tags[1]
+            buffer += b'/>'
+
+        if len(buffer) >= self.bufferSize: self.flush()
+
+    def objectStart(self, name, attributes=None):
+        '''
+        @see: IRender.objectStart
+        '''
+        self.openElement(name, attributes)
+
+    def objectEnd(self):
+        '''
+        @see: IRender.objectEnd
+        '''
+        assert self.processing, 'No object to end'
+        self.closeElement()
+
+    def collectionStart(self, name, attributes=None):
+        '''
+        @see: IRender.collectionStart
+        '''
+        self.openElement(name, attributes)
+
+    def collectionEnd(self):
+        '''
+        @see: IRender.collectionEnd
+        '''
+        assert self.processing, 'No collection to end'
+        self.closeElement()
+
+    # ----------------------------------------------------------------
+
+    def tagsFor(self, name):
+        '''
+        Provides the encoded tags for the name, the tags are also cached.
+        
+        @param name: string
+            The element name to provide the tags for.
+        @return: tuple(bytes, bytes, bytes)
+            The open tag, the open tag prefix used with attributes and the close tag.
+        '''
+        encoded = name.encode(self.charSet, self.encodingError)
+        tags = self.tags[name] = (b'<' + encoded + b'>', b'<' + encoded, b'</' + encoded + b'>')
+        return tags
+
+    def openElement(self, name, attributes=None):
+        '''
+        Used to open a XML element, the element start is left pending until the element content is known.
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert attributes is None or isinstance(attributes, dict), 'Invalid attributes %s' % attributes
+        buffer = self.buffer
+
+        if not self.processing:
+            buffer += ('<?xml version="1.0" encoding="%s"?>\n' % self.charSet).encode(self.charSet, self.encodingError)
+        elif self.isPending: buffer += b'>'
+
+        tags = self.tags.get(name)
+        if tags is None: tags = self.tagsFor(name)
+        buffer += tags[1]
+        if attributes:
+            for attrName, attrValue in attributes.items():
+                assert isinstance(attrName, str), 'Invalid attribute name %s' % attrName
+                assert isinstance(attrValue, str), 'Invalid attribute value %s' % attrValue
+                buffer += (' %s=%s' % (attrName, quoteattr(attrValue))).encode(self.charSet, self.encodingError)
+
+        self.processing.append(tags)
+        self.isPending = True
+
+    def closeElement(self):
+        '''
+        Used to close the current XML element.
+        '''
+        tags = self.processing.pop()
+        if self.isPending:
+            self.buffer += b'/>'
+            self.isPending = False
+        else: self.buffer += tags[2]
+
+        if len(self.buffer) >= self.bufferSize or not self.processing: self.flush()
+
+    def flush(self):
+        '''
+        Writes the collected XML bytes in the output.
+        '''
+        if self.buffer:
+            self.output.write(bytes(self.buffer))
+            del self.buffer[:]
@@ -0,0 +1,64 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally core
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the YAML text stream renderer, requires the YAML library.
+'''
+
+from .text import IRenderTextStream
+import yaml
+
+# --------------------------------------------------------------------
+
+class RenderYAMLStream(IRenderTextStream):
+    '''
+    The YAML text stream, renders the root collection as a mapping that contains the collection attributes and the
+    collection items in block style. The rendered YAML loads to the same object as the whole rendered text object.
+    '''
+    __slots__ = ('output', 'name', 'isEmpty')
+
+    def __init__(self, charSet, output):
+        '''
+        Construct the YAML stream.
+        
+        @param charSet: string
+            The character set used by the output.
+        @param output: IOutputStream
+            The text output stream to render to.
+        '''
+        assert output, 'Invalid YAML output stream %s' % output
+
+        self.output = output
+        self.name = None
+        self.isEmpty = True
+
+    def collectionStart(self, name, attributes=None):
+        '''
+        @see: IRenderTextStream.collectionStart
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert attributes is None or isinstance(attributes, dict), 'Invalid attributes %s' % attributes
+
+        if attributes: yaml.dump(attributes, self.output, default_flow_style=False)
+        self.name = name
+        self.isEmpty = True
+
+    def item(self, obj):
+        '''
+        @see: IRenderTextStream.item
+        '''
+        if self.isEmpty:
+            self.output.write(self.name)
+            self.output.write(':\n')
+            self.isEmpty = False
+        yaml.dump([obj], self.output, default_flow_style=False)
+
+    def collectionEnd(self):
+        '''
+        @see: IRenderTextStream.collectionEnd
+        '''
+        if self.isEmpty: yaml.dump({self.name: []}, self.output, default_flow_style=False)
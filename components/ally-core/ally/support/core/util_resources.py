@@ -14,9 +14,10 @@ from ally.api.operator.container import Service, Call
 from ally.api.operator.type import TypeModel, TypeModelProperty, TypeService
 from ally.api.type import typeFor, Input
 from ally.core.impl.invoker import InvokerRestructuring, InvokerCall
-from ally.core.impl.node import NodePath, NodeProperty, MatchProperty
+from ally.core.impl.node import NodePath, NodeProperty, MatchProperty, \
+    ORDER_PATH
 from ally.core.spec.resources import Match, Node, Path, ConverterPath, \
-    IResourcesRegister, Invoker, PathExtended
+    IResourcesRegister, Invoker, PathExtended, INodeChildListener
 from ally.support.util import immut
 from collections import deque, Iterable
 
@@ -333,6 +334,105 @@ class ResourcesRegisterDelegate(IResourcesRegister):
         self.main.register(implementation)
         for register in self.others: register.register(implementation)
 
+class PathFinder(INodeChildListener):
+    '''
+    Provides the same resource node finding as @see: findPath but based on an index of the nodes children, the path
+    nodes children are indexed by the normalized name so a path element is matched with a hash lookup and only the other
+    children (like the properties nodes) are matched in order. The index of a node is created when first needed and is
+    discarded whenever a child is added to the node, so the index is kept up to date with the nodes structure.
+    '''
+
+    def __init__(self, root, converterPath):
+        '''
+        Construct the path finder.
+        
+        @param root: Node
+            The root node to search from, the path finder listens to the root structure changes.
+        @param converterPath: ConverterPath
+            The converter path used in handling the path elements.
+        '''
+        assert isinstance(root, Node), 'Invalid root node %s' % root
+        assert isinstance(converterPath, ConverterPath), 'Invalid converter path %s' % converterPath
+        self.root = root
+        self.converterPath = converterPath
+        self._indexes = {}
+        root.addStructureListener(self)
+
+    def onChildAdded(self, node, child):
+        '''
+        @see: INodeChildListener.onChildAdded
+        '''
+        self._indexes.pop(node, None)
+
+    def find(self, paths):
+        '''
+        Finds the resource node for the provided request path, @see: findPath.
+        
+        @param paths: deque[string]|Iterable[string]
+            A deque of string path elements identifying a resource to be searched for, this list will be consumed 
+            of every path element that was successfully identified.
+        @return: Path
+            The path leading to the node that provides the resource if the Path has no node it means that the paths
+            have been recognized only to certain point.
+        '''
+        if not isinstance(paths, deque):
+            assert isinstance(paths, Iterable), 'Invalid iterable paths %s' % paths
+            paths = deque(paths)
+        assert isinstance(paths, deque), 'Invalid paths %s' % paths
+        
+        node = self.root
+        if len(paths) == 0: return Path([], node)
+        
+        matches = []
+        found = pushMatch(matches, node.tryMatch(self.converterPath, paths))
+        while found and len(paths) > 0:
+            index = self._indexes.get(node)
+            if index is None: index = self._indexes[node] = self._indexFor(node)
+            before, byName, after = index
+            
+            found = False
+            for child in before:
+                if pushMatch(matches, child.tryMatch(self.converterPath, paths)):
+                    node, found = child, True
+                    break
+            else:
+                child = byName.get(paths[0])
+                if child is not None:
+                    paths.popleft()
+                    matches.append(child.newMatch())
+                    node, found = child, True
+                    continue
+                for child in after:
+                    if pushMatch(matches, child.tryMatch(self.converterPath, paths)):
+                        node, found = child, True
+                        break
+        
+        if len(paths) == 0: return Path(matches, node)
+        
+        return Path(matches)
+    
+    # ----------------------------------------------------------------
+    
+    def _indexFor(self, node):
+        '''
+        Creates the index for the provided node children.
+        
+        @param node: Node
+            The node to index the children for.
+        @return: tuple(list[Node], dictionary{string: NodePath}, list[Node])
+            The children to be matched before the path nodes, the path nodes indexed by normalized name and the children to
+            be matched after the path nodes.
+        '''
+        assert isinstance(node, Node), 'Invalid node %s' % node
+        before, byName, after = [], {}, []
+        for child in node.children:
+            assert isinstance(child, Node), 'Invalid node %s' % child
+            if isinstance(child, NodePath) and type(child).tryMatch is NodePath.tryMatch:
+                byName.setdefault(self.converterPath.normalize(child.name), child)
+            elif child.order < ORDER_PATH: before.append(child)
+            else: after.append(child)
+        return before, byName, after
+
 class ReplacerMarkCount:
     '''
     Provides the callable support for replacing the invalid matches with markers that are based on a counter, so every
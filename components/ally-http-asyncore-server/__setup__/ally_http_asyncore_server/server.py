@@ -9,7 +9,8 @@ Created on Nov 23, 2011
 Runs the asyncore py web server.
 '''
 
-from ..ally_http import server_type, server_version, server_host, server_port
+from ..ally_http import server_type, server_version, server_host, server_port, \
+    server_allow_chunked
 from ..ally_http.server import assemblyServer
 from ally.container import ioc
 from ally.http.server import server_asyncore
@@ -29,6 +30,40 @@ def server_type_asyncore():
     ''' % SERVER_ASYNCORE
     return SERVER_ASYNCORE
 
+@ioc.config
+def server_keep_alive() -> bool:
+    '''
+    Flag indicating that the HTTP/1.1 persistent connections are supported, this allows the clients to send multiple
+    (also pipelined) requests on the same connection, if False the connection is closed after each response.
+    '''
+    return True
+
+@ioc.config
+def server_keep_alive_timeout() -> float:
+    '''The number of seconds an idle persistent connection is kept open waiting for a new request'''
+    return 15.0
+
+@ioc.config
+def server_keep_alive_max_requests() -> int:
+    '''The maximum number of requests served on a persistent connection before is closed, 0 means unlimited'''
+    return 100
+
+@ioc.config
+def server_asyncore_threads() -> int:
+    '''
+    The number of threads used for processing the requests, this way a slow request processing will not stall the
+    connections handling, if 0 then the requests are processed in the asyncore loop thread.
+    '''
+    return 0
+
+@ioc.config
+def server_asyncore_metrics_interval() -> float:
+    '''
+    The interval in seconds at which the processing threads queue metrics are logged, used only if there are processing
+    threads, if 0 then the metrics are not logged.
+    '''
+    return 60.0
+
 # --------------------------------------------------------------------
 
 @ioc.entity
@@ -42,6 +77,12 @@ def serverAsyncore():
     b.serverPort = server_port()
     b.requestHandlerFactory = serverAsyncoreRequestHandler()
     b.assembly = assemblyServer()
+    b.keepAlive = server_keep_alive()
+    b.keepAliveTimeout = server_keep_alive_timeout()
+    b.keepAliveMaximum = server_keep_alive_max_requests()
+    b.threadsCount = server_asyncore_threads()
+    b.metricsInterval = server_asyncore_metrics_interval()
+    b.allowChunked = server_allow_chunked()
     return b
 
 # --------------------------------------------------------------------
@@ -0,0 +1,147 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the asyncore server persistent connections.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import requires, defines
+from ally.design.processor.context import Context
+from ally.design.processor.handler import HandlerProcessor, HandlerProcessorProceed
+from ally.http.server.server_asyncore import AsyncServer
+from ally.support.util_io import IInputStream
+from collections import Callable, Iterable
+from io import BytesIO
+from threading import Thread
+import socket
+import unittest
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    method = requires(str)
+    headers = requires(dict)
+
+class RequestContent(Context):
+    contentReader = defines(Callable)
+    source = defines(IInputStream)
+
+class Response(Context):
+    status = defines(int)
+    headers = defines(dict)
+
+class ResponseContent(Context):
+    source = defines(Iterable)
+
+class ContentReader(HandlerProcessor):
+    '''
+    Reads the posted content, unless the request has the skip header.
+    '''
+    def process(self, chain, request:Request, requestCnt:RequestContent, **keyargs):
+        chain.proceed()
+        if request.method != 'POST' or 'X-Skip' in request.headers: return
+        length, content = int(request.headers['Content-Length']), BytesIO()
+        def reader(data):
+            content.write(data)
+            if content.tell() < length: return
+            content.seek(0)
+            requestCnt.source, requestCnt.contentReader = content, None
+            return chain
+        requestCnt.contentReader = reader
+
+class Echo(HandlerProcessorProceed):
+    '''
+    Responds with the read content.
+    '''
+    def process(self, requestCnt:RequestContent, response:Response, responseCnt:ResponseContent, **keyargs):
+        content = b'echo:'
+        if isinstance(requestCnt.source, BytesIO): content += requestCnt.source.read()
+        response.status, response.headers = 200, {'Content-Length': str(len(content))}
+        responseCnt.source = (content,)
+
+def startServer(threadsCount):
+    assembly = Assembly('Test')
+    assembly.add(ContentReader(), Echo())
+    server = AsyncServer()
+    server.serverVersion, server.serverHost, server.serverPort = 'Test', '127.0.0.1', 0
+    server.assembly, server.threadsCount = assembly, threadsCount
+    ioc.initialize(server)
+    runner = Thread(target=server.serve_forever)
+    runner.daemon = True
+    runner.start()
+    return server
+
+def readResponse(rfile):
+    status, headers = None, {}
+    while True:
+        line = rfile.readline().strip().decode()
+        if not line: break
+        # The status line position depends on how the python version buffers the headers.
+        if line.startswith('HTTP/'): status = int(line.split()[1])
+        else:
+            name, value = line.split(':', 1)
+            headers[name.strip()] = value.strip()
+    return status, headers, rfile.read(int(headers['Content-Length']))
+
+# --------------------------------------------------------------------
+
+class TestServerAsyncore(unittest.TestCase):
+
+    def connect(self, threadsCount):
+        self.server = server = startServer(threadsCount)
+        self.addCleanup(server.close)
+        connection = socket.create_connection(server.socket.getsockname(), timeout=5)
+        self.addCleanup(connection.close)
+        return connection, connection.makefile('rb')
+
+    def testKeepAlive(self):
+        connection, rfile = self.connect(0)
+
+        connection.sendall(b'GET /a HTTP/1.1\r\nHost: test\r\n\r\n')
+        self.assertEqual((200, b'echo:'), readResponse(rfile)[::2])
+        connection.sendall(b'POST /a HTTP/1.1\r\nHost: test\r\nContent-Length: 5\r\n\r\nhello'
+                           b'GET /b HTTP/1.1\r\nHost: test\r\n\r\n')
+        status, headers, content = readResponse(rfile)
+        self.assertEqual((200, b'echo:hello', 'keep-alive'), (status, content, headers['Connection']))
+        self.assertEqual((200, b'echo:'), readResponse(rfile)[::2])
+
+        # The content is not read so the connection cannot be used for the next request.
+        connection.sendall(b'POST /a HTTP/1.1\r\nHost: test\r\nX-Skip: true\r\nContent-Length: 20\r\n\r\n'
+                           b'GET /c HTTP/1.1\r\n\r\n')
+        status, headers, content = readResponse(rfile)
+        self.assertEqual((200, b'echo:', 'close'), (status, content, headers['Connection']))
+        self.assertEqual(b'', rfile.read())
+
+    def testExecutorContent(self):
+        connection, rfile = self.connect(2)
+
+        # The content and the pipelined request arrive in the same read as the request headers.
+        connection.sendall(b'POST /a HTTP/1.1\r\nHost: test\r\nContent-Length: 5\r\n\r\nhello'
+                           b'GET /b HTTP/1.1\r\nHost: test\r\n\r\n')
+        self.assertEqual((200, b'echo:hello'), readResponse(rfile)[::2])
+        self.assertEqual((200, b'echo:'), readResponse(rfile)[::2])
+
+        connection.sendall(b'POST /a HTTP/1.1\r\nHost: test\r\nContent-Length: 6\r\n\r\nhel')
+        connection.sendall(b'lo!')
+        self.assertEqual((200, b'echo:hello!'), readResponse(rfile)[::2])
+
+        metrics = self.server.metrics()
+        self.assertEqual(0, metrics['queueDepth'])
+        self.assertTrue(metrics['executed'] >= 3)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
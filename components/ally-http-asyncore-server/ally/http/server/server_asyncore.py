@@ -14,15 +14,20 @@ from ally.design.processor.assembly import Assembly
 from ally.design.processor.attribute import optional
 from ally.design.processor.execution import Chain, Processing
 from ally.http.spec.server import RequestHTTP, ResponseHTTP, RequestContentHTTP, \
-    ResponseContentHTTP, HTTP
+    ResponseContentHTTP, HTTP, chunkedGenerator
 from ally.support.util_io import IInputStream, readGenerator
 from asyncore import dispatcher, loop
 from collections import Callable, deque
+from concurrent.futures.thread import ThreadPoolExecutor
+from functools import partial
 from http.server import BaseHTTPRequestHandler
 from io import BytesIO
+from threading import Lock
 from urllib.parse import urlparse, parse_qsl
+import errno
 import logging
 import socket
+import time
 
 # --------------------------------------------------------------------
 
@@ -32,6 +37,7 @@ log = logging.getLogger(__name__)
 WRITE_BYTES = 1
 WRITE_ITER = 2
 WRITE_CLOSE = 3
+WRITE_RESET = 4
 
 # --------------------------------------------------------------------
 
@@ -45,6 +51,10 @@ class RequestContentHTTPAsyncore(RequestContentHTTP):
     The content reader callable used for pushing data from the asyncore read. Once the reader is finalized it will
     return a chain that is used for further request processing.
     ''')
+    length = optional(int, doc='''
+    @rtype: integer
+    The content length in bytes, used in order to know where a pipelined request starts.
+    ''')
 
 # --------------------------------------------------------------------
 
@@ -61,6 +71,18 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
     # The maximum request size, 100 kilobytes
     requestTerminator = b'\r\n\r\n'
     # Terminator that signals the http request is complete 
+    nameConnection = 'Connection'
+    # The name for the connection header
+    nameContentLength = 'Content-Length'
+    # The name for the content length header
+    nameTransferEncoding = 'Transfer-Encoding'
+    # The name for the transfer encoding header
+    valueChunked = 'chunked'
+    # The transfer encoding header value for chunked content
+    valueKeepAlive = 'keep-alive'
+    # The connection header value for persistent connections
+    valueClose = 'close'
+    # The connection header value for closing connections
 
     def __init__(self, request, address, server):
         '''
@@ -82,23 +104,19 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         self.server = server
         
         self.server_version = server.serverVersion
-        self.request_version = 'HTTP/1.1'
-        self.requestline = 0
+        if server.keepAlive: self.protocol_version = 'HTTP/1.1'
         
-        self._stage = 1
-        self.rfile = BytesIO()
-        self._readCarry = None
-        self._reader = None
-
-        self.wfile = BytesIO()
         self._writeq = deque()
+        self._pending = None
+        self._requestsCount = 0
         
-        self._next(1)
+        self._reset()
         
     def handle_read(self):
         '''
         @see: dispatcher.handle_read
         '''
+        self._lastActivity = time.time()
         try: data = self.recv(self.bufferSize)
         except socket.error:
             log.exception('Exception occurred while reading the content from \'%s\'' % self.connection)
@@ -108,6 +126,17 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
     
     def handle_error(self):
         log.exception('A problem occurred in the server')
+        
+    def isIdle(self, since):
+        '''
+        Checks if the handler is waiting for a request and had no activity since the provided time.
+        
+        @param since: float
+            The time since when the handler needs to be inactive in order to be considered idle.
+        @return: boolean
+            True if the handler is idle, False otherwise.
+        '''
+        return self._stage == 1 and self._lastActivity < since
     
     def end_headers(self):
         '''
@@ -133,10 +162,80 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         Proceed to next stage.
         '''
         assert isinstance(stage, int), 'Invalid stage %s' % stage
+        self._stage = stage
         self.readable = getattr(self, '_%s_readable' % stage, None)
         self.handle_data = getattr(self, '_%s_handle_data' % stage, None)
         self.writable = getattr(self, '_%s_writable' % stage, None)
         self.handle_write = getattr(self, '_%s_handle_write' % stage, None)
+        
+    def _reset(self):
+        '''
+        Resets the handler in order to wait for a new request on the same connection.
+        '''
+        self.request_version = 'HTTP/1.1'
+        self.requestline = 0
+        self.close_connection = 1
+        
+        self.rfile = BytesIO()
+        self._readCarry = None
+        self._reader = None
+        self._readRemaining = None
+        self._requestCnt = None
+        self._contentRemaining = 0
+        self._carry = None
+        
+        self.wfile = BytesIO()
+        self._lastActivity = time.time()
+        
+        self._next(1)
+        
+    def _isKeepAlive(self, response, responseCnt, isChunked=False):
+        '''
+        Checks if the connection can be kept alive after the provided response.
+        
+        @param response: ResponseHTTP
+            The response to check.
+        @param responseCnt: ResponseContentHTTP
+            The response content to check.
+        @param isChunked: boolean
+            Flag indicating that the response content is delivered with the chunked transfer coding.
+        @return: boolean
+            True if the connection should be kept alive, False otherwise.
+        '''
+        assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
+        
+        if not self.server.keepAlive or self.close_connection: return False
+        # If the request content was not fully read the remaining bytes cannot be told apart from the next request.
+        if self._contentRemaining != 0: return False
+        if self.server.keepAliveMaximum and self._requestsCount >= self.server.keepAliveMaximum: return False
+        if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None and not isChunked:
+            # Without a content length the client can only detect the end of the content by the connection close.
+            if ResponseHTTP.headers not in response or not response.headers: return False
+            if self.nameContentLength not in response.headers: return False
+        return True
+    
+    def _isChunked(self, response, responseCnt):
+        '''
+        Checks if the provided response content needs to be delivered with the chunked transfer coding, this is the case
+        for the HTTP/1.1 responses that have a content without a known length.
+        
+        @param response: ResponseHTTP
+            The response to check.
+        @param responseCnt: ResponseContentHTTP
+            The response content to check.
+        @return: boolean
+            True if the content is delivered chunked, False otherwise.
+        '''
+        assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
+        
+        if not self.server.allowChunked: return False
+        if self.protocol_version != 'HTTP/1.1' or self.request_version != 'HTTP/1.1': return False
+        if ResponseContentHTTP.source not in responseCnt or responseCnt.source is None: return False
+        if ResponseHTTP.headers in response and response.headers:
+            if self.nameContentLength in response.headers: return False
+        return True
           
     # ----------------------------------------------------------------
     
@@ -162,9 +261,9 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             self.parse_request()
             self.rfile = None
             
+            # The data after the request is handled only after the stage following the processing is known.
+            if index < len(data): self._carry = data[index:]
             self._process(self.command or '')
-            
-            if index < len(data) and self.handle_data: self.handle_data(data[index:])
         else:
             self._readCarry = data[-requestTerminatorLen:]
             self.rfile.write(data[:-requestTerminatorLen])
@@ -193,12 +292,17 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         Handle the data as being part of the request.
         '''
         assert self._reader is not None, 'No reader available'
+        if self._readRemaining is not None:
+            if len(data) > self._readRemaining:
+                self._3_handle_data(data[self._readRemaining:])
+                data = data[:self._readRemaining]
+            self._readRemaining -= len(data)
+        if self._contentRemaining: self._contentRemaining -= len(data)
         chain = self._reader(data)
         if chain is not None:
             assert isinstance(chain, Chain), 'Invalid chain %s' % chain
             self._reader = None
-            self._next(3)  # Now we proceed to write stage
-            chain.doAll()
+            self._continue(chain)
             
     def _2_writable(self):
         '''
@@ -213,6 +317,13 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         @see: dispatcher.readable
         '''
         return False
+    
+    def _3_handle_data(self, data):
+        '''
+        Keeps the pipelined data until the current response is delivered.
+        '''
+        if self._pending is None: self._pending = data
+        else: self._pending += data
             
     def _3_writable(self):
         '''
@@ -227,7 +338,7 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         assert self._writeq, 'Nothing to write'
         
         what, content = self._writeq[0]
-        assert what in (WRITE_ITER, WRITE_BYTES, WRITE_CLOSE), 'Invalid what %s' % what
+        assert what in (WRITE_ITER, WRITE_BYTES, WRITE_CLOSE, WRITE_RESET), 'Invalid what %s' % what
         if what == WRITE_ITER:
             try: data = memoryview(next(content))
             except StopIteration:
@@ -237,6 +348,13 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         elif what == WRITE_CLOSE:
             self.close()
             return
+        elif what == WRITE_RESET:
+            del self._writeq[0]
+            self._reset()
+            if self._pending is not None:
+                data, self._pending = self._pending, None
+                self.handle_data(data)
+            return
         
         dataLen = len(data)
         try:
@@ -246,11 +364,26 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             log.exception('Exception occurred while writing to the connection \'%s\'' % self.connection)
             self.close()
             return
+        self._lastActivity = time.time()
         if sent < dataLen:
             if what == WRITE_ITER: self._writeq.appendleft((WRITE_BYTES, data[sent:]))
             elif what == WRITE_BYTES: self._writeq[0] = (WRITE_BYTES, data[sent:])
         else:
             if what == WRITE_BYTES: del self._writeq[0]
+            
+    # ----------------------------------------------------------------
+    
+    def _4_readable(self):
+        '''
+        @see: dispatcher.readable
+        '''
+        return False
+    
+    def _4_writable(self):
+        '''
+        @see: dispatcher.writable
+        '''
+        return False
         
     # ----------------------------------------------------------------
     
@@ -270,7 +403,14 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         request.uri = url.path.lstrip('/')
         request.parameters = parse_qsl(url.query, True, False)
         
+        if self.nameTransferEncoding in self.headers: self._contentRemaining = None
+        else:
+            try: self._contentRemaining = int(self.headers.get(self.nameContentLength, 0))
+            except ValueError: self._contentRemaining = None
+        
         requestCnt.source = self.rfile
+        self._requestCnt = requestCnt
+        self._requestsCount += 1
         
         chain = Chain(proc)
         chain.process(**proc.fillIn(request=request, requestCnt=requestCnt,
@@ -280,9 +420,15 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             response, responseCnt = chain.arg.response, chain.arg.responseCnt
             assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
             assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
-    
+            
+            isChunked = self._isChunked(response, responseCnt)
+            keepAlive = self._isKeepAlive(response, responseCnt, isChunked)
             if ResponseHTTP.headers in response and response.headers is not None:
                 for name, value in response.headers.items(): self.send_header(name, value)
+                hasConnection = self.nameConnection in response.headers
+            else: hasConnection = False
+            if isChunked: self.send_header(self.nameTransferEncoding, self.valueChunked)
+            if not hasConnection: self.send_header(self.nameConnection, self.valueKeepAlive if keepAlive else self.valueClose)
     
             assert isinstance(response.status, int), 'Invalid response status code %s' % response.status
             if ResponseHTTP.text in response and response.text: text = response.text
@@ -294,20 +440,70 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None:
                 if isinstance(responseCnt.source, IInputStream): source = readGenerator(responseCnt.source, self.bufferSize)
                 else: source = responseCnt.source
+                # The content is pulled from the source only when the connection is ready to send more data.
+                if isChunked: source = chunkedGenerator(source)
                 self._writeq.append((WRITE_ITER, iter(source)))
-                
-            self._writeq.append((WRITE_CLOSE, None))
+            
+            if keepAlive: self._writeq.append((WRITE_RESET, None))
+            else: self._writeq.append((WRITE_CLOSE, None))
             
         chain.callBack(respond)
+        self._continue(chain)
+        
+    def _continue(self, chain):
+        '''
+        Continues the chain execution, if the server has an executor the chain is executed in a thread and the handler
+        waits until the execution is finalized.
+        '''
+        if self.server.executor is None: self._proceed(self._execute(chain))
+        else:
+            self._next(4)  # Now we wait for the execution
+            self.server.execute(partial(self._executeSafe, chain), self._proceed)
         
+    def _execute(self, chain):
+        '''
+        Executes the chain until is finalized or the request content needs to be read.
+        
+        @return: integer
+            The stage to proceed with.
+        '''
+        assert isinstance(chain, Chain), 'Invalid chain %s' % chain
+        requestCnt = self._requestCnt
         while True:
-            if not chain.do():
-                self._next(3)  # Now we proceed to write stage
-                break
+            if not chain.do(): return 3  # Now we proceed to write stage
             if RequestContentHTTPAsyncore.contentReader in requestCnt and requestCnt.contentReader is not None:
-                self._next(2)  # Now we proceed to read stage
-                self._reader = requestCnt.contentReader
-                break
+                return 2  # Now we proceed to read stage
+            
+    def _executeSafe(self, chain):
+        '''
+        Executes the chain in a executor thread.
+        
+        @return: integer|None
+            The stage to proceed with, None if the execution failed.
+        '''
+        try: return self._execute(chain)
+        except:
+            log.exception('A problem occurred while processing the request for \'%s\'' % self.connection)
+            
+    def _proceed(self, stage):
+        '''
+        Proceed to the stage resulted from the chain execution.
+        '''
+        if stage is None:
+            self.close()
+            return
+        
+        self._next(stage)
+        if stage == 2:
+            requestCnt = self._requestCnt
+            self._reader = requestCnt.contentReader
+            if RequestContentHTTPAsyncore.length in requestCnt and requestCnt.length is not None:
+                self._readRemaining = requestCnt.length
+            else: self._readRemaining = self._contentRemaining
+        
+        if self._carry is not None:
+            data, self._carry = self._carry, None
+            self.handle_data(data)
 
 # --------------------------------------------------------------------
 
@@ -331,6 +527,21 @@ class AsyncServer(dispatcher):
     
     timeout = 10.0
     # The timeout for select loop.
+    keepAlive = True
+    # Flag indicating that the HTTP/1.1 persistent connections are supported.
+    keepAliveTimeout = 15.0
+    # The number of seconds an idle persistent connection is kept open.
+    keepAliveMaximum = 100
+    # The maximum number of requests served on a persistent connection, 0 for unlimited.
+    idleCheckInterval = 1.0
+    # The interval in seconds at which the idle connections are checked.
+    threadsCount = 0
+    # The number of threads used for executing the processing, if 0 the processing is executed in the loop thread.
+    allowChunked = True
+    # Flag indicating that the response content without a length is delivered with the chunked transfer coding to the
+    # HTTP/1.1 clients, this way the connection can be kept alive.
+    metricsInterval = 60.0
+    # The interval in seconds at which the executor metrics are logged, if 0 the metrics are not logged.
 
     def __init__(self):
         '''
@@ -342,8 +553,23 @@ class AsyncServer(dispatcher):
         assert callable(self.requestHandlerFactory), 'Invalid request handler factory %s' % self.requestHandlerFactory
         assert isinstance(self.assembly, Assembly), 'Invalid assembly %s' % self.assembly
         assert isinstance(self.timeout, float), 'Invalid timeout %s' % self.timeout
+        assert isinstance(self.keepAlive, bool), 'Invalid keep alive flag %s' % self.keepAlive
+        assert isinstance(self.keepAliveTimeout, float), 'Invalid keep alive timeout %s' % self.keepAliveTimeout
+        assert isinstance(self.keepAliveMaximum, int), 'Invalid keep alive maximum %s' % self.keepAliveMaximum
+        assert isinstance(self.idleCheckInterval, float), 'Invalid idle check interval %s' % self.idleCheckInterval
+        assert isinstance(self.threadsCount, int), 'Invalid threads count %s' % self.threadsCount
+        assert isinstance(self.allowChunked, bool), 'Invalid allow chunked flag %s' % self.allowChunked
+        assert isinstance(self.metricsInterval, float), 'Invalid metrics interval %s' % self.metricsInterval
         self.map = {}
         dispatcher.__init__(self, map=self.map)
+        
+        if self.threadsCount > 0:
+            self.executor = ThreadPoolExecutor(self.threadsCount)
+            self._wakeUp = WakeUp(self.map)
+            self._metricsLock = Lock()
+            self._queued = self._queuedMaximum = self._executed = 0
+            self._waitTotal = self._waitMaximum = 0.0
+        else: self.executor = None
 
         self.processing = self.assembly.create(request=RequestHTTP, requestCnt=RequestContentHTTPAsyncore,
                                                response=ResponseHTTP, responseCnt=ResponseContentHTTP)
@@ -373,7 +599,24 @@ class AsyncServer(dispatcher):
         '''
         Loops and servers the connections.
         '''
-        loop(self.timeout, map=self.map)
+        logMetrics = self.executor is not None and self.metricsInterval > 0
+        if not self.keepAlive and not logMetrics:
+            loop(self.timeout, map=self.map)
+            return
+        
+        timeout, checkAt, logAt = self.timeout, 0, time.time() + self.metricsInterval
+        if self.keepAlive: timeout = min(timeout, self.idleCheckInterval)
+        if logMetrics: timeout = min(timeout, self.metricsInterval)
+        while self.map:
+            loop(timeout, map=self.map, count=1)
+            now = time.time()
+            if self.keepAlive and now >= checkAt:
+                checkAt = now + self.idleCheckInterval
+                self.closeIdle(now - self.keepAliveTimeout)
+            if logMetrics and now >= logAt:
+                logAt = now + self.metricsInterval
+                log.info('Executor queue depth %(queueDepth)s (maximum %(queueDepthMaximum)s), executed %(executed)s, '
+                         'queue wait average %(waitAverage).4f seconds (maximum %(waitMaximum).4f)', self.metrics())
             
     def serve_limited(self, count):
         '''
@@ -381,6 +624,137 @@ class AsyncServer(dispatcher):
         Loops the provided amount of times and servers the connections.
         '''
         loop(self.timeout, True, self.map, count)
+        
+    def execute(self, call, callBack):
+        '''
+        Executes the call in a thread of the executor, the call back is then called with the call result in the loop thread.
+        
+        @param call: callable()
+            The call to be executed in the executor.
+        @param callBack: callable(object)
+            The call back for the result, called in the loop thread.
+        '''
+        assert self.executor is not None, 'No executor available'
+        assert callable(call), 'Invalid call %s' % call
+        assert callable(callBack), 'Invalid call back %s' % callBack
+        
+        with self._metricsLock:
+            self._queued += 1
+            if self._queued > self._queuedMaximum: self._queuedMaximum = self._queued
+        
+        queuedAt = time.time()
+        def task():
+            wait = time.time() - queuedAt
+            with self._metricsLock:
+                self._queued -= 1
+                self._executed += 1
+                self._waitTotal += wait
+                if wait > self._waitMaximum: self._waitMaximum = wait
+            self._wakeUp.post(partial(callBack, call()))
+        self.executor.submit(task)
+        
+    def metrics(self):
+        '''
+        Provides the executor metrics.
+        
+        @return: dictionary{string: integer|float}
+            The metrics, the queue depth (current and maximum), the executed count and the wait time in seconds in the
+            executor queue (average and maximum).
+        '''
+        if self.executor is None: return {}
+        with self._metricsLock:
+            return dict(queueDepth=self._queued, queueDepthMaximum=self._queuedMaximum, executed=self._executed,
+                        waitAverage=self._waitTotal / self._executed if self._executed else 0.0,
+                        waitMaximum=self._waitMaximum)
+        
+    def closeIdle(self, since):
+        '''
+        Closes the connections that had no activity while waiting for a request.
+        
+        @param since: float
+            The time since when the connections need to be inactive in order to be closed.
+        '''
+        for handler in list(self.map.values()):
+            if isinstance(handler, RequestHandler) and handler.isIdle(since):
+                assert log.debug('Closing idle connection \'%s\'', handler.connection) or True
+                handler.close()
+
+class WakeUp(dispatcher):
+    '''
+    Dispatcher on a connected sockets pair used for waking up the loop in order to execute calls posted from other threads.
+    '''
+    
+    def __init__(self, map):
+        '''
+        Construct the wake up dispatcher.
+        
+        @param map: dictionary{integer: dispatcher}
+            The map of the loop to wake up.
+        '''
+        read, self._write = socketPair()
+        dispatcher.__init__(self, read, map=map)
+        self._write.setblocking(False)
+        
+        self._calls = deque()
+        
+    def post(self, call):
+        '''
+        Post a call to be executed in the loop thread, this method can be called from any thread.
+        
+        @param call: callable()
+            The call to execute.
+        '''
+        assert callable(call), 'Invalid call %s' % call
+        self._calls.append(call)
+        try: self._write.send(b'\0')
+        except socket.error as e:
+            # If the socket buffer is full the loop is going to wake up anyway
+            if e.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK): raise
+            
+    def writable(self):
+        '''
+        @see: dispatcher.writable
+        '''
+        return False
+    
+    def handle_read(self):
+        '''
+        @see: dispatcher.handle_read
+        '''
+        try: self.recv(1024)
+        except socket.error as e:
+            if e.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK): raise
+        while self._calls: self._calls.popleft()()
+        
+    def handle_error(self):
+        log.exception('A problem occurred in a call posted to the server loop')
+        
+    def close(self):
+        '''
+        @see: dispatcher.close
+        '''
+        super().close()
+        self._write.close()
+
+# --------------------------------------------------------------------
+
+def socketPair():
+    '''
+    Provides a pair of connected sockets, if the platform has no socket pair support a loopback connection is used.
+    
+    @return: tuple(socket, socket)
+        The connected sockets.
+    '''
+    if hasattr(socket, 'socketpair'): return socket.socketpair()
+    
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        connected = socket.create_connection(listener.getsockname())
+        accepted, _address = listener.accept()
+    finally: listener.close()
+    return accepted, connected
 
 # --------------------------------------------------------------------
 
@@ -47,11 +47,14 @@ class RequestHandler:
  
     httpFormat = 'HTTP/1.1 %(code)s %(status)s\r\n%(headers)s\r\n\r\n'
     # The http format for the response.
+    nameContentLength = 'Content-Length'
+    # The header name for the content length.
 
     def __init__(self):
         assert isinstance(self.serverVersion, str), 'Invalid server version %s' % self.serverVersion
         assert isinstance(self.assembly, Assembly), 'Invalid assembly %s' % self.assembly
         assert isinstance(self.httpFormat, str), 'Invalid http format for the response %s' % self.httpFormat
+        assert isinstance(self.nameContentLength, str), 'Invalid content length name %s' % self.nameContentLength
         
         self.processing = self.assembly.create(request=RequestHTTP, requestCnt=RequestContentHTTP,
                                                response=ResponseHTTP, responseCnt=ResponseContentHTTP)
@@ -98,9 +101,16 @@ class RequestHandler:
         else:
             try: text, _long = BaseHTTPRequestHandler.responses[response.status]
             except KeyError: text = '???'
-        self._respond(req, response.status, text, responseHeaders)
         
-        if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None: req.push(responseCnt.source)
+        if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None:
+            # The content is sent in a single message so the content length is always provided, the chunked transfer
+            # coding is not used.
+            content = contentOf(responseCnt.source)
+            if self.nameContentLength not in responseHeaders: responseHeaders[self.nameContentLength] = str(len(content))
+        else: content = None
+        
+        self._respond(req, response.status, text, responseHeaders)
+        if content is not None: req.send(content)
         self._end(req)
 
     # ----------------------------------------------------------------
@@ -263,23 +273,25 @@ class Request:
         Send the bytes message.
         '''
         self.server.resp.send(self._header + msg)
-        
-    def push(self, content):
-        '''
-        Push the stream data as a response.
-        '''
-        assert isinstance(content, (IInputStream, Iterable)), 'Invalid content %s' % content
-        if isinstance(content, IInputStream):
-            assert isinstance(content, IInputStream)
-            self.send(content.read())
-            if isinstance(content, IClosable):
-                assert isinstance(content, IClosable)
-                content.close()
-        else:
-            cache = BytesIO()
-            for data in content: cache.write(data)
-            self.send(cache.getvalue())
-            cache.close()
+
+# --------------------------------------------------------------------
+
+def contentOf(source):
+    '''
+    Reads the response content from the provided source.
+    
+    @param source: IInputStream|Iterable
+        The source of the content.
+    @return: bytes
+        The content.
+    '''
+    assert isinstance(source, (IInputStream, Iterable)), 'Invalid content %s' % source
+    if isinstance(source, IInputStream):
+        assert isinstance(source, IInputStream)
+        try: return source.read()
+        finally:
+            if isinstance(source, IClosable): source.close()
+    return b''.join(source)
 
 # --------------------------------------------------------------------
 
@@ -22,6 +22,8 @@ DESCRIPTION = 'Provides the HTTP communication support'
 
 SERVER_BASIC = 'basic'
 # The basic server name
+SERVER_PREFORK = 'prefork'
+# The prefork server name
 
 # --------------------------------------------------------------------
 # The default configurations
@@ -31,6 +33,8 @@ def server_type() -> str:
     '''
     The type of the server to use, the options are:
     "basic"- single threaded server, the safest but slowest server to use.
+    "prefork"- multiple processes server, the main process forks worker processes that each start the application and
+    serve the requests with the basic server from the shared listen socket.
     '''
     return SERVER_BASIC
 
@@ -48,3 +52,11 @@ def server_port() -> int:
 def server_version() -> str:
     '''The server version name'''
     return 'Ally/0.1'
+
+@ioc.config
+def server_allow_chunked() -> bool:
+    '''
+    Flag indicating that the response content without a known length is delivered with the chunked transfer coding to
+    the HTTP/1.1 clients, this way the content is streamed as it is rendered
+    '''
+    return True
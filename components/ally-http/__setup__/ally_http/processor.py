@@ -9,6 +9,8 @@ Created on Nov 24, 2011
 Provides the configurations for the processors used in handling the request.
 '''
 
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ally.container import ioc
 from ally.design.processor.assembly import Assembly
 from ally.design.processor.handler import Handler
@@ -19,6 +21,8 @@ from ally.http.impl.processor.header import HeaderDecodeRequestHandler, \
 from ally.http.impl.processor.headers.accept import AcceptRequestDecodeHandler, \
     AcceptRequestEncodeHandler
 from ally.http.impl.processor.headers.allow import AllowEncodeHandler
+from ally.http.impl.processor.headers.content_encoding import \
+    ContentEncodingHandler
 from ally.http.impl.processor.headers.content_length import \
     ContentLengthDecodeHandler, ContentLengthEncodeHandler
 from ally.http.impl.processor.headers.content_type import \
@@ -37,6 +41,27 @@ def read_from_params():
     '''If true will also read header values that are provided as query parameters'''
     return True
 
+@ioc.config
+def compression_level() -> int:
+    '''The response content compression level, from 1 (fastest) to 9 (smallest)'''
+    return 6
+
+@ioc.config
+def compression_minimum_size() -> int:
+    '''
+    The minimum response content length in bytes for compressing, the content with an unknown length is always
+    compressed
+    '''
+    return 1024
+
+@ioc.config
+def header_parsed_cache_size() -> int:
+    '''
+    The maximum number of distinct header values (like the accept or content type values) that are cached parsed, if 0
+    then the header values are parsed for every request
+    '''
+    return 500
+
 # --------------------------------------------------------------------
 
 @ioc.entity
@@ -46,10 +71,14 @@ def internalError(): return InternalErrorHandler()
 def headerDecodeRequest() -> Handler:
     b = HeaderDecodeRequestHandler()
     b.useParameters = read_from_params()
+    b.parsedCacheSize = header_parsed_cache_size()
     return b
 
 @ioc.entity
-def headerDecodeResponse() -> Handler: return HeaderDecodeResponseHandler()
+def headerDecodeResponse() -> Handler:
+    b = HeaderDecodeResponseHandler()
+    b.parsedCacheSize = header_parsed_cache_size()
+    return b
 
 @ioc.entity
 def headerEncodeRequest() -> Handler: return HeaderEncodeRequestHandler()
@@ -78,6 +107,13 @@ def contentLengthDecode() -> Handler: return ContentLengthDecodeHandler()
 @ioc.entity
 def contentLengthEncode() -> Handler: return ContentLengthEncodeHandler()
 
+@ioc.entity
+def contentEncoding() -> Handler:
+    b = ContentEncodingHandler()
+    b.level = compression_level()
+    b.minimumSize = compression_minimum_size()
+    return b
+
 @ioc.entity
 def methodOverride() -> Handler: return MethodOverrideHandler()
 
@@ -100,7 +136,10 @@ def assemblyNotFound() -> Assembly:
     '''
     The assembly containing the handlers that will be used in processing a not found request.
     '''
-    return Assembly('Not found')
+    b = Assembly('Not found')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 # --------------------------------------------------------------------
 
@@ -9,14 +9,18 @@ Created on Nov 23, 2011
 Runs the basic web server.
 '''
 
-from . import server_type, server_version, server_host, server_port
+from . import server_type, server_version, server_host, server_port, \
+    server_allow_chunked, SERVER_BASIC, SERVER_PREFORK
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from .processor import assemblyNotFound
 from ally.container import ioc
 from ally.design.processor.assembly import Assembly
 from ally.design.processor.handler import Handler
 from ally.http.impl.processor.router_by_path import RoutingByPathHandler
-from ally.http.server import server_basic
+from ally.http.server import server_basic, server_prefork
 from threading import Thread
+import signal
 
 # --------------------------------------------------------------------
 
@@ -25,7 +29,23 @@ def assemblyServer() -> Assembly:
     '''
     The assembly used in processing the server requests.
     '''
-    return Assembly('Server')
+    b = Assembly('Server')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
+
+@ioc.config
+def server_prefork_workers() -> int:
+    '''
+    The number of worker processes used by the prefork server, if 0 then the number of worker processes will be the
+    number of available CPUs on the machine.
+    '''
+    return 0
+
+@ioc.config
+def server_prefork_shutdown_timeout() -> float:
+    '''The number of seconds the prefork workers have to finish the requests in progress when the server is stopped'''
+    return 10.0
 
 # --------------------------------------------------------------------
 
@@ -40,6 +60,28 @@ def serverBasic():
     b.serverPort = server_port()
     b.requestHandlerFactory = serverBasicRequestHandler()
     b.assembly = assemblyServer()
+    b.allowChunked = server_allow_chunked()
+    return b
+
+@ioc.entity
+def serverPreforkSupervisor():
+    b = server_prefork.PreforkSupervisor()
+    b.serverHost = server_host()
+    b.serverPort = server_port()
+    b.workersCount = server_prefork_workers()
+    b.shutdownTimeout = server_prefork_shutdown_timeout()
+    return b
+
+@ioc.entity
+def serverPrefork():
+    b = server_prefork.PreforkServer()
+    b.serverVersion = server_version()
+    b.serverHost = server_host()
+    b.serverPort = server_port()
+    b.requestHandlerFactory = serverBasicRequestHandler()
+    b.assembly = assemblyServer()
+    b.allowChunked = server_allow_chunked()
+    b.listenSocket = serverPreforkSupervisor().socket
     return b
 
 # --------------------------------------------------------------------
@@ -57,7 +99,16 @@ def updateAssemblyServer():
 
 # --------------------------------------------------------------------
 
+@ioc.start(priority=ioc.PRIORITY_TOP)
+def forkPreforkWorkers():
+    # The workers are forked before the application starts any thread, only the workers continue the application start.
+    if server_type() == SERVER_PREFORK: server_prefork.start(serverPreforkSupervisor())
+
 @ioc.start
 def runServer():
-    if server_type() == 'basic':
+    if server_type() == SERVER_BASIC:
         Thread(name='HTTP server thread', target=server_basic.run, args=(serverBasic(),)).start()
+    elif server_type() == SERVER_PREFORK:
+        server = serverPrefork()
+        signal.signal(signal.SIGTERM, server.stop)  # The supervisor stops the workers with the terminate signal
+        Thread(name='HTTP server thread', target=server_prefork.run, args=(server,)).start()
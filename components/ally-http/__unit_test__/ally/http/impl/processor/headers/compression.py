@@ -0,0 +1,146 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the response content encoding.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import defines
+from ally.design.processor.context import Context
+from ally.design.processor.execution import Chain
+from ally.http.impl.processor.header import HeaderDecodeRequestHandler, \
+    HeaderEncodeResponseHandler
+from ally.http.impl.processor.headers.content_encoding import \
+    ContentEncodingHandler, ContentCompressed
+from ally.support.util_io import IInputStream
+from collections import Iterable
+from io import BytesIO
+import unittest
+import zlib
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    headers = defines(dict)
+
+class Response(Context):
+    headers = defines(dict)
+
+class ResponseContent(Context):
+    source = defines(IInputStream, Iterable)
+    length = defines(int)
+    type = defines(str)
+    encoding = defines(str)
+
+class Source(BytesIO):
+    '''
+    Stream that records the close.
+    '''
+    closed_ = False
+
+    def close(self):
+        self.closed_ = True
+        super().close()
+
+CONTENT = b'The content to compress ' * 100
+
+# --------------------------------------------------------------------
+
+class TestContentEncoding(unittest.TestCase):
+
+    def setUp(self):
+        decode, encode, handler = HeaderDecodeRequestHandler(), HeaderEncodeResponseHandler(), ContentEncodingHandler()
+        handler.minimumSize, handler.maximumBuffered = 100, 10000
+        for processor in (decode, encode, handler): ioc.initialize(processor)
+        assembly = Assembly('Test')
+        assembly.add(decode, encode, handler)
+        self.processing = assembly.create(request=Request, response=Response, responseCnt=ResponseContent)
+
+    def call(self, headers, source, length=None, responseHeaders=None, **responseCnt):
+        arg = self.processing.fillIn()
+        arg['request'].headers, arg['response'].headers = headers, responseHeaders
+        arg['responseCnt'].source, arg['responseCnt'].length = source, length
+        for name, value in responseCnt.items(): setattr(arg['responseCnt'], name, value)
+        Chain(self.processing).process(**arg).doAll()
+        return arg['response'].headers, arg['responseCnt']
+
+    def content(self, responseCnt):
+        if isinstance(responseCnt.source, IInputStream): return responseCnt.source.read()
+        return b''.join(responseCnt.source)
+
+    def testNegotiation(self):
+        for accept, encoding, wbits in (('gzip', 'gzip', 16 + zlib.MAX_WBITS), ('deflate', 'deflate', zlib.MAX_WBITS),
+                                        ('deflate;q=0.5, gzip;q=0.8', 'gzip', 16 + zlib.MAX_WBITS),
+                                        ('gzip;q=0, *', 'deflate', zlib.MAX_WBITS)):
+            headers, responseCnt = self.call({'Accept-Encoding': accept}, (CONTENT,), len(CONTENT))
+            self.assertEqual(encoding, headers['Content-Encoding'], accept)
+            content = self.content(responseCnt)
+            self.assertEqual(len(content), responseCnt.length)
+            self.assertEqual(CONTENT, zlib.decompress(content, wbits))
+
+        headers, responseCnt = self.call({'Accept-Encoding': 'gzip'}, Source(CONTENT))
+        self.assertEqual((None, 'gzip'), (responseCnt.length, headers['Content-Encoding']))
+        self.assertEqual(CONTENT, zlib.decompress(self.content(responseCnt), 16 + zlib.MAX_WBITS))
+
+    def testNotCompressed(self):
+        for accept in (None, 'gzip;q=0, deflate;q=0', 'br', 'identity'):
+            headers, responseCnt = self.call({'Accept-Encoding': accept} if accept else {}, (CONTENT,), len(CONTENT))
+            self.assertNotIn('Content-Encoding', headers, accept)
+            self.assertEqual(('Accept-Encoding', CONTENT), (headers['Vary'], self.content(responseCnt)))
+
+        headers, responseCnt = self.call({'Accept-Encoding': 'gzip'}, (CONTENT[:50],), 50)
+        self.assertEqual(({'Vary': 'Accept-Encoding'}, 50), (headers, responseCnt.length))
+
+        headers, responseCnt = self.call({'Accept-Encoding': 'gzip'}, (CONTENT,), len(CONTENT), type='image/png')
+        self.assertEqual({}, headers)
+
+    def testVary(self):
+        headers, _responseCnt = self.call({'Accept-Encoding': 'gzip'}, (CONTENT,), len(CONTENT),
+                                          {'Vary': 'Accept-Language'})
+        self.assertEqual('Accept-Language,Accept-Encoding', headers['Vary'])
+
+        headers, _responseCnt = self.call({'Accept-Encoding': 'gzip'}, (CONTENT,), len(CONTENT),
+                                          {'Vary': 'accept-encoding'})
+        self.assertEqual('accept-encoding', headers['Vary'])
+
+    def testEntityTag(self):
+        headers, _responseCnt = self.call({'Accept-Encoding': 'gzip'}, (CONTENT,), len(CONTENT), {'ETag': '"tag"'})
+        self.assertEqual('W/"tag"', headers['ETag'])
+        headers, _responseCnt = self.call({}, (CONTENT,), len(CONTENT), {'ETag': '"tag"'})
+        self.assertEqual('"tag"', headers['ETag'])
+
+    def testPrecompressed(self):
+        # The precompressed .gz sibling of a delivered file is provided with the encoding already set.
+        compressed = zlib.compress(CONTENT)
+        headers, responseCnt = self.call({'Accept-Encoding': 'gzip'}, Source(compressed), len(compressed),
+                                         encoding='gzip')
+        self.assertEqual(('gzip', 'Accept-Encoding'), (headers['Content-Encoding'], headers['Vary']))
+        self.assertEqual((compressed, len(compressed)), (self.content(responseCnt), responseCnt.length))
+
+    def testClose(self):
+        source = Source(CONTENT)
+        ContentCompressed(source, zlib.compressobj(), 10).close()
+        self.assertTrue(source.closed_)
+
+        source = Source(CONTENT)
+        content = ContentCompressed(source, zlib.compressobj(), 10)
+        content.read(5)
+        content.close()
+        self.assertTrue(source.closed_)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
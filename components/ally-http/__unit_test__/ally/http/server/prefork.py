@@ -0,0 +1,124 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the prefork server.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import defines
+from ally.design.processor.context import Context
+from ally.design.processor.handler import HandlerProcessorProceed
+from ally.http.server.server_prefork import PreforkSupervisor, PreforkServer, start, run
+from collections import Iterable
+from threading import Thread, Event
+import os
+import signal
+import socket
+import threading
+import time
+import unittest
+
+# --------------------------------------------------------------------
+
+class Response(Context):
+    status = defines(int)
+    headers = defines(dict)
+
+class ResponseContent(Context):
+    source = defines(Iterable)
+
+class Worker(HandlerProcessorProceed):
+    '''
+    Responds with the process id and the number of threads of the worker process.
+    '''
+    def process(self, response:Response, responseCnt:ResponseContent, **keyargs):
+        content = ('%s %s' % (os.getpid(), threading.active_count())).encode()
+        response.status, response.headers = 200, {'Content-Length': str(len(content))}
+        responseCnt.source = (content,)
+
+def request(address):
+    with socket.create_connection(address, timeout=5) as connection:
+        connection.sendall(b'GET / HTTP/1.0\r\n\r\n')
+        with connection.makefile('rb') as rfile: response = rfile.read()
+    # The status line position depends on how the python version buffers the headers, so only the content is checked.
+    pid, threads = response.split(b'\r\n\r\n', 1)[1].split()
+    return int(pid), int(threads)
+
+def application(supervisor):
+    '''
+    Starts the application like the setup does, the workers start a non daemon background thread after they are forked.
+    '''
+    start(supervisor)
+
+    Thread(target=Event().wait).start()
+
+    assembly = Assembly('Test')
+    assembly.add(Worker())
+    server = PreforkServer()
+    server.serverVersion, server.serverHost, server.serverPort = 'Test', '127.0.0.1', 0
+    server.assembly, server.allowChunked, server.pollInterval = assembly, False, 0.1
+    server.listenSocket = supervisor.socket
+    ioc.initialize(server)
+
+    signal.signal(signal.SIGTERM, server.stop)
+    run(server)
+
+# --------------------------------------------------------------------
+
+class TestPrefork(unittest.TestCase):
+
+    def testStartStop(self):
+        supervisor = PreforkSupervisor()
+        supervisor.serverHost, supervisor.serverPort = '127.0.0.1', 0
+        supervisor.workersCount, supervisor.pollInterval, supervisor.shutdownTimeout = 2, 0.1, 30.0
+        ioc.initialize(supervisor)
+        address = supervisor.socket.getsockname()
+
+        failed = []
+        def startInThread():
+            try: start(supervisor)
+            except AssertionError: failed.append(True)
+        starting = Thread(target=startInThread)
+        starting.start()
+        starting.join()
+        self.assertEqual([True], failed, 'The server is not allowed to fork from other thread then the main thread')
+
+        pid = os.fork()
+        if not pid:
+            try: application(supervisor)
+            finally: os._exit(1)  # Neither the supervisor nor the workers return from the application
+        supervisor.socket.close()
+
+        pidWorker, threads = request(address)
+        self.assertNotEqual(pid, pidWorker)
+        # The worker serves in its main thread and has the background thread started after the fork.
+        self.assertEqual(2, threads)
+
+        # A worker that dies is replaced by the supervisor.
+        os.kill(pidWorker, signal.SIGKILL)
+        time.sleep(0.5)
+        for _k in range(4): self.assertNotEqual(pidWorker, request(address)[0])
+
+        # The workers exit on stop even if they have non daemon threads, so they are not killed after the timeout.
+        stopAt = time.time()
+        os.kill(pid, signal.SIGTERM)
+        self.assertEqual((pid, 0), os.waitpid(pid, 0))
+        self.assertTrue(time.time() - stopAt < 5)
+        self.assertRaises(OSError, request, address)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -14,6 +14,7 @@ from ally.design.processor.attribute import requires, optional, defines
 from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
 from ally.http.spec.server import IDecoderHeader, IEncoderHeader
+from ally.support.util import CacheLRU
 from collections import deque, Iterable
 import re
 
@@ -30,15 +31,19 @@ class HeaderConfigurations:
     # The separator used between the attributes and value.
     separatorValue = '='
     # The separator used between attribute name and attribute value.
+    parsedCacheSize = 500
+    # The maximum number of distinct header values that are cached parsed, if 0 then the values are parsed every time.
 
     def __init__(self):
         assert isinstance(self.separatorMain, str), 'Invalid main separator %s' % self.separatorMain
         assert isinstance(self.separatorAttr, str), 'Invalid attribute separator %s' % self.separatorAttr
         assert isinstance(self.separatorValue, str), 'Invalid value separator %s' % self.separatorValue
+        assert isinstance(self.parsedCacheSize, int), 'Invalid parsed cache size %s' % self.parsedCacheSize
 
         self.reSeparatorMain = re.compile(self.separatorMain)
         self.reSeparatorAttr = re.compile(self.separatorAttr)
         self.reSeparatorValue = re.compile(self.separatorValue)
+        self.cacheParsed = CacheLRU(self.parsedCacheSize) if self.parsedCacheSize else None
 
 # --------------------------------------------------------------------
 
@@ -281,15 +286,41 @@ class DecoderHeader(IDecoderHeader):
         cfg = self.configuration
         assert isinstance(cfg, HeaderConfigurations)
 
+        if cfg.cacheParsed is not None:
+            assert isinstance(cfg.cacheParsed, CacheLRU)
+            values = cfg.cacheParsed.get(value)
+            if values is None:
+                values = self.parseValues(value)
+                cfg.cacheParsed.put(value, values)
+        else: values = self.parseValues(value)
+
         parsed = [] if parsed is None else parsed
+        # The attributes dictionaries are created for every parse since they are altered by the processors.
+        parsed.extend((val, dict(attributes)) for val, attributes in values)
+        return parsed
+
+    def parseValues(self, value):
+        '''
+        Parses the provided value into an immutable structure.
+        
+        @param value: string
+            The value to parse.
+        @return: tuple(tuple(string, tuple(tuple(string, string))))
+            The parsed values with the attributes as name and value tuples.
+        '''
+        assert isinstance(value, str), 'Invalid value %s' % value
+        cfg = self.configuration
+        assert isinstance(cfg, HeaderConfigurations)
+
+        parsed = []
         for values in cfg.reSeparatorMain.split(value):
             valAttr = cfg.reSeparatorAttr.split(values)
             attributes = {}
             for k in range(1, len(valAttr)):
                 val = cfg.reSeparatorValue.split(valAttr[k])
                 attributes[val[0].strip()] = val[1].strip().strip('"') if len(val) > 1 else None
-            parsed.append((valAttr[0].strip(), attributes))
-        return parsed
+            parsed.append((valAttr[0].strip(), tuple(attributes.items())))
+        return tuple(parsed)
 
     def readParameters(self, name):
         '''
@@ -0,0 +1,301 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the negotiated content encoding (compression) for the response content.
+'''
+
+from ally.container.ioc import injected
+from ally.design.processor.attribute import requires, optional, defines
+from ally.design.processor.context import Context
+from ally.design.processor.handler import HandlerProcessorProceed
+from ally.http.spec.server import IDecoderHeader, IEncoderHeader
+from ally.support.util_io import IInputStream, IClosable
+from collections import Iterable
+import zlib
+
+# --------------------------------------------------------------------
+
+ENCODING_GZIP = 'gzip'
+# The gzip content encoding name.
+ENCODING_DEFLATE = 'deflate'
+# The deflate content encoding name.
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    '''
+    The request context.
+    '''
+    # ---------------------------------------------------------------- Required
+    decoderHeader = requires(IDecoderHeader)
+
+class Response(Context):
+    '''
+    The response context.
+    '''
+    # ---------------------------------------------------------------- Required
+    encoderHeader = requires(IEncoderHeader)
+    # ---------------------------------------------------------------- Optional
+    headers = optional(dict)
+
+class ResponseContent(Context):
+    '''
+    The response content context.
+    '''
+    # ---------------------------------------------------------------- Required
+    source = requires(IInputStream, Iterable)
+    # ---------------------------------------------------------------- Optional
+    type = optional(str)
+    encoding = optional(str, doc='''
+    @rtype: string
+    The content encoding of the source, if provided then the source is already encoded (like a precompressed file).
+    ''')
+    # ---------------------------------------------------------------- Defined
+    length = defines(int)
+
+# --------------------------------------------------------------------
+
+@injected
+class ContentEncodingHandler(HandlerProcessorProceed):
+    '''
+    Implementation for a processor that compresses the response content with the encoding negotiated on the accept
+    encoding HTTP request header. The content is compressed as it is delivered, only the content that has a known length
+    small enough is compressed at once in order to keep the content length. The strong entity tag of a compressed content
+    is made weak since the entity tag is provided for the uncompressed content.
+    '''
+
+    nameAcceptEncoding = 'Accept-Encoding'
+    # The name for the accept encoding header.
+    nameContentEncoding = 'Content-Encoding'
+    # The name for the content encoding header.
+    nameVary = 'Vary'
+    # The name for the vary header.
+    nameETag = 'ETag'
+    # The name for the entity tag header.
+    attrQuality = 'q'
+    # The name of the accept encoding attribute that provides the quality.
+    encodings = [ENCODING_GZIP, ENCODING_DEFLATE]
+    # The supported encodings in the order of preference.
+    level = 6
+    # The compression level, from 1 (fastest) to 9 (smallest).
+    minimumSize = 1024
+    # The minimum content length in bytes for compressing, the content with an unknown length is always compressed.
+    maximumBuffered = 1024 * 1024
+    # The maximum content length in bytes that is compressed at once in order to provide the compressed length.
+    bufferSize = 10 * 1024
+    # The buffer size used for reading the content streams.
+    typesCompressible = ['text/', 'application/json', 'application/xml', 'application/javascript',
+                         'application/x-javascript', 'image/svg+xml']
+    # The content types prefixes that are compressed, the content without a type is also compressed.
+
+    def __init__(self):
+        assert isinstance(self.nameAcceptEncoding, str), 'Invalid accept encoding name %s' % self.nameAcceptEncoding
+        assert isinstance(self.nameContentEncoding, str), 'Invalid content encoding name %s' % self.nameContentEncoding
+        assert isinstance(self.nameVary, str), 'Invalid vary name %s' % self.nameVary
+        assert isinstance(self.nameETag, str), 'Invalid entity tag name %s' % self.nameETag
+        assert isinstance(self.attrQuality, str), 'Invalid quality attribute name %s' % self.attrQuality
+        assert isinstance(self.encodings, list), 'Invalid encodings %s' % self.encodings
+        assert isinstance(self.level, int) and 1 <= self.level <= 9, 'Invalid level %s' % self.level
+        assert isinstance(self.minimumSize, int), 'Invalid minimum size %s' % self.minimumSize
+        assert isinstance(self.maximumBuffered, int), 'Invalid maximum buffered size %s' % self.maximumBuffered
+        assert isinstance(self.bufferSize, int), 'Invalid buffer size %s' % self.bufferSize
+        assert isinstance(self.typesCompressible, list), 'Invalid compressible types %s' % self.typesCompressible
+        if __debug__:
+            for encoding in self.encodings:
+                assert encoding in COMPRESSORS, 'Unknown encoding %s' % encoding
+        super().__init__()
+
+        self._typesCompressible = tuple(self.typesCompressible)
+
+    def process(self, request:Request, response:Response, responseCnt:ResponseContent, **keyargs):
+        '''
+        @see: HandlerProcessorProceed.process
+
+        Compress the response content.
+        '''
+        assert isinstance(request, Request), 'Invalid request %s' % request
+        assert isinstance(response, Response), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContent), 'Invalid response content %s' % responseCnt
+        assert isinstance(request.decoderHeader, IDecoderHeader), 'Invalid decoder header %s' % request.decoderHeader
+        assert isinstance(response.encoderHeader, IEncoderHeader), 'Invalid encoder header %s' % response.encoderHeader
+
+        if responseCnt.source is None: return  # No content to compress
+        if ResponseContent.encoding in responseCnt and responseCnt.encoding:
+            # The content is already encoded
+            response.encoderHeader.encode(self.nameContentEncoding, responseCnt.encoding)
+            self.encodeVary(response)
+            return
+
+        if Response.headers in response and response.headers and self.nameContentEncoding in response.headers: return
+        if ResponseContent.type in responseCnt and responseCnt.type:
+            if not responseCnt.type.startswith(self._typesCompressible): return
+
+        # The response differs based on the accept encoding even if is not compressed.
+        self.encodeVary(response)
+        if responseCnt.length is not None and responseCnt.length < self.minimumSize: return
+
+        encoding = self.negotiate(request.decoderHeader.decode(self.nameAcceptEncoding))
+        if encoding is None: return
+
+        content = ContentCompressed(responseCnt.source, COMPRESSORS[encoding](self.level), self.bufferSize)
+        if responseCnt.length is not None and responseCnt.length <= self.maximumBuffered:
+            responseCnt.length = content.compressAll()
+        else: responseCnt.length = None
+
+        responseCnt.source = content
+        response.encoderHeader.encode(self.nameContentEncoding, encoding)
+        if Response.headers in response and response.headers:
+            eTag = response.headers.get(self.nameETag)
+            if eTag and not eTag.startswith('W/'): response.encoderHeader.encode(self.nameETag, 'W/%s' % eTag)
+
+    # ----------------------------------------------------------------
+
+    def negotiate(self, values):
+        '''
+        Negotiate the content encoding to use.
+
+        @param values: list[tuple(string, dictionary{string:string})]|None
+            The decoded accept encoding header values.
+        @return: string|None
+            The encoding to use, None if the content should not be compressed.
+        '''
+        if not values: return
+
+        qualities = {}
+        for value, attributes in values:
+            quality = attributes.get(self.attrQuality)
+            if quality is None: quality = 1.0
+            else:
+                try: quality = float(quality)
+                except ValueError: continue
+            qualities[value.lower()] = quality
+
+        selected, selectedQuality = None, 0
+        for encoding in self.encodings:
+            quality = qualities.get(encoding, qualities.get('*', 0))
+            if quality > selectedQuality: selected, selectedQuality = encoding, quality
+        return selected
+
+    def encodeVary(self, response):
+        '''
+        Encodes the vary header on the response for the accept encoding.
+
+        @param response: Response
+            The response to encode the vary header on.
+        '''
+        assert isinstance(response, Response), 'Invalid response %s' % response
+
+        if Response.headers in response and response.headers:
+            vary = response.headers.get(self.nameVary)
+            if vary:
+                if self.nameAcceptEncoding.lower() in vary.lower(): return
+                response.encoderHeader.encode(self.nameVary, vary, self.nameAcceptEncoding)
+                return
+        response.encoderHeader.encode(self.nameVary, self.nameAcceptEncoding)
+
+# --------------------------------------------------------------------
+
+COMPRESSORS = {
+               ENCODING_GZIP: lambda level: zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+               ENCODING_DEFLATE: lambda level: zlib.compressobj(level)
+               }
+# The compressors factories indexed by encoding name.
+
+class ContentCompressed(IInputStream, IClosable):
+    '''
+    Provides the compressed content for a source, the compressed content can be read as a stream or iterated.
+    '''
+    __slots__ = ('_source', '_chunks', '_buffer', '_closed')
+
+    def __init__(self, source, compressor, bufferSize):
+        '''
+        Construct the compressed content.
+
+        @param source: IInputStream|Iterable
+            The source of the content to compress.
+        @param compressor: zlib.Compress
+            The compressor to use.
+        @param bufferSize: integer
+            The buffer size used for reading the source stream.
+        '''
+        assert isinstance(source, (IInputStream, Iterable)), 'Invalid source %s' % source
+        assert isinstance(bufferSize, int), 'Invalid buffer size %s' % bufferSize
+
+        self._source = source
+        self._chunks = compressGenerator(source, compressor, bufferSize)
+        self._buffer = b''
+        self._closed = False
+
+    def compressAll(self):
+        '''
+        Compress all the content at once.
+
+        @return: integer
+            The compressed content length.
+        '''
+        self._buffer += b''.join(self._chunks)
+        return len(self._buffer)
+
+    def read(self, nbytes=None):
+        '''
+        @see: IInputStream.read
+        '''
+        if self._closed: raise ValueError('I/O operation on a closed content file')
+        if nbytes is None:
+            self.compressAll()
+            data, self._buffer = self._buffer, b''
+            return data
+
+        while len(self._buffer) < nbytes:
+            try: self._buffer += next(self._chunks)
+            except StopIteration: break
+        data, self._buffer = self._buffer[:nbytes], self._buffer[nbytes:]
+        return data
+
+    def close(self):
+        '''
+        @see: IClosable.close
+        '''
+        self._closed = True
+        self._chunks.close()
+        # The generator does not close the source if the compressing has not started.
+        if isinstance(self._source, IClosable): self._source.close()
+
+    def __iter__(self):
+        if self._buffer:
+            data, self._buffer = self._buffer, b''
+            yield data
+        for data in self._chunks: yield data
+
+def compressGenerator(source, compressor, bufferSize):
+    '''
+    Provides a generator that compresses the provided source.
+
+    @param source: IInputStream|Iterable
+        The source of the content to compress.
+    @param compressor: zlib.Compress
+        The compressor to use.
+    @param bufferSize: integer
+        The buffer size used for reading the source stream.
+    @return: Iterable(bytes)
+        The generator that provides the compressed data, without empty data blocks.
+    '''
+    if isinstance(source, IInputStream):
+        try:
+            while True:
+                data = source.read(bufferSize)
+                if not data: break
+                data = compressor.compress(data)
+                if data: yield data
+        finally:
+            if isinstance(source, IClosable): source.close()
+    else:
+        for data in source:
+            data = compressor.compress(data)
+            if data: yield data
+    yield compressor.flush()
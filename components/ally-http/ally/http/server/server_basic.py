@@ -15,7 +15,7 @@ from ally.design.processor.assembly import Assembly
 from ally.design.processor.execution import Processing, Chain
 from ally.http.spec.server import RequestHTTP, ResponseHTTP, RequestContentHTTP, \
     ResponseContentHTTP, HTTP_GET, HTTP_POST, HTTP_PUT, HTTP_DELETE, HTTP_OPTIONS, \
-    HTTP
+    HTTP, chunkedGenerator
 from ally.support.util_io import readGenerator, IInputStream
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qsl
@@ -32,6 +32,17 @@ class RequestHandler(BaseHTTPRequestHandler):
     The server class that handles the HTTP requests.
     '''
     
+    nameConnection = 'Connection'
+    # The name for the connection header
+    nameContentLength = 'Content-Length'
+    # The name for the content length header
+    nameTransferEncoding = 'Transfer-Encoding'
+    # The name for the transfer encoding header
+    valueChunked = 'chunked'
+    # The transfer encoding header value for chunked content
+    valueClose = 'close'
+    # The connection header value for closing connections
+    
     def __init__(self, request, address, server):
         '''
         Create the request.
@@ -91,8 +102,22 @@ class RequestHandler(BaseHTTPRequestHandler):
         assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
         assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
 
-        if ResponseHTTP.headers in response and response.headers is not None:
-            for name, value in response.headers.items(): self.send_header(name, value)
+        if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None:
+            if isinstance(responseCnt.source, IInputStream): source = readGenerator(responseCnt.source)
+            else: source = responseCnt.source
+        else: source = None
+
+        if ResponseHTTP.headers in response and response.headers is not None: headers = response.headers
+        else: headers = {}
+        for name, value in headers.items(): self.send_header(name, value)
+        
+        if source is not None and self.server.allowChunked and self.request_version == 'HTTP/1.1' \
+        and self.nameContentLength not in headers:
+            # The content is streamed as it is rendered, the connection is still closed after the response.
+            self.protocol_version = 'HTTP/1.1'
+            self.send_header(self.nameTransferEncoding, self.valueChunked)
+            self.send_header(self.nameConnection, self.valueClose)
+            source = chunkedGenerator(source)
 
         assert isinstance(response.status, int), 'Invalid response status code %s' % response.status
         if ResponseHTTP.text in response and response.text: text = response.text
@@ -101,10 +126,7 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.send_response(response.status, text)
         self.end_headers()
 
-        if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None:
-            if isinstance(responseCnt.source, IInputStream): source = readGenerator(responseCnt.source)
-            else: source = responseCnt.source
-
+        if source is not None:
             for bytes in source: self.wfile.write(bytes)
 
     # ----------------------------------------------------------------
@@ -134,6 +156,9 @@ class BasicServer(HTTPServer):
     # and client address.
     assembly = Assembly
     # The assembly used for resolving the requests
+    allowChunked = True
+    # Flag indicating that the response content without a length is delivered with the chunked transfer coding to the
+    # HTTP/1.1 clients.
     
     def __init__(self):
         '''
@@ -144,6 +169,7 @@ class BasicServer(HTTPServer):
         assert isinstance(self.serverPort, int), 'Invalid server port %s' % self.serverPort
         assert callable(self.requestHandlerFactory), 'Invalid request handler factory %s' % self.requestHandlerFactory
         assert isinstance(self.assembly, Assembly), 'Invalid assembly %s' % self.assembly
+        assert isinstance(self.allowChunked, bool), 'Invalid allow chunked flag %s' % self.allowChunked
         super().__init__((self.serverHost, self.serverPort), self.requestHandlerFactory)
 
         self.processing = self.assembly.create(request=RequestHTTP, requestCnt=RequestContentHTTP,
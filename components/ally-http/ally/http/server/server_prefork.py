@@ -0,0 +1,253 @@
+'''
+Created on Oct 16, 2026
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the prefork web server, the listen socket is created by the application main process that then becomes the
+supervisor of the worker processes. The workers are forked before the application starts any thread, each worker
+continues the application start on its own and serves the requests from the shared listen socket.
+'''
+
+from .server_basic import BasicServer
+from ally.container.ioc import injected
+from multiprocessing import cpu_count
+from socketserver import TCPServer
+import errno
+import logging
+import os
+import random
+import select
+import signal
+import socket
+import threading
+import time
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------
+
+@injected
+class PreforkSupervisor:
+    '''
+    The prefork supervisor, creates the listen socket and forks the worker processes, restarting the ones that die, on stop
+    it allows the workers to finish the requests in progress. The supervisor has a single thread so no worker inherits
+    locks held by other threads.
+    '''
+
+    serverHost = str
+    # The server address host
+    serverPort = int
+    # The server port
+    workersCount = 0
+    # The number of worker processes, if 0 the number of available CPUs is used.
+    pollInterval = 0.5
+    # The interval in seconds at which the supervisor checks for the stop signal.
+    shutdownTimeout = 10.0
+    # The seconds the workers have to finish the requests in progress before being killed.
+
+    def __init__(self):
+        '''
+        Construct the supervisor and the listen socket shared by the workers.
+        '''
+        assert isinstance(self.serverHost, str), 'Invalid server host %s' % self.serverHost
+        assert isinstance(self.serverPort, int), 'Invalid server port %s' % self.serverPort
+        assert isinstance(self.workersCount, int) and self.workersCount >= 0, \
+        'Invalid workers count %s' % self.workersCount
+        assert isinstance(self.pollInterval, float), 'Invalid poll interval %s' % self.pollInterval
+        assert isinstance(self.shutdownTimeout, float), 'Invalid shutdown timeout %s' % self.shutdownTimeout
+
+        if not self.workersCount: self.workersCount = cpu_count()
+        self.socket = socket.socket(TCPServer.address_family, TCPServer.socket_type)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((self.serverHost, self.serverPort))
+        self.socket.listen(TCPServer.request_queue_size)
+        self._workers = set()
+        self._stopping = False
+
+    def supervise(self):
+        '''
+        Forks the workers and supervises them until the supervisor is stopped.
+
+        @return: boolean
+            True if the calling process is a forked worker that needs to continue the application start, False in the
+            supervisor process after all the workers have stopped.
+        '''
+        for _k in range(self.workersCount):
+            if self._fork(): return True
+
+        killAt = None
+        while self._workers:
+            if self._stopping and killAt is None:
+                log.info('Stopping %s worker processes', len(self._workers))
+                self._signal(signal.SIGTERM)
+                killAt = time.time() + self.shutdownTimeout
+            elif killAt is not None and time.time() >= killAt:
+                log.warning('Killing %s worker processes that did not stop in time', len(self._workers))
+                self._signal(signal.SIGKILL)
+                killAt = float('inf')
+
+            try: pid, status = os.waitpid(-1, os.WNOHANG)
+            except OSError as e:
+                if e.errno == errno.EINTR: continue
+                if e.errno == errno.ECHILD: break
+                raise
+            if pid == 0:
+                time.sleep(self.pollInterval)
+                continue
+
+            self._workers.discard(pid)
+            if not self._stopping:
+                log.error('Worker process %s died with status %s, starting a new worker', pid, status)
+                if self._fork(): return True
+        return False
+
+    def stop(self, *args):
+        '''
+        Stops the supervisor, the method can be used directly as a signal handler.
+        '''
+        self._stopping = True
+
+    # ----------------------------------------------------------------
+
+    def _fork(self):
+        '''
+        Forks a new worker process.
+
+        @return: boolean
+            True if the calling process is the forked worker, False in the supervisor process.
+        '''
+        pid = os.fork()
+        if pid:
+            self._workers.add(pid)
+            return False
+
+        self._workers.clear()
+        # The worker is stopped by the server with the terminate signal, until then the default handling is used.
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # The interrupt is handled by the supervisor
+        random.seed()  # Otherwise all the workers generate the same random sequence
+        return True
+
+    def _signal(self, signum):
+        '''
+        Sends the signal to all the worker processes.
+        '''
+        for pid in self._workers:
+            try: os.kill(pid, signum)
+            except OSError: pass  # The worker is already gone
+
+@injected
+class PreforkServer(BasicServer):
+    '''
+    The prefork worker server, serves the requests from the listen socket created by the supervisor.
+    '''
+
+    listenSocket = socket.socket
+    # The listen socket created by the supervisor and shared by all the workers.
+    pollInterval = 0.5
+    # The interval in seconds at which the worker checks for the stop signal.
+
+    def __init__(self):
+        '''
+        Construct the worker server, the processing is created in the worker after the fork.
+        '''
+        assert isinstance(self.listenSocket, socket.socket), 'Invalid listen socket %s' % self.listenSocket
+        assert isinstance(self.pollInterval, float), 'Invalid poll interval %s' % self.pollInterval
+        super().__init__()
+
+        self._stopping = False
+
+    def server_bind(self):
+        '''
+        @see: HTTPServer.server_bind
+
+        Uses the listen socket of the supervisor instead of binding a new one.
+        '''
+        self.socket.close()
+        self.socket = self.listenSocket
+        self.server_address = self.socket.getsockname()
+        host, port = self.server_address[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+
+    def server_activate(self):
+        '''
+        @see: TCPServer.server_activate
+
+        The supervisor already listens on the socket.
+        '''
+
+    def serve(self):
+        '''
+        Serves the requests until the worker is stopped.
+        '''
+        # The listen socket is shared by all workers so the accept must not block if other worker got the connection.
+        self.socket.setblocking(False)
+        assert log.debug('Started worker process %s', os.getpid()) or True
+        while not self._stopping:
+            try: ready, _w, _e = select.select((self.socket,), (), (), self.pollInterval)
+            except select.error as e:
+                if e.args[0] == errno.EINTR: continue
+                raise
+            if ready: self._handle_request_noblock()
+
+    def stop(self, *args):
+        '''
+        Stops the worker server, the method can be used directly as a signal handler.
+        '''
+        self._stopping = True
+
+# --------------------------------------------------------------------
+
+def start(supervisor):
+    '''
+    Starts the prefork supervisor in the calling process, this function needs to be called from the main thread before
+    the application starts any other thread. The function returns only in the forked worker processes that need to continue
+    the application start, the supervisor process exits once all the workers have stopped.
+
+    @param supervisor: PreforkSupervisor
+        The supervisor to start.
+    '''
+    assert isinstance(supervisor, PreforkSupervisor), 'Invalid supervisor %s' % supervisor
+    assert isinstance(threading.current_thread(), threading._MainThread), 'The server can only be started in main thread'
+    if threading.active_count() > 1:
+        log.warning('The prefork workers are forked from a process with %s threads', threading.active_count())
+
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    signal.signal(signal.SIGINT, supervisor.stop)
+
+    code = 0
+    try:
+        log.info('=' * 50 + ' Started prefork HTTP server with %s workers...' % supervisor.workersCount)
+        if supervisor.supervise(): return
+        log.info('=' * 50 + ' All workers stopped, shutting down server')
+    except:
+        log.exception('=' * 50 + ' The server has stooped')
+        code = 1
+    # Only the workers continue the application start, the supervisor exits without waiting for other threads.
+    try: supervisor.socket.close()
+    except: pass
+    os._exit(code)
+
+def run(server):
+    '''
+    Run the prefork worker server in the calling thread, the worker process exits once the server is stopped.
+
+    @param server: PreforkServer
+        The server to run.
+    '''
+    assert isinstance(server, PreforkServer), 'Invalid server %s' % server
+
+    code = 0
+    try: server.serve()
+    except:
+        log.exception('A problem occurred in worker process %s', os.getpid())
+        code = 1
+    try: server.server_close()
+    except: pass
+    os._exit(code)
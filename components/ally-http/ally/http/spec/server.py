@@ -190,3 +190,21 @@ class IEncoderPath(metaclass=abc.ABCMeta):
         @return: string
             The path pattern.
         '''
+
+# --------------------------------------------------------------------
+
+def chunkedGenerator(source):
+    '''
+    Frames the provided content source with the HTTP/1.1 chunked transfer coding, the empty data blocks are skipped since
+    an empty chunk marks the end of the content.
+    
+    @param source: Iterable(bytes)
+        The content source to frame.
+    @return: Iterable(bytes)
+        The generator that provides the chunks.
+    '''
+    assert isinstance(source, Iterable), 'Invalid source %s' % source
+    
+    for data in source:
+        if data: yield b''.join((('%x\r\n' % len(data)).encode('ascii'), data, b'\r\n'))
+    yield b'0\r\n\r\n'
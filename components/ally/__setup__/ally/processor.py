@@ -0,0 +1,36 @@
+'''
+Created on Oct 16, 2026
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the processors configurations.
+'''
+
+from ally.container import ioc
+from ally.design.processor.profile import Profiler
+
+# --------------------------------------------------------------------
+
+@ioc.config
+def compiled_processing() -> bool:
+    '''
+    Flag indicating that the processings created by the assemblies are compiled, this means that the consecutive processors
+    that automatically proceed the chain are executed in a single generated call
+    '''
+    return False
+
+@ioc.config
+def profile_processing() -> bool:
+    '''
+    Flag indicating that the processings created by the assemblies are instrumented in order to record the duration of
+    each processor call, the recorded durations are available in the processors profile
+    '''
+    return False
+
+# --------------------------------------------------------------------
+
+@ioc.entity
+def processingProfiler() -> Profiler: return Profiler()
@@ -0,0 +1,112 @@
+'''
+Created on Oct 16, 2026
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the compiled processing execution.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import defines, requires, optional
+from ally.design.processor.context import Context
+from ally.design.processor.execution import Chain
+from ally.design.processor.handler import HandlerProcessorProceed, \
+    HandlerProcessor
+from ally.design.processor.profile import Profiler, Histogram
+import unittest
+
+# --------------------------------------------------------------------
+
+class Data(Context):
+    trace = defines(list)
+    error = defines(bool)
+
+class DataError(Context):
+    trace = requires(list)
+    error = optional(bool)
+
+class Start(HandlerProcessorProceed):
+    def process(self, data:Data, **keyargs):
+        data.trace = ['start']
+
+class Step(HandlerProcessorProceed):
+    def __init__(self, name):
+        self.name = name
+        super().__init__()
+    def process(self, data:DataError, **keyargs):
+        if data.error and self.name == 'fail': raise ValueError()
+        data.trace.append(self.name)
+
+class Stop(HandlerProcessor):
+    def process(self, chain, data:DataError, **keyargs):
+        data.trace.append('stop')
+
+def assemblyFor(compiled, profiler=None):
+    assembly = Assembly('Test')
+    assembly.compiled = compiled
+    assembly.profiler = profiler
+    assembly.add(Start(), Step('a'), Step('fail'), Step('b'), Stop(), Step('c'))
+    return assembly
+
+# --------------------------------------------------------------------
+
+class TestExecution(unittest.TestCase):
+
+    def testCompiled(self):
+        for compiled in (False, True):
+            proc = assemblyFor(compiled).create(data=Data)
+            data = proc.ctx.data()
+            Chain(proc).process(data=data).doAll()
+            self.assertEqual(data.trace, ['start', 'a', 'fail', 'b', 'stop'])
+        
+        self.assertEqual(len(assemblyFor(False).create(data=Data).calls), 6)
+        self.assertEqual(len(assemblyFor(True).create(data=Data).calls), 3)
+        
+    def testCompiledResume(self):
+        proc = assemblyFor(True).create(data=Data)
+        data = proc.ctx.data()
+        data.error = True
+        chain = Chain(proc)
+        chain.process(data=data)
+        chain.callBackError(lambda: chain.proceed())
+        chain.doAll()
+        self.assertEqual(data.trace, ['start', 'a', 'b', 'stop'])
+        
+    def testProfiled(self):
+        profiler = Profiler()
+        proc = assemblyFor(False, profiler).create(data=Data)
+        for _k in range(10): Chain(proc).process(data=proc.ctx.data()).doAll()
+        
+        self.assertEqual(profiler.names(), ['Test'])
+        histograms = profiler.histograms('Test')
+        self.assertEqual(set(histograms), {'Start.process', 'Step.process', 'Stop.process'})
+        self.assertEqual(histograms['Start.process'].count, 10)
+        self.assertEqual(histograms['Step.process'].count, 30)
+        self.assertEqual(histograms['Stop.process'].count, 10)
+        
+        self.assertTrue(profiler.reset('Test'))
+        self.assertEqual(histograms['Step.process'].count, 0)
+        self.assertFalse(profiler.reset('Unknown'))
+        
+    def testHistogram(self):
+        histogram = Histogram()
+        for k in range(1, 101): histogram.record(k / 1000)
+        
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.percentile(50), 0.050, delta=0.050 / Histogram.divisions)
+        self.assertAlmostEqual(histogram.percentile(99), 0.099, delta=0.099 / Histogram.divisions)
+        self.assertEqual(histogram.percentile(100), 0.1)
+        
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
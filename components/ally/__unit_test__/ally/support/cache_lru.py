@@ -0,0 +1,48 @@
+'''
+Created on Oct 17, 2026
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Testing for the least recently used cache.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.support.util import CacheLRU
+import unittest
+
+# --------------------------------------------------------------------
+
+class TestCacheLRU(unittest.TestCase):
+
+    def testCache(self):
+        cache = CacheLRU(2)
+
+        self.assertIsNone(cache.put('a', 1))
+        self.assertIsNone(cache.put('b', 2))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.put('c', 3), ('b', 2))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.put('a', 4), None)
+        self.assertEqual(cache.put('d', 5), ('c', 3))
+        self.assertEqual((cache.get('a'), cache.get('d')), (4, 5))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertEqual(cache.hitRate(), 0.75)
+
+        self.assertEqual(cache.pop('a'), 4)
+        self.assertIsNone(cache.pop('a'))
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
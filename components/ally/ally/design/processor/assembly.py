@@ -41,6 +41,11 @@ class Assembly(Container):
     The assembly provides a container for the processors.
     '''
     
+    compiled = False
+    # Flag indicating that the processing created by the assembly should be compiled, @see: Processing.compile.
+    profiler = None
+    # The profiler used for instrumenting the processing created by the assembly, @see: Processing.instrument.
+    
     def __init__(self, name):
         '''
         Constructs the assembly.
@@ -134,6 +139,7 @@ class Assembly(Container):
         resolvers.validate()
         resolvers.solve(extensions)
         processing = Processing(calls, create(resolvers))
+        self.prepare(processing)
         reportAss = report.open('Assembly \'%s\'' % self.name)
         reportAss.add(resolvers)
         
@@ -142,6 +148,21 @@ class Assembly(Container):
         else: log.info('Nothing to report for \'%s\', everything fits nicely', self.name)
         return processing
 
+    def prepare(self, processing):
+        '''
+        Prepares the provided processing that has been created for this assembly, this means compiling and instrumenting
+        the processing if is the case.
+        
+        @param processing: Processing
+            The processing to prepare.
+        @return: Processing
+            The prepared processing.
+        '''
+        assert isinstance(processing, Processing), 'Invalid processing %s' % processing
+        if self.compiled: processing.compile()
+        if self.profiler is not None: processing.instrument(self.profiler, self.name)
+        return processing
+
     # ----------------------------------------------------------------
 
     def _processorFrom(self, processor):
@@ -9,6 +9,7 @@ Created on Feb 11, 2013
 Contains the classes used in the execution of processors.
 '''
 
+from .profile import Profiler, Timed, nameFor
 from .spec import ContextMetaClass
 from collections import Iterable, deque
 import logging
@@ -87,6 +88,33 @@ class Processing:
         self.ctx.__dict__.update(contexts)
         return self
     
+    def compile(self):
+        '''
+        Compiles the calls of this processing, the consecutive calls of processors that automatically proceed the chain are
+        fused in a single generated call, @see: fuse.
+        
+        @return: this processing
+            This processing for chaining purposes.
+        '''
+        self._calls = fuse(self._calls)
+        return self
+    
+    def instrument(self, profiler, name):
+        '''
+        Instruments the calls of this processing in order to record the duration of each call in the provided profiler,
+        if the processing is also compiled then the compiling needs to be done before instrumenting.
+        
+        @param profiler: Profiler
+            The profiler to record the durations in.
+        @param name: string
+            The name of the profile to record in, usually the assembly name.
+        @return: this processing
+            This processing for chaining purposes.
+        '''
+        assert isinstance(profiler, Profiler), 'Invalid profiler %s' % profiler
+        self._calls = [Timed(call, profiler.histogramFor(name, nameFor(call))) for call in self._calls]
+        return self
+    
     def fillIn(self, **keyargs):
         '''
         Updates the provided arguments with the rest of the contexts that this processing has. The fill in process is done
@@ -289,3 +317,97 @@ class Chain:
             the execution of the other processors.
         '''
         return self._consumed
+
+# --------------------------------------------------------------------
+
+class Proceed:
+    '''
+    The call for processors that automatically proceed the chain after the processor function is executed.
+    '''
+    __slots__ = ('call', 'names')
+    
+    def __init__(self, call, names=None):
+        '''
+        Construct the proceed call.
+        
+        @param call: callable
+            The processor function.
+        @param names: tuple(string)|None
+            The arguments names of the processor function in the order of definition, if provided it means that the call
+            can be fused with other proceed calls, @see: fuse.
+        '''
+        assert callable(call), 'Invalid call %s' % call
+        assert names is None or isinstance(names, tuple), 'Invalid names %s' % names
+        self.call = call
+        self.names = names
+        
+    def __call__(self, chain, **keyargs):
+        '''
+        Calls the processor function and proceeds the chain.
+        '''
+        assert isinstance(chain, Chain), 'Invalid processors chain %s' % chain
+        self.call(**keyargs)
+        chain.proceed()
+        
+    def __str__(self):
+        return '%s for %s' % (self.__class__.__name__, self.call)
+
+def fuse(calls):
+    '''
+    Fuses the consecutive proceed calls that have known arguments names into a single generated call that receives the 
+    arguments by name and calls the processors functions with positional arguments, this way the chain executes only one
+    call instead of each processor call. The other calls, like the ones that branch or stop the chain, are left as they are.
+    If a fused processor function raises an exception the not executed proceed calls are put back in the chain so the chain
+    can resume the execution if the error is handled.
+    
+    @param calls: Iterable(callable)
+        The calls to fuse.
+    @return: list[callable]
+        The fused calls.
+    '''
+    assert isinstance(calls, Iterable), 'Invalid calls %s' % calls
+    
+    fused, group = [], []
+    for call in calls:
+        if isinstance(call, Proceed) and call.names is not None:
+            group.append(call)
+            continue
+        if group:
+            fused.append(fuseProceeds(group))
+            group = []
+        fused.append(call)
+    if group: fused.append(fuseProceeds(group))
+    
+    return fused
+
+def fuseProceeds(proceeds):
+    '''
+    Fuses the provided proceed calls, @see: fuse.
+    
+    @param proceeds: list[Proceed]
+        The proceed calls to fuse.
+    @return: callable
+        The fused call.
+    '''
+    assert isinstance(proceeds, list), 'Invalid proceeds %s' % proceeds
+    if len(proceeds) == 1: return proceeds[0]
+    
+    names, namespace = [], dict(_proceeds=tuple(proceeds))
+    body = ['    _k = 0', '    try:']
+    for k, proceed in enumerate(proceeds):
+        assert isinstance(proceed, Proceed), 'Invalid proceed %s' % proceed
+        for name in proceed.names:
+            if name not in names: names.append(name)
+        namespace['_call%s' % k] = proceed.call
+        if k: body.append('        _k = %s' % k)
+        body.append('        _call%s(%s)' % (k, ', '.join(proceed.names)))
+    body.append('    except:')
+    body.append('        _chain._calls.extendleft(reversed(_proceeds[_k + 1:]))')
+    body.append('        raise')
+    body.append('    _chain.proceed()')
+    
+    header = 'def fused(_chain, %s**_keyargs):' % ''.join('%s, ' % name for name in names)
+    exec('\n'.join([header] + body), namespace)
+    fused = namespace['fused']
+    fused.__qualname__ = ' + '.join(nameFor(proceed) for proceed in proceeds)
+    return fused
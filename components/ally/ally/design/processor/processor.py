@@ -11,7 +11,7 @@ Module containing processors.
 
 from .assembly import Assembly, Container
 from .context import create, createDefinition
-from .execution import Chain, Processing
+from .execution import Processing, Proceed
 from .spec import AssemblyError, IProcessor, ContextMetaClass, ProcessorError, \
     Resolvers, IReport, ResolverError
 from ally.support.util_sys import locationStack
@@ -164,11 +164,10 @@ class Contextual(Processor):
             The wrapped call.
         '''
         if self.proceed:
-            def wrapper(chain, **keyargs):
-                assert isinstance(chain, Chain), 'Invalid processors chain %s' % chain
-                call(**keyargs)
-                chain.proceed()
-            return wrapper
+            if call is not self.function: return Proceed(call)
+            fnArgs = getfullargspec(call)
+            if fnArgs.varargs or fnArgs.defaults or fnArgs.kwonlyargs: return Proceed(call)
+            return Proceed(call, tuple(fnArgs.args[1:]))
         return call
     
     # ----------------------------------------------------------------
@@ -320,10 +319,12 @@ class Routing(IBranch):
             if self.merged:
                 assert isinstance(extensions, Resolvers), 'Invalid extensions %s' % extensions
                 extensions.merge(rresolvs)
-                return Processing(calls)
-            
-            report.add(rresolvs)
-            return Processing(calls, create(rresolvs))
+                processing = Processing(calls)
+            else:
+                report.add(rresolvs)
+                processing = Processing(calls, create(rresolvs))
+            self.assembly.prepare(processing)
+            return processing
         except ResolverError:
             raise AssemblyError('Resolvers problems on Routing for %s\n, with processors %s\n'
                                 ', and extensions %s' % (self.assembly.name, rresolvs, rextens))
@@ -384,7 +385,9 @@ class Using(IBranch):
             uresolvs.validate()
             uresolvs.solve(uextens)
             report.add(uresolvs)
-            return Processing(calls, create(uresolvs))
+            processing = Processing(calls, create(uresolvs))
+            self.assembly.prepare(processing)
+            return processing
         except ResolverError:
             raise AssemblyError('Resolvers problems on Using for %s\n, with sources %s\n, with processors %s\n'
                                 ', and extensions %s' % (self.assembly.name, usrcs, uresolvs, uextens))
@@ -454,7 +457,9 @@ class Included(IBranch):
             iresolvs.solve(processor.contexts)
             resolvers.merge(iresolvs)
             extensions.solve(iextens)
-            return Processing(calls, contexts=contexts)
+            processing = Processing(calls, contexts=contexts)
+            self.assembly.prepare(processing)
+            return processing
         
         except (ResolverError, AssemblyError): raise AssemblyError('Cannot process Included for %s' % self.assembly.name)
     
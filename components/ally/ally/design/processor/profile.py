@@ -0,0 +1,220 @@
+'''
+Created on Oct 16, 2026
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the timing instrumentation for the processors calls.
+'''
+
+from math import frexp
+from threading import Lock
+import time
+
+# --------------------------------------------------------------------
+
+class Histogram:
+    '''
+    A low overhead histogram for durations, the durations are counted in logarithmic buckets (each power of two of micro
+    seconds is split in a fixed number of sub buckets) so recording is just an index calculation and a counter increment.
+    The percentiles are approximated with the upper limit of the bucket that contains them.
+    !!! Attention the recording is not locked, concurrent recordings might rarely loose a count which is acceptable for
+    profiling purposes.
+    '''
+    __slots__ = ('count', 'total', 'maximum', '_buckets')
+
+    divisions = 8
+    # The number of sub buckets for each power of two.
+    powers = 40
+    # The number of powers of two covered by the histogram, this means durations up to about 12 days in micro seconds.
+
+    def __init__(self):
+        '''
+        Construct the histogram.
+        '''
+        self.reset()
+
+    def reset(self):
+        '''
+        Resets the histogram counts.
+        '''
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self._buckets = [0] * (self.divisions * self.powers)
+
+    def record(self, elapsed):
+        '''
+        Record a duration.
+
+        @param elapsed: float
+            The duration in seconds.
+        '''
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.maximum: self.maximum = elapsed
+
+        mantissa, exponent = frexp(elapsed * 1000000)
+        if exponent <= 0: index = 0
+        else: index = min((exponent - 1) * self.divisions + int((mantissa - 0.5) * 2 * self.divisions),
+                          len(self._buckets) - 1)
+        self._buckets[index] += 1
+
+    def percentile(self, percent):
+        '''
+        Provides the approximated duration for the provided percentile.
+
+        @param percent: integer|float
+            The percentile to provide the duration for, a value between 0 and 100.
+        @return: float
+            The approximated duration in seconds, 0 if there are no recordings.
+        '''
+        assert isinstance(percent, (int, float)) and 0 <= percent <= 100, 'Invalid percent %s' % percent
+        if not self.count: return 0.0
+
+        rank, counted = self.count * percent / 100, 0
+        for index, count in enumerate(self._buckets):
+            counted += count
+            if counted >= rank and counted: break
+
+        exponent, division = divmod(index + 1, self.divisions)
+        return min((2 ** exponent) * (1 + division / self.divisions) / 1000000, self.maximum)
+
+class Profiler:
+    '''
+    Provides the histograms for the profiled calls grouped by name (usually the assembly name).
+    '''
+
+    def __init__(self):
+        '''
+        Construct the profiler.
+        '''
+        self._profiles = {}
+        self._lock = Lock()
+
+    def histogramFor(self, name, key):
+        '''
+        Provides the histogram for the provided name and key, if there is no histogram one will be created.
+
+        @param name: string
+            The name of the profile, usually the assembly name.
+        @param key: string
+            The key of the histogram in the profile, usually the processor name.
+        @return: Histogram
+            The histogram.
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert isinstance(key, str), 'Invalid key %s' % key
+        with self._lock:
+            histograms = self._profiles.get(name)
+            if histograms is None: histograms = self._profiles[name] = {}
+            histogram = histograms.get(key)
+            if histogram is None: histogram = histograms[key] = Histogram()
+        return histogram
+
+    def record(self, name, key, elapsed):
+        '''
+        Record a duration for the provided name and key.
+
+        @param name: string
+            The name of the profile.
+        @param key: string
+            The key of the histogram in the profile.
+        @param elapsed: float
+            The duration in seconds.
+        '''
+        histograms = self._profiles.get(name)
+        if histograms is not None: histogram = histograms.get(key)
+        else: histogram = None
+        if histogram is None: histogram = self.histogramFor(name, key)
+        histogram.record(elapsed)
+
+    def names(self):
+        '''
+        Provides the profiles names.
+
+        @return: list[string]
+            The sorted profiles names.
+        '''
+        with self._lock: return sorted(self._profiles)
+
+    def histograms(self, name):
+        '''
+        Provides the histograms for the profile name.
+
+        @param name: string
+            The name of the profile.
+        @return: dictionary{string: Histogram}|None
+            The histograms indexed by key, None if there is no profile for name.
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        with self._lock:
+            histograms = self._profiles.get(name)
+            if histograms is not None: return dict(histograms)
+
+    def reset(self, name=None):
+        '''
+        Resets the histograms, the histograms are kept in order for the already instrumented calls to continue recording.
+
+        @param name: string|None
+            The name of the profile to reset, if None all profiles are reset.
+        @return: boolean
+            True if a profile has been reset, False otherwise.
+        '''
+        assert name is None or isinstance(name, str), 'Invalid name %s' % name
+        with self._lock:
+            if name is None: profiles = list(self._profiles.values())
+            elif name in self._profiles: profiles = [self._profiles[name]]
+            else: return False
+            for histograms in profiles:
+                for histogram in histograms.values(): histogram.reset()
+        return True
+
+# --------------------------------------------------------------------
+
+class Timed:
+    '''
+    Wraps a chain call and records the call duration in a histogram.
+    '''
+    __slots__ = ('call', 'histogram')
+
+    def __init__(self, call, histogram):
+        '''
+        Construct the timed call.
+
+        @param call: callable
+            The chain call to be timed.
+        @param histogram: Histogram
+            The histogram to record the durations in.
+        '''
+        assert callable(call), 'Invalid call %s' % call
+        assert isinstance(histogram, Histogram), 'Invalid histogram %s' % histogram
+        self.call = call
+        self.histogram = histogram
+
+    def __call__(self, chain, **keyargs):
+        '''
+        Calls the wrapped call and records the duration, also for failed calls.
+        '''
+        start = time.time()
+        try: self.call(chain, **keyargs)
+        finally: self.histogram.record(time.time() - start)
+
+    def __str__(self):
+        return '%s for %s' % (self.__class__.__name__, self.call)
+
+def nameFor(call):
+    '''
+    Provides the name to be used in profiling for the provided chain call.
+
+    @param call: callable
+        The call to provide the name for.
+    @return: string
+        The name of the call.
+    '''
+    assert callable(call), 'Invalid call %s' % call
+    call = getattr(call, 'call', call)
+    if hasattr(call, '__self__'): return '%s.%s' % (call.__self__.__class__.__name__, call.__name__)
+    return getattr(call, '__qualname__', None) or getattr(call, '__name__', None) or call.__class__.__name__
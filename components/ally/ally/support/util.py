@@ -9,8 +9,9 @@ Created on Jun 9, 2011
 Provides implementations that provide general behavior or functionality.
 '''
 
-from collections import Iterable, Iterator, namedtuple
+from collections import Iterable, Iterator, namedtuple, OrderedDict
 from inspect import isclass, isfunction
+from threading import Lock
 from weakref import WeakKeyDictionary
 import sys
 
@@ -186,6 +187,100 @@ class immut(dict):
         except AttributeError: self.__hash__value = hash(tuple(p for p in self.items()))
         return self.__hash__value
 
+class CacheLRU:
+    '''
+    Provides a thread safe least recently used cache, once the maximum size is reached the least recently used value is
+    discarded in order to make room for the new value.
+    '''
+    __slots__ = ('size', 'hits', 'misses', '_values', '_lock')
+
+    def __init__(self, size):
+        '''
+        Construct the cache.
+        
+        @param size: integer
+            The maximum number of cached values.
+        @ivar hits: integer
+            The number of values provided from the cache.
+        @ivar misses: integer
+            The number of keys that had no value cached.
+        '''
+        assert isinstance(size, int) and size > 0, 'Invalid size %s' % size
+        self.size = size
+        self.hits = self.misses = 0
+
+        self._values = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        '''
+        Provides the cached value for the key, the key becomes the most recently used.
+        
+        @param key: object
+            The key of the value.
+        @return: object|None
+            The cached value or None if there is no value cached for the key.
+        '''
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                self.misses += 1
+                return
+            self._values.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        '''
+        Caches the value.
+        
+        @param key: object
+            The key of the value.
+        @param value: object
+            The value to cache, not None.
+        @return: tuple(object, object)|None
+            The key and value that have been discarded in order to make room for the value, None if no value has been
+            discarded.
+        '''
+        assert value is not None, 'A value is required'
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            if len(self._values) > self.size: return self._values.popitem(last=False)
+
+    def pop(self, key):
+        '''
+        Removes the cached value for the key.
+        
+        @param key: object
+            The key of the value.
+        @return: object|None
+            The removed value or None if there is no value cached for the key.
+        '''
+        with self._lock: return self._values.pop(key, None)
+
+    def clear(self):
+        '''
+        Removes all the cached values.
+        '''
+        with self._lock: self._values.clear()
+
+    def hitRate(self):
+        '''
+        Provides the rate of the values provided from the cache.
+        
+        @return: float
+            The hit rate, a value between 0 and 1.
+        '''
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self):
+        '''
+        Provides the number of cached values.
+        '''
+        return len(self._values)
+
 def firstOf(coll):
     '''
     Provides the first element from the provided collection.
@@ -9,8 +9,10 @@ Created on Jan 5, 2012
 Provides the configurations for delivering files from the local file system.
 '''
 
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ..ally_http.processor import contentLengthEncode, allowEncode, \
-    internalError, contentTypeResponseEncode
+    internalError, contentTypeResponseEncode, headerDecodeRequest, contentEncoding
 from __setup__.ally_http.processor import headerEncodeResponse
 from ally.container import ioc
 from ally.core.cdm.processor.content_delivery import ContentDeliveryHandler
@@ -41,12 +43,15 @@ def assemblyContent() -> Assembly:
     '''
     The assembly containing the handlers that will be used in processing a content file request.
     '''
-    return Assembly('CDM')
+    b = Assembly('CDM')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 # --------------------------------------------------------------------
 
 @ioc.before(assemblyContent)
 def updateAssemblyContent():
-    assemblyContent().add(internalError(), headerEncodeResponse(), contentDelivery(), allowEncode(), contentTypeResponseEncode(),
-                          contentLengthEncode())
+    assemblyContent().add(internalError(), headerDecodeRequest(), headerEncodeResponse(), contentDelivery(), allowEncode(),
+                          contentTypeResponseEncode(), contentEncoding(), contentLengthEncode())
     
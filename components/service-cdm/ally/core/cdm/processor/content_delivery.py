@@ -10,12 +10,13 @@ Provides the content delivery handler.
 '''
 
 from ally.container.ioc import injected
-from ally.design.processor.attribute import requires, defines
+from ally.design.processor.attribute import requires, defines, optional
 from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
 from ally.http.spec.codes import METHOD_NOT_AVAILABLE, PATH_NOT_FOUND, \
     PATH_FOUND
-from ally.http.spec.server import HTTP_GET
+from ally.http.impl.processor.headers.content_encoding import ENCODING_GZIP
+from ally.http.spec.server import HTTP_GET, IDecoderHeader
 from ally.support.util_io import IInputStream
 from ally.zip.util_zip import normOSPath, normZipPath
 from mimetypes import guess_type
@@ -40,6 +41,8 @@ class Request(Context):
     scheme = requires(str)
     uri = requires(str)
     method = requires(str)
+    # ---------------------------------------------------------------- Optional
+    decoderHeader = optional(IDecoderHeader)
 
 class Response(Context):
     '''
@@ -71,6 +74,10 @@ class ResponseContent(Context):
     @rtype: string
     The type for the streamed content.
     ''')
+    encoding = defines(str, doc='''
+    @rtype: string
+    The encoding of the streamed content, provided if a precompressed file is delivered.
+    ''')
 
 # --------------------------------------------------------------------
 
@@ -90,10 +97,18 @@ class ContentDeliveryHandler(HandlerProcessorProceed):
     # Marker used in the link file to indicate that a link is inside a zip file.
     _fsHeader = 'FS'
     # Marker used in the link file to indicate that a link is file system
+    compressedExt = '.gz'
+    # Extension of the precompressed (gzip) files that are delivered instead of the file, if the client accepts gzip,
+    # if None the precompressed files are not used.
+    nameAcceptEncoding = 'Accept-Encoding'
+    # The name for the accept encoding header.
 
     def __init__(self):
         assert isinstance(self.repositoryPath, str), 'Invalid repository path value %s' % self.repositoryPath
         assert isinstance(self.defaultContentType, str), 'Invalid default content type %s' % self.defaultContentType
+        assert self.compressedExt is None or isinstance(self.compressedExt, str), \
+        'Invalid compressed extension %s' % self.compressedExt
+        assert isinstance(self.nameAcceptEncoding, str), 'Invalid accept encoding name %s' % self.nameAcceptEncoding
         self.repositoryPath = normpath(self.repositoryPath)
         if not os.path.exists(self.repositoryPath): os.makedirs(self.repositoryPath)
         assert isdir(self.repositoryPath) and os.access(self.repositoryPath, os.R_OK), \
@@ -126,7 +141,10 @@ class ContentDeliveryHandler(HandlerProcessorProceed):
                 # This will be set upon successful file open
                 rf = None
                 if isfile(entryPath):
-                    rf, size = open(entryPath, 'rb'), os.path.getsize(entryPath)
+                    if self.compressedExt and isfile(entryPath + self.compressedExt) and self._isGzipAccepted(request):
+                        rf, size = open(entryPath + self.compressedExt, 'rb'), os.path.getsize(entryPath + self.compressedExt)
+                        responseCnt.encoding = ENCODING_GZIP
+                    else: rf, size = open(entryPath, 'rb'), os.path.getsize(entryPath)
                 else:
                     linkPath = entryPath
                     while len(linkPath) > len(self.repositoryPath):
@@ -191,6 +209,20 @@ class ContentDeliveryHandler(HandlerProcessorProceed):
         if resPath in zipFile.NameToInfo:
             return zipFile.open(resPath, 'r'), zipFile.getinfo(resPath).file_size
 
+    def _isGzipAccepted(self, request):
+        '''
+        Checks if the request accepts the gzip content encoding.
+        '''
+        assert isinstance(request, Request), 'Invalid request %s' % request
+        if Request.decoderHeader not in request or request.decoderHeader is None: return False
+        assert isinstance(request.decoderHeader, IDecoderHeader), 'Invalid decoder header %s' % request.decoderHeader
+
+        for value, attributes in request.decoderHeader.decode(self.nameAcceptEncoding) or ():
+            if value.lower() != ENCODING_GZIP: continue
+            try: return float(attributes.get('q', 1)) > 0
+            except ValueError: return False
+        return False
+
     def _isPathDeleted(self, path):
         '''
         Returns true if the given path was deleted or was part of a directory
@@ -9,6 +9,8 @@ Created on Jan 5, 2012
 Provides the configurations for delivering files from the local file system.
 '''
 
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ..ally_gateway.processor import assemblyGateway, \
     gatewayAuthorizedRepository, assemblyRESTRequest, updateAssemblyGateway, \
     cleanup_interval, gatewaySelector, gatewayForward
@@ -100,7 +102,10 @@ def assemblyReCaptchaForward() -> Assembly:
     '''
     The assembly containing the handlers that will be used for forwarding the reCAPTCHA validation.
     '''
-    return Assembly('reCAPTCHA forward')
+    b = Assembly('reCAPTCHA forward')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 # --------------------------------------------------------------------
 
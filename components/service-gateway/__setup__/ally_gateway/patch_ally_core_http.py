@@ -9,6 +9,8 @@ Created on Feb 8, 2013
 Provides the server patch configuration when used internally with REST.
 '''
 
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ..ally_http.server import assemblyServer
 from .processor import GATEWAY_INTERNAL, assemblyRESTRequest, assemblyForward
 from .server import server_provide_gateway, gatewayRouter
@@ -65,6 +67,8 @@ else:
     @ioc.entity
     def assemblyResourcesGateway():
         b = Assembly('Gateway REST resources')
+        b.compiled = compiled_processing()
+        if profile_processing(): b.profiler = processingProfiler()
         b.add(assemblyResources())
         b.replace(encoderPathResource(), encoderPathResourceGateway())
         return b
@@ -9,6 +9,8 @@ Created on Jan 5, 2012
 Provides the configurations for delivering files from the local file system.
 '''
 
+from ..ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ..ally_http.processor import headerEncodeRequest, acceptRequestEncode, \
     headerDecodeRequest, internalError
 from ally.container import ioc
@@ -136,21 +138,30 @@ def assemblyRESTRequest() -> Assembly:
     '''
     The assembly containing the handlers that will be used in processing the gateway REST requests.
     '''
-    return Assembly('Gateway REST data')
+    b = Assembly('Gateway REST data')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 @ioc.entity
 def assemblyForward() -> Assembly:
     '''
     The assembly containing the handlers that will be used for forwarding the request.
     '''
-    return Assembly('Gateway forward')
+    b = Assembly('Gateway forward')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 @ioc.entity
 def assemblyGateway() -> Assembly:
     '''
     The assembly containing the handlers that will be used in processing the gateway.
     '''
-    return Assembly('Gateway')
+    b = Assembly('Gateway')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 # --------------------------------------------------------------------
     
@@ -0,0 +1,155 @@
+'''
+Created on Oct 17, 2026
+
+@package: gateway service
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides testing for the gateway repository refresh.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import requires, defines
+from ally.design.processor.context import Context
+from ally.design.processor.execution import Chain
+from ally.design.processor.handler import HandlerProcessorProceed
+from ally.gateway.http.impl.processor.respository import GatewayRepositoryHandler
+from ally.http.spec.codes import BAD_GATEWAY
+from collections import Iterable
+import json
+import unittest
+
+# --------------------------------------------------------------------
+
+class RequestContent(Context):
+    source = defines(Iterable)
+
+class RequestServer(Context):
+    headers = requires(dict)
+
+class ResponseServer(Context):
+    status = defines(int)
+    headers = defines(dict)
+
+class ResponseContentServer(Context):
+    source = defines(Iterable)
+
+class Server(HandlerProcessorProceed):
+    '''
+    Serves the gateways, recording the headers of the received requests.
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self.status, self.etag, self.navigate = 200, '"1"', 'resources/Article'
+        self.received = []
+
+    def process(self, request:RequestServer, response:ResponseServer, responseCnt:ResponseContentServer, **keyargs):
+        self.received.append(dict(request.headers))
+        if self.etag and request.headers.get('If-None-Match') == self.etag:
+            response.status = 304
+            return
+
+        response.status, response.headers = self.status, {'ETag': self.etag} if self.etag else {}
+        if self.status == 200:
+            gateways = {'GatewayList': [{'Pattern': '^Article(?:/|$)', 'Navigate': self.navigate}]}
+            responseCnt.source = (json.dumps(gateways).encode('utf-8'),)
+
+# --------------------------------------------------------------------
+
+class TestGatewayRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.server = Server()
+        self.handler = GatewayRepositoryHandler()
+        self.handler.uri = 'resources/Gateways'
+        self.handler.cleanupInterval = 3600
+        self.handler.assembly = Assembly('Gateways')
+        self.handler.assembly.add(self.server)
+        ioc.initialize(self.handler)
+        assembly = Assembly('Test')
+        assembly.add(self.handler)
+        self.processing = assembly.create(requestCnt=RequestContent)
+
+    def obtain(self):
+        arg = self.processing.fillIn()
+        Chain(self.processing).process(**arg).doAll()
+        return arg['request'].repository, arg['response']
+
+    def navigate(self, repository):
+        return repository.find(method='GET', uri='Article/1').gateway.navigate
+
+    def testFetch(self):
+        repository, _response = self.obtain()
+        self.assertEqual('resources/Article', self.navigate(repository))
+        self.assertIs(repository, self.obtain()[0])
+        self.assertEqual([{}], self.server.received)
+
+    def testFetchFailed(self):
+        self.server.status = 500
+        repository, response = self.obtain()
+        self.assertIsNone(repository)
+        self.assertEqual(BAD_GATEWAY.status, response.status)
+
+        self.server.status = 200
+        self.assertEqual('resources/Article', self.navigate(self.obtain()[0]))
+
+    def testRefreshNotModified(self):
+        self.handler.performCleanup()
+        self.assertEqual([], self.server.received)
+
+        repository, _response = self.obtain()
+        self.handler.performCleanup()
+        self.assertEqual({'If-None-Match': '"1"'}, self.server.received[-1])
+        self.assertIs(repository, self.obtain()[0])
+        self.assertEqual((2, 1), (self.handler.refreshes, self.handler.refreshesUnchanged))
+
+    def testRefreshChanged(self):
+        repository, _response = self.obtain()
+        self.server.etag, self.server.navigate = '"2"', 'resources/Blog'
+        self.handler.performCleanup()
+        self.assertEqual({'If-None-Match': '"1"'}, self.server.received[-1])
+
+        refreshed = self.obtain()[0]
+        self.assertIsNot(repository, refreshed)
+        self.assertEqual('resources/Blog', self.navigate(refreshed))
+        self.assertEqual('resources/Article', self.navigate(repository))
+
+        self.handler.performCleanup()
+        self.assertEqual({'If-None-Match': '"2"'}, self.server.received[-1])
+        self.assertEqual((3, 1), (self.handler.refreshes, self.handler.refreshesUnchanged))
+
+    def testRefreshDigest(self):
+        repository, _response = self.obtain()
+        self.server.etag = None
+        self.handler.performCleanup()
+        self.assertIs(repository, self.obtain()[0])
+
+        self.handler.performCleanup()
+        self.assertEqual({}, self.server.received[-1])
+        self.assertIs(repository, self.obtain()[0])
+        self.assertEqual((3, 2), (self.handler.refreshes, self.handler.refreshesUnchanged))
+
+        self.server.navigate = 'resources/Blog'
+        self.handler.performCleanup()
+        self.assertEqual('resources/Blog', self.navigate(self.obtain()[0]))
+
+    def testRefreshFailed(self):
+        repository, _response = self.obtain()
+        self.server.etag, self.server.status = '"2"', 500
+        self.handler.performCleanup()
+        self.assertIs(repository, self.obtain()[0])
+        self.assertEqual(1, self.handler.refreshes)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
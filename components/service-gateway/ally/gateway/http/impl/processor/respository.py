@@ -17,16 +17,16 @@ from ally.design.processor.execution import Processing, Chain
 from ally.design.processor.handler import HandlerBranchingProceed
 from ally.design.processor.processor import Using
 from ally.gateway.http.spec.gateway import IRepository, RepositoryJoined
-from ally.http.spec.codes import BAD_GATEWAY, isSuccess
+from ally.http.spec.codes import BAD_GATEWAY, NOT_MODIFIED, isSuccess
 from ally.http.spec.server import RequestHTTP, ResponseHTTP, ResponseContentHTTP, \
     HTTP_GET, HTTP, HTTP_OPTIONS
 from ally.support.util import immut
 from ally.support.util_io import IInputStream
+from hashlib import md5
 from io import BytesIO
 from sched import scheduler
-from threading import Thread
+from threading import Thread, Lock
 from urllib.parse import urlparse, parse_qsl
-import codecs
 import json
 import logging
 import re
@@ -121,6 +121,9 @@ class GatewayRepositoryHandler(HandlerBranchingProceed):
     '''
     Implementation for a handler that provides the gateway repository by using REST data received from either internal or
     external server. The Gateway structure is defined as in the @see: gateway-http plugin.
+    The repository is refreshed by the cleanup thread while the requests are still served with the current repository,
+    the refresh uses the entity tag and last modified validators of the fetched gateways and the repository is rebuilt
+    only if the gateways have changed.
     '''
     
     scheme = HTTP
@@ -135,6 +138,14 @@ class GatewayRepositoryHandler(HandlerBranchingProceed):
     # The number of seconds to perform clean up for cached gateways.
     assembly = Assembly
     # The assembly to be used in processing the request for the gateways.
+    nameETag = 'ETag'
+    # The header name for the entity tag of the fetched gateways.
+    nameLastModified = 'Last-Modified'
+    # The header name for the last modified date of the fetched gateways.
+    nameIfNoneMatch = 'If-None-Match'
+    # The header name for the entity tag sent when refreshing the gateways.
+    nameIfModifiedSince = 'If-Modified-Since'
+    # The header name for the last modified date sent when refreshing the gateways.
     
     def __init__(self):
         assert isinstance(self.scheme, str), 'Invalid scheme %s' % self.scheme
@@ -143,6 +154,10 @@ class GatewayRepositoryHandler(HandlerBranchingProceed):
         assert isinstance(self.uri, str), 'Invalid URI %s' % self.uri
         assert isinstance(self.cleanupInterval, int), 'Invalid cleanup interval %s' % self.cleanupInterval
         assert isinstance(self.assembly, Assembly), 'Invalid assembly %s' % self.assembly
+        assert isinstance(self.nameETag, str), 'Invalid entity tag name %s' % self.nameETag
+        assert isinstance(self.nameLastModified, str), 'Invalid last modified name %s' % self.nameLastModified
+        assert isinstance(self.nameIfNoneMatch, str), 'Invalid if none match name %s' % self.nameIfNoneMatch
+        assert isinstance(self.nameIfModifiedSince, str), 'Invalid if modified since name %s' % self.nameIfModifiedSince
         super().__init__(Using(self.assembly, request=RequestGateway).sources('requestCnt', 'response', 'responseCnt'))
         self.initialize()
 
@@ -158,18 +173,22 @@ class GatewayRepositoryHandler(HandlerBranchingProceed):
         assert issubclass(Gateway, GatewayRepository), 'Invalid gateway class %s' % Gateway
         assert issubclass(Match, MatchRepository), 'Invalid match class %s' % Match
         
-        if not self._repository:
-            robj, status, text = self.obtainGateways(processing, self.uri)
-            if robj is None or not isSuccess(status):
-                log.info('Cannot fetch the gateways from URI \'%s\', with response %s %s', self.uri, status, text)
-                response.code, response.status, response.isSuccess = BAD_GATEWAY
-                response.text = text
-                return
-            assert 'GatewayList' in robj, 'Invalid objects %s, not GatewayList' % robj
-            self._repository = Repository([self.populate(Identifier(Gateway()), obj) for obj in robj['GatewayList']], Match)
+        repository = self._repository
+        if repository is None:
+            with self._lock:  # Only one request fetches the gateways, the others use the fetched repository
+                if self._repository is None:
+                    failed = self.refresh(processing, Gateway, Match)
+                    if failed:
+                        status, text = failed
+                        log.info('Cannot fetch the gateways from URI \'%s\', with response %s %s', self.uri, status, text)
+                        response.code, response.status, response.isSuccess = BAD_GATEWAY
+                        response.text = text
+                        return
+                    self._refresher = (processing, Gateway, Match)
+                repository = self._repository
             
-        if request.repository: request.repository = RepositoryJoined(request.repository, self._repository)
-        else: request.repository = self._repository
+        if request.repository: request.repository = RepositoryJoined(request.repository, repository)
+        else: request.repository = repository
         
     # ----------------------------------------------------------------
    
@@ -185,15 +204,34 @@ class GatewayRepositoryHandler(HandlerBranchingProceed):
             A tuple containing as the first position the gateway objects representation, None if the gateways cannot be fetched,
             on the second position the response status and on the last position the response text.
         '''
+        response, responseCnt = self.requestGateways(processing, uri)
+        content = self.contentFor(response, responseCnt)
+        if content is None: return None, response.status, self.textFor(response)
+        return json.loads(content.decode(self.encodingJson)), response.status, self.textFor(response)
+    
+    def requestGateways(self, processing, uri, headers=None):
+        '''
+        Request the gateways.
+        
+        @param processing: Processing
+            The processing used for delivering the request.
+        @param uri: string
+            The URI to call, parameters are allowed.
+        @param headers: dictionary{string: string}|None
+            The headers to send with the request.
+        @return: tuple(ResponseHTTP, ResponseContentHTTP)
+            The response and response content of the request.
+        '''
         assert isinstance(processing, Processing), 'Invalid processing %s' % processing
         assert isinstance(uri, str), 'Invalid URI %s' % uri
+        assert headers is None or isinstance(headers, dict), 'Invalid headers %s' % headers
         
         request = processing.ctx.request()
         assert isinstance(request, RequestGateway), 'Invalid request %s' % request
         
         url = urlparse(uri)
         request.scheme, request.method = self.scheme, HTTP_GET
-        request.headers = {}
+        request.headers = dict(headers) if headers else {}
         request.uri = url.path.lstrip('/')
         request.parameters = parse_qsl(url.query, True, False)
         request.accTypes = [self.mimeTypeJson]
@@ -203,31 +241,130 @@ class GatewayRepositoryHandler(HandlerBranchingProceed):
         chain.process(request=request, requestCnt=processing.ctx.requestCnt(),
                       response=processing.ctx.response(), responseCnt=processing.ctx.responseCnt()).doAll()
 
-        response, responseCnt = chain.arg.response, chain.arg.responseCnt
+        return chain.arg.response, chain.arg.responseCnt
+    
+    def contentFor(self, response, responseCnt):
+        '''
+        Provides the content of the gateways response.
+        
+        @param response: ResponseHTTP
+            The gateways response.
+        @param responseCnt: ResponseContentHTTP
+            The gateways response content.
+        @return: bytes|None
+            The response content, None if the response is not successful or has no content.
+        '''
         assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
         assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
         
-        if ResponseHTTP.text in response and response.text: text = response.text
-        elif ResponseHTTP.code in response and response.code: text = response.code
-        else: text = None
         if ResponseContentHTTP.source not in responseCnt or responseCnt.source is None or not isSuccess(response.status):
-            return None, response.status, text
+            return
+        if isinstance(responseCnt.source, IInputStream): return responseCnt.source.read()
+        
+        content = BytesIO()
+        for bytes in responseCnt.source: content.write(bytes)
+        return content.getvalue()
+    
+    def textFor(self, response):
+        '''
+        Provides the text of the gateways response.
         
-        if isinstance(responseCnt.source, IInputStream):
-            source = responseCnt.source
+        @param response: ResponseHTTP
+            The gateways response.
+        @return: string|None
+            The response text or code, None if not available.
+        '''
+        assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
+        
+        if ResponseHTTP.text in response and response.text: return response.text
+        if ResponseHTTP.code in response and response.code: return response.code
+    
+    def validatorsFor(self, response):
+        '''
+        Provides the headers that validate the gateways of the response when refreshing.
+        
+        @param response: ResponseHTTP
+            The gateways response.
+        @return: dictionary{string: string}
+            The if none match and if modified since headers, empty if the response has no validators.
+        '''
+        assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
+        
+        validators = {}
+        if ResponseHTTP.headers in response and response.headers:
+            for name, value in response.headers.items():
+                name = name.lower()
+                if name == self.nameETag.lower(): validators[self.nameIfNoneMatch] = value
+                elif name == self.nameLastModified.lower(): validators[self.nameIfModifiedSince] = value
+        return validators
+    
+    def refresh(self, processing, Gateway, Match):
+        '''
+        Refreshes the repository, the gateways are fetched with the validators of the current repository and the repository
+        is rebuilt and swapped only if the gateways have changed, until then the current repository is used.
+        
+        @param processing: Processing
+            The processing used for delivering the request.
+        @param Gateway: class
+            The gateway context class.
+        @param Match: class
+            The match context class.
+        @return: tuple(integer, string)|None
+            None if the repository is refreshed, otherwise the response status and text of the failed fetch.
+        '''
+        start = time.time()
+        response, responseCnt = self.requestGateways(processing, self.uri, self._validators)
+        assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
+        
+        if self._repository is not None and response.status == NOT_MODIFIED.status: self.refreshesUnchanged += 1
         else:
-            source = BytesIO()
-            for bytes in responseCnt.source: source.write(bytes)
-            source.seek(0)
-        return json.load(codecs.getreader(self.encodingJson)(source)), response.status, text
+            content = self.contentFor(response, responseCnt)
+            if content is None: return response.status, self.textFor(response)
+            
+            digest = md5(content).digest()
+            if self._repository is not None and digest == self._digest: self.refreshesUnchanged += 1
+            else:
+                robj = json.loads(content.decode(self.encodingJson))
+                assert 'GatewayList' in robj, 'Invalid objects %s, not GatewayList' % robj
+                self._repository = Repository([self.populate(Identifier(Gateway()), obj) for obj in robj['GatewayList']],
+                                              Match)
+                self._digest = digest
+            self._validators = self.validatorsFor(response)
+        
+        elapsed = time.time() - start
+        self.refreshes += 1
+        self.refreshTime += elapsed
+        assert log.debug('Refreshed the gateways in %.2f milli seconds' % (elapsed * 1000)) or True
+    
+    def refreshLatency(self):
+        '''
+        Provides the average duration of the gateways refreshes.
+        
+        @return: float
+            The average refresh duration in seconds.
+        '''
+        return self.refreshTime / self.refreshes if self.refreshes else 0.0
 
     # ----------------------------------------------------------------
     
     def initialize(self):
         '''
         Initialize the repository.
+        
+        @ivar refreshes: integer
+            The number of the gateways refreshes.
+        @ivar refreshesUnchanged: integer
+            The number of the gateways refreshes that found the gateways unchanged.
+        @ivar refreshTime: float
+            The total duration in seconds of the gateways refreshes.
         '''
         self._repository = None
+        self._refresher = None
+        self._validators = {}
+        self._digest = None
+        self._lock = Lock()
+        self.refreshes = self.refreshesUnchanged = 0
+        self.refreshTime = 0.0
         self.startCleanupThread('Cleanup gateways thread')
    
     def startCleanupThread(self, name):
@@ -248,9 +385,17 @@ class GatewayRepositoryHandler(HandlerBranchingProceed):
 
     def performCleanup(self):
         '''
-        Performs the cleanup for gateways.
+        Performs the cleanup for gateways, the repository is refreshed while the requests use the current repository.
         '''
-        self._repository = None
+        if self._refresher is None: return  # The gateways have not been fetched yet
+        with self._lock:
+            try: failed = self.refresh(*self._refresher)
+            except Exception:
+                log.exception('Cannot refresh the gateways from URI \'%s\'', self.uri)
+                return
+        if failed:
+            log.info('Cannot refresh the gateways from URI \'%s\', with response %s %s, the current gateways are used',
+                     self.uri, *failed)
     
     # ----------------------------------------------------------------
     
@@ -350,7 +495,7 @@ class Repository(IRepository):
     '''
     The gateways repository.
     '''
-    __slots__ = ('_identifiers', '_cache', '_Match')
+    __slots__ = ('_identifiers', '_index', '_cache', '_Match')
     
     def __init__(self, identifiers, Match):
         '''
@@ -363,6 +508,7 @@ class Repository(IRepository):
         assert issubclass(Match, MatchRepository), 'Invalid match class %s' % Match
         
         self._identifiers = identifiers
+        self._index = IndexIdentifiers(identifiers)
         self._Match = Match
         self._cache = {}
         
@@ -370,7 +516,7 @@ class Repository(IRepository):
         '''
         @see: IRepository.find
         '''
-        for identifier in self._identifiers:
+        for identifier in self._index.candidates(method, uri):
             assert isinstance(identifier, Identifier), 'Invalid identifier %s' % identifier
             groupsURI = self._macth(identifier, method, headers, uri, error)
             if groupsURI is not None: return self._Match(gateway=identifier.gateway, groupsURI=groupsURI)
@@ -380,7 +526,7 @@ class Repository(IRepository):
         @see: IRepository.allowsFor
         '''
         allowed = set()
-        for identifier in self._identifiers:
+        for identifier in self._index.candidates(None, uri):
             assert isinstance(identifier, Identifier), 'Invalid identifier %s' % identifier
             groupsURI = self._macth(identifier, None, headers, uri, None)
             if groupsURI is not None: allowed.update(identifier.methods)
@@ -443,3 +589,121 @@ class Repository(IRepository):
         elif identifier.errors: return
             
         return groupsURI
+
+# --------------------------------------------------------------------
+
+class IndexIdentifiers:
+    '''
+    Provides the index of the identifiers by method and by the literal prefix of the URI pattern. For each method there is
+    a characters trie that contains on each node the positions of the identifiers that have the node path as the literal
+    prefix, so the identifiers that cannot match a URI are not checked anymore. The candidates are provided in the
+    identifiers order in order to keep the first match.
+    '''
+    __slots__ = ('_identifiers', '_rootAll', '_rootAny', '_roots')
+
+    def __init__(self, identifiers):
+        '''
+        Construct the identifiers index.
+        
+        @param identifiers: list[Identifier]
+            The identifiers to be indexed.
+        '''
+        assert isinstance(identifiers, list), 'Invalid identifiers %s' % identifiers
+        self._identifiers = identifiers
+
+        methods = set()
+        for identifier in identifiers:
+            assert isinstance(identifier, Identifier), 'Invalid identifier %s' % identifier
+            methods.update(identifier.methods)
+
+        self._rootAll, self._rootAny = {}, {}
+        self._roots = {method: {} for method in methods}
+        for position, identifier in enumerate(identifiers):
+            if identifier.pattern: prefix = prefixLiteral(identifier.pattern.pattern)
+            else: prefix = ''
+
+            if identifier.methods: roots = [self._roots[method] for method in identifier.methods]
+            else: roots = [self._rootAny]
+            roots.append(self._rootAll)
+            if not identifier.methods: roots.extend(self._roots.values())
+
+            for node in roots:
+                for char in prefix:
+                    child = node.get(char)
+                    if child is None: child = node[char] = {}
+                    node = child
+                positions = node.get(None)
+                if positions is None: node[None] = [position]
+                else: positions.append(position)
+
+    def candidates(self, method, uri):
+        '''
+        Provides the identifiers that might match the method and URI.
+        
+        @param method: string|None
+            The method to provide the candidates for, if None the candidates for all methods are provided.
+        @param uri: string|None
+            The URI to provide the candidates for, if None only the identifiers without a literal prefix are provided.
+        @return: list[Identifier]
+            The candidate identifiers in the repository order.
+        '''
+        if method is None: node = self._rootAll
+        else:
+            assert isinstance(method, str), 'Invalid method %s' % method
+            node = self._roots.get(method.upper(), self._rootAny)
+
+        positions = list(node.get(None, ()))
+        if uri:
+            assert isinstance(uri, str), 'Invalid URI %s' % uri
+            for char in uri:
+                node = node.get(char)
+                if node is None: break
+                found = node.get(None)
+                if found: positions.extend(found)
+            positions.sort()
+
+        return [self._identifiers[position] for position in positions]
+
+# --------------------------------------------------------------------
+
+def prefixLiteral(pattern):
+    '''
+    Provides the literal prefix of a regex pattern, any string matched by the pattern starts with the literal prefix.
+    
+    @param pattern: string
+        The regex pattern.
+    @return: string
+        The literal prefix, empty if the pattern has no literal prefix.
+    '''
+    assert isinstance(pattern, str), 'Invalid pattern %s' % pattern
+
+    k, depth, inClass = 0, 0, False
+    while k < len(pattern):  # A pattern with top level alternatives has no common literal prefix
+        char = pattern[k]
+        if char == '\\': k += 1
+        elif inClass: inClass = char != ']'
+        elif char == '[':
+            inClass = True
+            if pattern[k + 1:k + 2] == '^': k += 1
+            if pattern[k + 1:k + 2] == ']': k += 1
+        elif char == '(': depth += 1
+        elif char == ')': depth -= 1
+        elif char == '|' and depth == 0: return ''
+        k += 1
+
+    prefix, k = [], 1 if pattern.startswith('^') else 0
+    while k < len(pattern):
+        char = pattern[k]
+        if char == '\\':
+            if k + 1 >= len(pattern) or pattern[k + 1].isalnum(): break  # Classes and references are not literal
+            char, step = pattern[k + 1], 2
+        elif char in '.^$*+?{}[]()': break
+        else: step = 1
+
+        following = pattern[k + step:k + step + 1]
+        if following and following in '*?{': break  # The character is optional
+        prefix.append(char)
+        if following == '+': break
+        k += step
+
+    return ''.join(prefix)
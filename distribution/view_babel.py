@@ -0,0 +1,63 @@
+'''
+Created on Oct 17, 2026
+
+@package: Superdesk
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Used for viewing the per request overhead of providing the Babel converters and of the formatting, with the converters
+created for every request and with the cached converters.
+The ally, ally core, ally core http components and Babel need to be in the python path.
+'''
+
+from ally.api.type import Number, DateTime, Date, typeFor
+from ally.container import ioc
+from ally.core.http.impl.processor.text_conversion import BabelConversionDecodeHandler
+from ally.core.spec.resources import ConverterPath
+from datetime import datetime
+import time
+
+# --------------------------------------------------------------------
+
+LANGUAGES = ('en', 'fr-FR', 'de', 'ro-RO')
+# The languages of the requests.
+FORMATS = ({}, {Date: 'yyyy.MM.dd', Number: '#,##0.###'})
+# The formats required by the requests.
+REQUESTS = 10000
+# The number of requests.
+VALUES = 20
+# The number of values formatted for each request.
+
+# --------------------------------------------------------------------
+
+def convert(handler):
+    '''
+    Provides the converters for the requests and formats values, like the conversion processor and the encoders do it.
+
+    @return: float
+        The time in seconds.
+    '''
+    typeNumber, typeDateTime, typeDate = typeFor(Number), typeFor(DateTime), typeFor(Date)
+    now = datetime.now()
+    start = time.time()
+    for k in range(REQUESTS):
+        locale = handler.localeFor(LANGUAGES[k % len(LANGUAGES)])
+        converter = handler.converterFor(locale, dict(FORMATS[k % len(FORMATS)]))
+        for value in range(VALUES):
+            converter.asString(value * 1000.5, typeNumber)
+            converter.asString(now, typeDate)
+        converter.asString(now, typeDateTime)
+    return time.time() - start
+
+if __name__ == '__main__':
+    for cacheSize in (0, BabelConversionDecodeHandler.cacheSize):
+        handler = BabelConversionDecodeHandler()
+        handler.normalizer = ConverterPath()
+        handler.languageDefault = 'en'
+        handler.cacheSize = cacheSize
+        ioc.initialize(handler)
+
+        elapsed = convert(handler)
+        print('Cache size %s: %s requests in %.2f milli seconds, %.2f micro seconds per request' %
+              (cacheSize, REQUESTS, elapsed * 1000, elapsed * 1000000 / REQUESTS))
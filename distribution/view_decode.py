@@ -0,0 +1,104 @@
+'''
+Created on Oct 17, 2026
+
+@package: Superdesk
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Used for viewing the request body decoding durations for large PUT/POST payloads, with the exploit paths decoding and
+with the compiled decode tables.
+The ally and ally core components need to be in the python path.
+'''
+
+from ally.api.config import model
+from ally.api.type import List, typeFor
+from ally.container import ioc
+from ally.core.impl.processor.decoder import CreateDecoderHandler
+from ally.core.spec.resources import ConverterPath
+from collections import deque
+import time
+
+# --------------------------------------------------------------------
+
+@model(id='Key')
+class Reference:
+    Key = str
+    Name = str
+
+@model(id='Id')
+class Entity:
+    Id = int
+    Name = str
+    Description = str
+    Type = str
+    Language = str
+    Status = str
+    Tags = List(str)
+    Reference = Reference
+
+PAYLOADS = 20000
+# The number of payloads decoded.
+
+# --------------------------------------------------------------------
+
+def payload(k):
+    '''
+    Provides a parsed payload, like the JSON parser does it.
+    '''
+    return {'Id': str(k), 'Name': 'Name %s' % k, 'Description': 'Description %s' % k, 'Type': 'Type',
+            'Language': 'en', 'Status': 'active', 'Tags': ['a', 'b', 'c'], 'Reference': {'Key': 'key %s' % k}}
+
+def decodePaths(decoder, data, obj):
+    '''
+    Decodes the payload with a deque path for every value, like the text parser did it.
+    '''
+    process = deque()
+    process.append((deque(), obj))
+    while process:
+        path, obj = process.popleft()
+        if isinstance(obj, dict):
+            for name, value in obj.items():
+                itemPath = deque(path)
+                itemPath.append(name)
+                process.append((itemPath, value))
+        elif not decoder(path=path, value=obj, **data): raise ValueError('Invalid path %s' % path)
+
+def decodeTable(table, data, obj):
+    '''
+    Decodes the payload with the decode table, like the text parser does it.
+    '''
+    process = deque()
+    process.append(((), obj))
+    while process:
+        path, obj = process.popleft()
+        if isinstance(obj, dict):
+            for name, value in obj.items(): process.append((path + (name,), value))
+        elif not table.decode(path, value=obj, **data): raise ValueError('Invalid path %s' % (path,))
+
+def decode(decodeFactory, payloads):
+    '''
+    Decodes the payloads.
+
+    @return: float
+        The time in seconds.
+    '''
+    start = time.time()
+    for obj in payloads: decodeFactory(obj)
+    return time.time() - start
+
+if __name__ == '__main__':
+    handler = CreateDecoderHandler()
+    ioc.initialize(handler)
+    decoder = handler.decoderFor('entity', typeFor(Entity))
+    converter = ConverterPath()
+    data = dict(converter=converter, converterId=converter, normalizer=converter)
+    table = decoder.tableFor(converter)
+
+    payloads = [payload(k) for k in range(PAYLOADS)]
+    decoders = (('Exploit paths', lambda obj: decodePaths(decoder, dict(data, target={}), obj)),
+                ('Decode table', lambda obj: decodeTable(table, dict(data, target={}), obj)))
+
+    for name, decodeFactory in decoders:
+        elapsed = decode(decodeFactory, payloads)
+        print('%s decoding: %s payloads in %.2f milli seconds' % (name, PAYLOADS, elapsed * 1000))
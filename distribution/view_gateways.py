@@ -0,0 +1,87 @@
+'''
+Created on Oct 17, 2026
+
+@package: Superdesk
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Used for viewing the gateways repository find durations for a large number of gateways, with the identifiers checked
+one by one and with the identifiers index.
+The ally, ally http and service gateway components need to be in the python path.
+'''
+
+from ally.gateway.http.impl.processor.respository import Identifier, Repository, MatchRepository, \
+    GatewayRepository
+from ally.design.processor.context import create
+from ally.design.processor.spec import Resolvers
+import random
+import re
+import time
+
+# --------------------------------------------------------------------
+
+GATEWAYS = 10000
+# The number of gateways in the repository.
+METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+# The methods used by the gateways.
+FINDS = 20000
+# The number of finds to perform.
+
+# --------------------------------------------------------------------
+
+def identifiers(Gateway):
+    '''
+    Provides the generated identifiers, resources gateways with methods, an any method fallback and an error gateway.
+    '''
+    identifiers = []
+    for k in range(GATEWAYS):
+        identifier = Identifier(Gateway(navigate='resources/Model%s/{1}' % k))
+        identifier.pattern = re.compile('^resources/Model%s/([0-9]+)(?:/|$)' % k)
+        identifier.methods.add(METHODS[k % len(METHODS)])
+        identifiers.append(identifier)
+
+    identifier = Identifier(Gateway(navigate='resources/{1}'))
+    identifier.pattern = re.compile('^resources\\/(.*)')
+    identifiers.append(identifier)
+    identifier = Identifier(Gateway(navigate='error'))
+    identifier.errors.add(404)
+    identifiers.append(identifier)
+    return identifiers
+
+def findAll(find, requests):
+    '''
+    Performs the finds on the repository.
+
+    @return: tuple(list, float)
+        The found gateways and the time in seconds.
+    '''
+    start = time.time()
+    found = []
+    for method, uri, error in requests:
+        match = find(method=method, uri=uri, error=error)
+        found.append(None if match is None else (id(match.gateway), match.groupsURI))
+    return found, time.time() - start
+
+if __name__ == '__main__':
+    contexts = create(Resolvers(True, dict(Gateway=GatewayRepository, Match=MatchRepository)))
+    Match = contexts['Match']
+    repository = Repository(identifiers(contexts['Gateway']), Match)
+
+    def findLinear(method=None, headers=None, uri=None, error=None):
+        for identifier in repository._identifiers:
+            groupsURI = repository._macth(identifier, method, headers, uri, error)
+            if groupsURI is not None: return Match(gateway=identifier.gateway, groupsURI=groupsURI)
+
+    random.seed(0)
+    requests = []
+    for k in range(FINDS):
+        index = random.randrange(GATEWAYS * 2)
+        requests.append((random.choice(METHODS), 'resources/Model%s/%s' % (index, k), 404 if k % 10 == 0 else None))
+
+    found, elapsed = findAll(repository.find, requests)
+    foundLinear, elapsedLinear = findAll(findLinear, requests)
+    assert found == foundLinear, 'The indexed finds differ from the linear finds'
+
+    for name, elapsed in (('Linear', elapsedLinear), ('Indexed', elapsed)):
+        print('%s find: %s gateways, %.2f micro seconds per find' % (name, GATEWAYS, elapsed * 1000000 / FINDS))
@@ -0,0 +1,89 @@
+'''
+Created on Oct 17, 2026
+
+@package: Superdesk
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Used for viewing the multi part parsing durations and memory usage for large uploads, the upload content is generated
+while it is read so only the parsing memory is measured.
+The ally and ally core http components need to be in the python path.
+'''
+
+from ally.container import ioc
+from ally.core.http.impl.processor.parsing_multipart import DataMultiPart, StreamMultiPart, FLAG_MARK_START, \
+    FLAG_MARK_END, FLAG_CONTENT_END
+from ally.support.util_io import IInputStream
+import resource
+import time
+
+# --------------------------------------------------------------------
+
+SIZES = (1, 100, 300)
+# The sizes in mega bytes of the uploaded files.
+BOUNDARY = '----FormBoundary7MA4YWxkTrZu0gW'
+# The multi part boundary.
+READ_SIZE = 64 * 1024
+# The size of the reads made by the server on the request content.
+
+# --------------------------------------------------------------------
+
+class Upload(IInputStream):
+    '''
+    Generates the multi part content for a form with a name field and an uploaded file.
+    '''
+
+    def __init__(self, size):
+        self.parts = [('--%s\r\nContent-Disposition: form-data; name="name"\r\n\r\nThe file name\r\n' % BOUNDARY).encode(),
+                      ('--%s\r\nContent-Disposition: form-data; name="file"; filename="file.bin"\r\n'
+                       'Content-Type: application/octet-stream\r\n\r\n' % BOUNDARY).encode()]
+        self.size = size
+        self.block = bytes(range(256)) * (READ_SIZE // 256)
+        self.end = ('\r\n--%s--\r\n' % BOUNDARY).encode()
+        self.pending = b''
+
+    def read(self, nbytes=None):
+        nbytes = min(nbytes or READ_SIZE, READ_SIZE)
+        if not self.pending:
+            if self.parts: self.pending = self.parts.pop(0)
+            elif self.size > 0:
+                self.pending = self.block[:min(len(self.block), self.size)]
+                self.size -= len(self.pending)
+            else: self.pending, self.end = self.end, b''
+        data, self.pending = self.pending[:nbytes], self.pending[nbytes:]
+        return data
+
+def parse(data, size):
+    '''
+    Parses the upload content, like the multi part parsing does it.
+
+    @return: tuple(integer, float)
+        The number of bytes in the file and the time in seconds.
+    '''
+    start = time.time()
+    stream, total = StreamMultiPart(data, Upload(size), BOUNDARY), 0
+    while not stream._flag & (FLAG_CONTENT_END | FLAG_MARK_END):
+        if not stream._flag & FLAG_MARK_START:
+            stream._readToMark(data.packageSize)
+            continue
+        stream._pullHeaders()
+        if data.spoolSize: source = stream.spool(data.spoolSize)
+        else: source = stream
+        while True:
+            block = source.read(READ_SIZE)
+            if not block: break
+            total += len(block)
+    return total, time.time() - start
+
+if __name__ == '__main__':
+    for spoolSize in (0, DataMultiPart.spoolSize):
+        data = DataMultiPart()
+        data.spoolSize = spoolSize
+        ioc.initialize(data)
+
+        for size in SIZES:
+            total, elapsed = parse(data, size * 1024 * 1024)
+            maximum = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+            print('Upload of %s MB with spool size %s: %s bytes parsed in %.2f seconds (%.1f MB/s), maximum resident '
+                  'memory %s MB' % (size, spoolSize, total, elapsed, size / elapsed, maximum))
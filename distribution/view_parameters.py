@@ -0,0 +1,91 @@
+'''
+Created on Oct 17, 2026
+
+@package: Superdesk
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Used for viewing the query parameters decoding durations for a query heavy list call with the compiled parameters plans.
+The ally, ally core and ally core http components need to be in the python path.
+'''
+
+from ally.api.config import model, query, service, call
+from ally.api.criteria import AsLikeOrdered, AsDateTimeOrdered, AsRange, AsEqualOrdered
+from ally.api.type import Iter, typeFor
+from ally.container import ioc
+from ally.core.http.impl.processor.parameter import ParameterHandler
+from ally.core.impl.invoker import InvokerCall
+from ally.core.spec.resources import ConverterPath
+from collections import deque
+import time
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Article:
+    Id = int
+
+@query(Article)
+class QArticle:
+    name = AsLikeOrdered
+    title = AsLikeOrdered
+    type = AsEqualOrdered
+    author = AsLikeOrdered
+    createdOn = AsDateTimeOrdered
+    publishedOn = AsDateTimeOrdered
+    deletedOn = AsDateTimeOrdered
+    score = AsRange
+
+@service
+class IArticleService:
+
+    @call
+    def getAll(self, offset:int=None, limit:int=None, detailed:bool=False, q:QArticle=None) -> Iter(Article):
+        '''
+        Nothing.
+        '''
+
+class ArticleService(IArticleService):
+
+    def getAll(self, offset=None, limit=None, detailed=False, q=None): pass
+
+PARAMETERS = [('offset', '20'), ('limit', '50'), ('detailed', 'true'), ('name', 'gabriel%'), ('title', '%ally%'),
+              ('type', 'news'), ('author.like', 'nistor%'), ('createdOn.since', '2012-01-01 00:00:00'),
+              ('publishedOn.until', '2013-01-01 00:00:00'), ('score.start', '10'), ('score.end', '20'),
+              ('asc', 'name, title'), ('desc', 'createdOn, publishedOn')]
+# The query parameters of a request.
+REQUESTS = 10000
+# The number of requests to decode.
+
+# --------------------------------------------------------------------
+
+def decode(decodeFactory):
+    '''
+    Decodes the parameters of the requests.
+
+    @return: float
+        The time in seconds.
+    '''
+    start = time.time()
+    for _k in range(REQUESTS): decodeFactory()
+    return time.time() - start
+
+if __name__ == '__main__':
+    handler = ParameterHandler()
+    ioc.initialize(handler)
+
+    invoker = InvokerCall(ArticleService(), typeFor(IArticleService).service.calls['getAll'])
+    converter = ConverterPath()
+    plan = handler.planInvoker(invoker, converter)
+
+    def decodePlan():
+        context = dict(target={}, normalizer=converter, converter=converter)
+        for name, value in PARAMETERS:
+            decode = plan.get(name)
+            if decode is None or not decode(path=deque(), value=value, **context):
+                raise ValueError('Illegal parameter %s' % name)
+
+    elapsed = decode(decodePlan)
+    print('Parameters plan decoding: %s requests with %s parameters in %.2f milli seconds' %
+          (REQUESTS, len(PARAMETERS), elapsed * 1000))
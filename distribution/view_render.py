@@ -0,0 +1,63 @@
+'''
+Created on Oct 17, 2026
+
+@package: Superdesk
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Used for viewing the JSON and XML rendering durations for large model lists, with the stream writer (or XML generator)
+renders and with the buffered renders.
+The ally and ally core components need to be in the python path.
+'''
+
+from ally.core.impl.processor.render.json import RenderJSON, RenderJSONBuffered
+from ally.core.impl.processor.render.xml import RenderXML, RenderXMLBuffered
+from codecs import getwriter
+from io import BytesIO
+from xml.sax.saxutils import XMLGenerator
+import time
+
+# --------------------------------------------------------------------
+
+MODELS = 5000
+# The number of models in the rendered list.
+PROPERTIES = ('Id', 'Name', 'Description', 'Type', 'Language', 'Date', 'Status', 'Order')
+# The properties rendered for each model.
+BUFFER_SIZE = 4096
+# The buffer size used by the buffered render.
+REPEAT = 5
+# The number of times the list is rendered.
+
+# --------------------------------------------------------------------
+
+def render(renderFactory):
+    '''
+    Renders the models list, like the encoder does it.
+
+    @return: tuple(integer, float)
+        The number of bytes rendered and the time in seconds.
+    '''
+    start = time.time()
+    for _k in range(REPEAT):
+        output = BytesIO()
+        render = renderFactory(output)
+        render.collectionStart('ModelList', {'total': str(MODELS)})
+        for k in range(MODELS):
+            render.objectStart('Model', {'href': 'Model/%s' % k})
+            for name in PROPERTIES: render.value(name, '%s %s' % (name, k))
+            render.objectEnd()
+        render.collectionEnd()
+    elapsed = time.time() - start
+    return len(output.getvalue()), elapsed / REPEAT
+
+if __name__ == '__main__':
+    renders = (('JSON stream writer', lambda output: RenderJSON(getwriter('utf-8')(output, 'backslashreplace'))),
+               ('JSON buffered', lambda output: RenderJSONBuffered(output, 'utf-8', 'backslashreplace', BUFFER_SIZE, {})),
+               ('XML generator', lambda output: RenderXML(XMLGenerator(getwriter('utf-8')(output, 'xmlcharrefreplace'),
+                                                                       'utf-8', short_empty_elements=True))),
+               ('XML buffered', lambda output: RenderXMLBuffered(output, 'utf-8', 'xmlcharrefreplace', BUFFER_SIZE, {})))
+
+    for name, renderFactory in renders:
+        size, elapsed = render(renderFactory)
+        print('%s render: %s bytes for %s models in %.2f milli seconds' % (name, size, MODELS, elapsed * 1000))
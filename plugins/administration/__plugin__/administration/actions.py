@@ -16,6 +16,7 @@ from ..gui_core.gui_core import publishedURI
 from acl.right_action import RightAction
 from admin.introspection.api.component import IComponentService
 from admin.introspection.api.plugin import IPluginService
+from admin.introspection.api.profile import IProfileService
 from admin.introspection.api.request import IRequestService
 from ally.container import ioc, support
 from ally.internationalization import NC_
@@ -55,4 +56,5 @@ def rightRequestsInspection() -> RightAction:
 def registerAcl():
     r = rightRequestsInspection()
     r.addActions(menuAction(), modulesAction(), modulesListAction())
-    r.allGet(IComponentService, IPluginService, IRequestService)
+    r.allGet(IComponentService, IPluginService, IRequestService, IProfileService)
+    r.allDelete(IProfileService)
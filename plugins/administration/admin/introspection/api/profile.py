@@ -0,0 +1,71 @@
+'''
+Created on Oct 16, 2026
+
+@package: administration introspection
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+API specifications for the processors profile.
+'''
+
+from admin.api.domain_admin import modelAdmin
+from ally.api.config import service, call
+from ally.api.type import Iter
+
+# --------------------------------------------------------------------
+
+@modelAdmin(id='Name')
+class Profile:
+    '''
+    Provides the profile of an assembly processors, or of the invokers.
+    '''
+    Name = str
+    Count = int
+
+@modelAdmin(id='Id')
+class Timing:
+    '''
+    Provides the recorded durations for a processor or invoker, the durations are in milliseconds.
+    '''
+    Id = str
+    Profile = Profile
+    Count = int
+    Total = float
+    Average = float
+    Maximum = float
+    P50 = float
+    P95 = float
+    P99 = float
+
+# --------------------------------------------------------------------
+
+@service
+class IProfileService:
+    '''
+    Provides services for the processors profile, the profiling needs to be enabled in the application configurations.
+    '''
+
+    @call
+    def getProfile(self, name:Profile.Name) -> Profile:
+        '''
+        Provides the profile for the provided name.
+        '''
+
+    @call
+    def getProfiles(self, offset:int=None, limit:int=None) -> Iter(Profile):
+        '''
+        Provides all the profiles.
+        '''
+
+    @call
+    def getTimings(self, name:Profile.Name, offset:int=None, limit:int=None) -> Iter(Timing):
+        '''
+        Provides the timings of the profile, sorted by the total duration.
+        '''
+
+    @call
+    def delete(self, name:Profile.Name) -> bool:
+        '''
+        Resets the recorded durations of the profile.
+        '''
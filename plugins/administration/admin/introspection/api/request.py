@@ -68,25 +68,25 @@ class IRequestService:
     Provides services for the request nodes.
     '''
 
-    @call
+    @call(cache=True, fetchBatch='getRequests')
     def getRequest(self, id:Request.Id) -> Request:
         '''
         Provides the request for the provided id.
         '''
 
-    @call
+    @call(cache=True)
     def getMethod(self, id:Method.Id) -> Method:
         '''
         Provides the method for the provided id.
         '''
 
-    @call
+    @call(cache=True)
     def getAllInputs(self, id:Request.Id=None) -> Iter(Input):
         '''
         Provides all the pattern inputs.
         '''
 
-    @call
+    @call(cache=True)
     def getAllRequests(self, offset:int=None, limit:int=None) -> Iter(Request):
         '''
         Provides all the request nodes.
@@ -0,0 +1,119 @@
+'''
+Created on Oct 16, 2026
+
+@package: administration introspection
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Implementation for the processors profile.
+'''
+
+from ..api.profile import IProfileService, Profile, Timing
+from ally.api.extension import IterPart
+from ally.container import wire
+from ally.container.ioc import injected
+from ally.container.support import setup
+from ally.design.processor.profile import Profiler, Histogram
+from ally.exception import InputError, Ref
+from ally.internationalization import _
+from ally.support.api.util_service import trimIter
+
+# --------------------------------------------------------------------
+
+@injected
+@setup(IProfileService, name='profileService')
+class ProfileService(IProfileService):
+    '''
+    Provides the implementation for @see: IProfileService.
+    '''
+
+    processingProfiler = Profiler; wire.entity('processingProfiler')
+    # The profiler that contains the recorded durations.
+
+    def __init__(self):
+        '''
+        Constructs the profile service.
+        '''
+        assert isinstance(self.processingProfiler, Profiler), 'Invalid profiler %s' % self.processingProfiler
+
+    def getProfile(self, name):
+        '''
+        @see: IProfileService.getProfile
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        histograms = self.processingProfiler.histograms(name)
+        if histograms is None: raise InputError(Ref(_('Unknown profile'), ref=Profile.Name))
+        return self.profileFor(name, histograms)
+
+    def getProfiles(self, offset=None, limit=None):
+        '''
+        @see: IProfileService.getProfiles
+        '''
+        names = self.processingProfiler.names()
+        profiles = (self.profileFor(name, self.processingProfiler.histograms(name)) for name in names)
+        return IterPart(trimIter(profiles, len(names), offset, limit), len(names), offset, limit)
+
+    def getTimings(self, name, offset=None, limit=None):
+        '''
+        @see: IProfileService.getTimings
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        histograms = self.processingProfiler.histograms(name)
+        if histograms is None: raise InputError(Ref(_('Unknown profile'), ref=Profile.Name))
+
+        timings = [self.timingFor(name, key, histogram) for key, histogram in histograms.items()]
+        timings.sort(key=lambda timing: timing.Total, reverse=True)
+        return IterPart(trimIter(timings, len(timings), offset, limit), len(timings), offset, limit)
+
+    def delete(self, name):
+        '''
+        @see: IProfileService.delete
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        return self.processingProfiler.reset(name)
+
+    # ----------------------------------------------------------------
+
+    def profileFor(self, name, histograms):
+        '''
+        Create a profile for the provided histograms.
+
+        @param name: string
+            The profile name.
+        @param histograms: dictionary{string: Histogram}
+            The histograms of the profile.
+        @return: Profile
+            The profile.
+        '''
+        assert isinstance(histograms, dict), 'Invalid histograms %s' % histograms
+        p = Profile()
+        p.Name = name
+        p.Count = len(histograms)
+        return p
+
+    def timingFor(self, name, key, histogram):
+        '''
+        Create a timing for the provided histogram.
+
+        @param name: string
+            The profile name.
+        @param key: string
+            The processor or invoker name.
+        @param histogram: Histogram
+            The histogram to create the timing for.
+        @return: Timing
+            The timing reflecting the histogram.
+        '''
+        assert isinstance(histogram, Histogram), 'Invalid histogram %s' % histogram
+        t = Timing()
+        t.Id = key
+        t.Profile = name
+        t.Count = histogram.count
+        t.Total = histogram.total * 1000
+        t.Average = t.Total / t.Count if t.Count else 0.0
+        t.Maximum = histogram.maximum * 1000
+        t.P50 = histogram.percentile(50) * 1000
+        t.P95 = histogram.percentile(95) * 1000
+        t.P99 = histogram.percentile(99) * 1000
+        return t
@@ -63,6 +63,19 @@ class RequestService(IRequestService, INodeChildListener, INodeInvokerListener):
         if id not in self._requests: raise InputError(Ref(_('Invalid request id'), ref=Request.Id))
         return self._requests[id]
 
+    def getRequests(self, ids):
+        '''
+        Provides the requests for the provided ids, used for fetching the requests referenced by the inputs and methods in
+        batches, the unknown ids are ignored.
+        
+        @param ids: list[integer]
+            The requests ids.
+        @return: list[Request]
+            The requests.
+        '''
+        self._refresh()
+        return [self._requests[id] for id in ids if id in self._requests]
+
     def getMethod(self, id):
         '''
         @see: IRequestService.getMethod
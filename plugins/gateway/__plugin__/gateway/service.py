@@ -10,6 +10,8 @@ Contains the services for gateway.
 '''
     
 from ..plugin.registry import registerService
+from __setup__.ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from ally.container import support, ioc
 from ally.container.support import nameInEntity
 from ally.design.processor.assembly import Assembly
@@ -36,7 +38,10 @@ default_gateways = ioc.entityOf(nameInEntity(RegisterDefaultGateways, 'default_g
 @ioc.entity
 def assemblyAnonymousGateways() -> Assembly:
     ''' The assembly used for generating anonymous gateways'''
-    return Assembly('Anonymous gateways')
+    b = Assembly('Anonymous gateways')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 # --------------------------------------------------------------------
 
@@ -11,6 +11,8 @@ Contains the services for captcha gateway.
     
 from ..plugin.registry import registerService
 from .acl import captcha
+from __setup__.ally.processor import compiled_processing, profile_processing, \
+    processingProfiler
 from acl.core.impl.processor.static_right import RegisterStaticRights
 from ally.container import ioc, support
 from ally.design.processor.assembly import Assembly
@@ -37,7 +39,10 @@ def registerCaptchaRight() -> Handler:
 @ioc.entity
 def assemblyCaptchaGateways() -> Assembly:
     ''' The assembly used for generating reCAPTCHA gateways'''
-    return Assembly('Captcha gateways')
+    b = Assembly('Captcha gateways')
+    b.compiled = compiled_processing()
+    if profile_processing(): b.profiler = processingProfiler()
+    return b
 
 # --------------------------------------------------------------------
 